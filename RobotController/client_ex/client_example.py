@@ -7,8 +7,12 @@ the robot by sending commands over the network.
 
 import socket
 import json
+import struct
 import time
 
+# Big-endian length sent before each JSON message, in both directions
+_LENGTH_PREFIX = struct.Struct('>I')
+
 
 class RobotClient:
     """
@@ -31,6 +35,7 @@ class RobotClient:
         """Connect to the robot server."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Send small commands immediately
             self.socket.connect((self.host, self.port))
             print(f"Connected to robot server at {self.host}:{self.port}")
             return True
@@ -55,19 +60,34 @@ class RobotClient:
             dict: Response from the server, or None if error.
         """
         try:
-            # Send command as JSON
-            command_json = json.dumps(command_dict)
-            self.socket.send(command_json.encode('utf-8'))
+            # Send command as length-prefixed JSON
+            payload = json.dumps(command_dict).encode('utf-8')
+            self.socket.sendall(_LENGTH_PREFIX.pack(len(payload)) + payload)
             
-            # Receive response
-            response = self.socket.recv(4096)
-            response_dict = json.loads(response.decode('utf-8'))
+            # Receive response; it may arrive split over several segments
+            (length,) = _LENGTH_PREFIX.unpack(self._recv_exact(_LENGTH_PREFIX.size))
+            response_dict = json.loads(self._recv_exact(length).decode('utf-8'))
             
             return response_dict
         except Exception as e:
             print(f"Error sending command: {e}")
             return None
     
+    def _recv_exact(self, size):
+        """
+        Receive exactly `size` bytes from the server.
+        
+        Raises:
+            ConnectionError: If the server closes the connection first.
+        """
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = self.socket.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            buf.extend(chunk)
+        return bytes(buf)
+    
     def move_home(self):
         """Move robot to home position."""
         command = {"command": "move_home"}
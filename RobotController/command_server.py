@@ -4,10 +4,94 @@ Command Server Module - TCP server for receiving robot commands via network
 
 import socket
 import json
+import logging
+import selectors
+import signal
+import struct
 import threading
 from typing import Callable, Dict, Any
+import fastjsonschema
 from positions_manager import PositionsManager
 
+try:
+    import orjson  # Optional: faster JSON encode/decode
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Linux only; None elsewhere (e.g. Windows)
+_TCP_QUICKACK = getattr(socket, 'TCP_QUICKACK', None)
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    
+    def _json_loads(data: bytes):
+        return json.loads(data.decode('utf-8'))
+
+# Big-endian message length sent before each length-prefixed JSON message
+_LENGTH_PREFIX = struct.Struct('>I')
+
+_NUMBER_LIST_3 = {'type': 'array', 'items': {'type': 'number'}, 'minItems': 3, 'maxItems': 3}
+_NUMBER_LIST_6 = {'type': 'array', 'items': {'type': 'number'}, 'minItems': 6, 'maxItems': 6}
+
+# Payload schemas per command, compiled once into validators at server start
+SCHEMAS = {
+    'move_pose': {
+        'type': 'object',
+        'properties': {'pose': _NUMBER_LIST_6},
+        'required': ['pose'],
+    },
+    'move_path': {
+        'type': 'object',
+        'properties': {
+            'poses': {'type': 'array', 'items': _NUMBER_LIST_6, 'minItems': 1},
+            'rounding': {'type': 'number', 'minimum': 0},
+        },
+        'required': ['poses'],
+    },
+    'pick': {
+        'type': 'object',
+        'properties': {'position': _NUMBER_LIST_3, 'orientation': _NUMBER_LIST_3, 'wait': {'type': 'boolean'}},
+        'required': ['position', 'orientation'],
+    },
+    'place': {
+        'type': 'object',
+        'properties': {'position': _NUMBER_LIST_3, 'orientation': _NUMBER_LIST_3, 'wait': {'type': 'boolean'}},
+        'required': ['position', 'orientation'],
+    },
+    'pick_piece': {
+        'type': 'object',
+        'properties': {'piece': {'type': 'string'}, 'wait': {'type': 'boolean'}},
+    },
+    'place_piece': {
+        'type': 'object',
+        'properties': {'location': {'type': 'string'}, 'wait': {'type': 'boolean'}},
+    },
+    'pick_place_piece': {
+        'type': 'object',
+        'properties': {'piece': {'type': 'string', 'minLength': 1}, 'location': {'type': 'string', 'minLength': 1}},
+        'required': ['piece', 'location'],
+    },
+    'wait': {
+        'type': 'object',
+        'properties': {'duration': {'type': 'number', 'minimum': 0}},
+    },
+    'batch': {
+        'type': 'object',
+        'properties': {
+            'ops': {'type': 'array', 'items': {'type': 'object'}, 'minItems': 1},
+            'stop_on_error': {'type': 'boolean'},
+        },
+        'required': ['ops'],
+    },
+}
+
 
 class CommandServer:
     """
@@ -16,7 +100,10 @@ class CommandServer:
     The server receives JSON commands and executes them using a provided RobotController instance.
     """
     
-    def __init__(self, host='0.0.0.0', port=5000, robot_controller=None):
+    # Small JSON commands should go out immediately rather than wait on Nagle
+    DEFAULT_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    
+    def __init__(self, host='0.0.0.0', port=5000, robot_controller=None, socket_options=None):
         """
         Initialize the command server.
         
@@ -24,14 +111,34 @@ class CommandServer:
             host (str): IP address to bind the server to. Default is '0.0.0.0' (all interfaces).
             port (int): Port number to listen on. Default is 5000.
             robot_controller: Instance of RobotController to execute commands.
+            socket_options (list, optional): (level, optname, value) triples applied with
+                setsockopt to the listening socket and every accepted socket.
+                Default is DEFAULT_SOCKET_OPTIONS (TCP_NODELAY).
         """
         self.host = host
         self.port = port
-        self.robot_controller = robot_controller
+        self.socket_options = list(self.DEFAULT_SOCKET_OPTIONS if socket_options is None else socket_options)
+        self.set_robot_controller(robot_controller)
         self.server_socket = None
         self.running = False
+        self._wake_r = None
+        self._wake_w = None
         self.positions_manager = PositionsManager()
         self.command_handlers = self._setup_command_handlers()
+        self._validators = {cmd: fastjsonschema.compile(schema) for cmd, schema in SCHEMAS.items()}
+        
+        # Client socket tuning: detect dead peers in ~1 min and keep kernel
+        # buffers small so a burst of commands can't queue up stale moves
+        self.keepalive_idle = 30
+        self.keepalive_interval = 10
+        self.keepalive_count = 3
+        self.socket_buffer_size = 16 * 1024
+        # Replies are a few hundred bytes of JSON; a small send buffer keeps a
+        # slow client from queueing stale status replies in the kernel.
+        # 0 means unbuffered on Windows; None keeps socket_buffer_size.
+        self.send_buffer_size = 4 * 1024
+        self.max_message_size = 1024 * 1024
+        self.send_timeout = 5.0  # Seconds a client may stall a reply before it is dropped
     
     def _setup_command_handlers(self) -> Dict[str, Callable]:
         """
@@ -43,55 +150,64 @@ class CommandServer:
         return {
             'move_home': self._handle_move_home,
             'move_pose': self._handle_move_pose,
+            'move_path': self._handle_move_path,
             'pick': self._handle_pick,
             'place': self._handle_place,
             'pick_piece': self._handle_pick_piece,
             'place_piece': self._handle_place_piece,
+            'pick_place_piece': self._handle_pick_place_piece,
             'wait': self._handle_wait,
             'get_pose': self._handle_get_pose,
             'get_joints': self._handle_get_joints,
             'list_positions': self._handle_list_positions,
+            'batch': self._handle_batch,
         }
     
     def _handle_move_home(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle move_home command."""
-        success = self.robot_controller.move_to_home()
+        success = self._rc_move_home()
         return {'status': 'success' if success else 'error', 'command': 'move_home'}
     
     def _handle_move_pose(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle move_pose command."""
         pose = data.get('pose', [])
-        success = self.robot_controller.move_to_pose(pose)
+        success = self._rc_move_pose(pose)
         return {'status': 'success' if success else 'error', 'command': 'move_pose'}
     
+    def _handle_move_path(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle move_path command: blended motion through several poses."""
+        poses = data['poses']
+        success = self._rc_move_through(poses, data.get('rounding', 20))
+        return {'status': 'success' if success else 'error', 'command': 'move_path'}
+    
     def _handle_pick(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle pick command."""
         position = data.get('position', [])
         orientation = data.get('orientation', [])
-        success = self.robot_controller.pick_object(position, orientation)
+        success = self._rc_pick(position, orientation, blocking=data.get('wait', True))
         return {'status': 'success' if success else 'error', 'command': 'pick'}
     
     def _handle_place(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle place command."""
         position = data.get('position', [])
         orientation = data.get('orientation', [])
-        success = self.robot_controller.place_object(position, orientation)
+        success = self._rc_place(position, orientation, blocking=data.get('wait', True))
         return {'status': 'success' if success else 'error', 'command': 'place'}
     
     def _handle_wait(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle wait command."""
         duration = data.get('duration', 1.0)
-        success = self.robot_controller.wait(duration)
+        success = self._rc_wait(duration)
         return {'status': 'success' if success else 'error', 'command': 'wait'}
     
     def _handle_get_pose(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get_pose command."""
-        pose = self.robot_controller.get_current_pose()
+        pose = self._rc_get_pose()
         return {'status': 'success', 'command': 'get_pose', 'pose': pose}
     
     def _handle_get_joints(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle get_joints command."""
-        joints = self.robot_controller.get_current_joints()
+        joints = self._rc_get_joints()
         return {'status': 'success', 'command': 'get_joints', 'joints': joints}
     
     def _handle_pick_piece(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -115,7 +231,7 @@ class CommandServer:
         # Execute pick with the position from file
         position = pose_data['position']
         orientation = pose_data['orientation']
-        success = self.robot_controller.pick_object(position, orientation)
+        success = self._rc_pick_named(piece_name, blocking=data.get('wait', True))
         
         return {
             'status': 'success' if success else 'error',
@@ -146,7 +262,7 @@ class CommandServer:
         # Execute place with the position from file
         position = pose_data['position']
         orientation = pose_data['orientation']
-        success = self.robot_controller.place_object(position, orientation)
+        success = self._rc_place_named(location_name, blocking=data.get('wait', True))
         
         return {
             'status': 'success' if success else 'error',
@@ -156,6 +272,28 @@ class CommandServer:
             'orientation': orientation
         }
     
+    def _handle_pick_place_piece(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle pick_place_piece command: a whole cycle as one generated URScript program."""
+        piece_name = data['piece']
+        location_name = data['location']
+        
+        unknown = [name for name in (piece_name, location_name)
+                   if not self.positions_manager.get_position(name)]
+        if unknown:
+            return {
+                'status': 'error',
+                'message': f'Unknown position: {unknown[0]}',
+                'available_positions': self.positions_manager.get_all_positions()
+            }
+        
+        success = self._rc_pick_place_program(piece_name, location_name)
+        return {
+            'status': 'success' if success else 'error',
+            'command': 'pick_place_piece',
+            'piece': piece_name,
+            'location': location_name
+        }
+    
     def _handle_list_positions(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle list_positions command to get all available positions."""
         positions = self.positions_manager.get_all_positions()
@@ -165,6 +303,35 @@ class CommandServer:
             'positions': positions
         }
     
+    def _handle_batch(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle batch command: run several commands from one message, in order.
+        
+        By default the batch stops at the first failed command, so e.g. a
+        place isn't attempted after its pick failed; set "stop_on_error" to
+        false to run every command. Batches can't be nested.
+        """
+        stop_on_error = data.get('stop_on_error', True)
+        results = []
+        for op in data['ops']:
+            if op.get('command') == 'batch':
+                result = {'status': 'error', 'message': 'Nested batch not allowed', 'command': 'batch'}
+            else:
+                result = self._process_command(op)
+            results.append(result)
+            if stop_on_error and result.get('status') != 'success':
+                break
+        
+        all_ok = len(results) == len(data['ops']) and all(r.get('status') == 'success' for r in results)
+        return {'status': 'success' if all_ok else 'error', 'command': 'batch', 'results': results}
+    
+    def _handle_unknown(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a missing or unrecognised command name."""
+        command = data.get('command')
+        if not command:
+            return {'status': 'error', 'message': 'No command specified'}
+        return {'status': 'error', 'message': f'Unknown command: {command}'}
+    
     def _process_command(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a received command and execute the appropriate handler.
@@ -175,136 +342,324 @@ class CommandServer:
         Returns:
             dict: Response dictionary with execution result.
         """
-        command = command_data.get('command', '')
+        command = command_data.get('command')
+        handler = self.command_handlers.get(command, self._handle_unknown)
         
-        if not command:
-            return {'status': 'error', 'message': 'No command specified'}
-        
-        if command not in self.command_handlers:
-            return {'status': 'error', 'message': f'Unknown command: {command}'}
+        validator = self._validators.get(command)
+        if validator is not None:
+            try:
+                validator(command_data)
+            except fastjsonschema.JsonSchemaException as e:
+                return {'status': 'error', 'message': f'Invalid payload: {e.message}', 'command': command}
         
         try:
-            handler = self.command_handlers[command]
-            response = handler(command_data)
-            return response
+            return handler(command_data)
         except Exception as e:
             return {'status': 'error', 'message': str(e), 'command': command}
     
-    def _handle_client(self, client_socket: socket.socket, address: tuple):
+    def _apply_socket_options(self, sock: socket.socket):
+        """Apply the configured (level, optname, value) socket options."""
+        for level, optname, value in self.socket_options:
+            sock.setsockopt(level, optname, value)
+    
+    @staticmethod
+    def _quickack(client_socket: socket.socket):
         """
-        Handle communication with a connected client.
+        Ask the kernel to ACK immediately instead of delaying the ACK.
+        
+        TCP_QUICKACK is Linux-only and not sticky, so it is re-armed around
+        every receive and send.
+        """
+        if _TCP_QUICKACK is not None:
+            try:
+                client_socket.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+            except OSError:
+                pass
+    
+    def _configure_client_socket(self, client_socket: socket.socket):
+        """
+        Apply socket options, keepalive and buffer settings to an accepted client socket.
         
         Args:
             client_socket: Socket object for the client connection.
-            address: Client address tuple (host, port).
         """
-        print(f"Client connected from {address}")
+        self._apply_socket_options(client_socket)
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
         
+        # Keepalive timing options are platform specific (Linux, recent Windows/macOS)
+        for name, value in (('TCP_KEEPIDLE', self.keepalive_idle),
+                            ('TCP_KEEPINTVL', self.keepalive_interval),
+                            ('TCP_KEEPCNT', self.keepalive_count)):
+            option = getattr(socket, name, None)
+            if option is not None:
+                client_socket.setsockopt(socket.IPPROTO_TCP, option, value)
+        
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+        send_buffer_size = self.socket_buffer_size if self.send_buffer_size is None else self.send_buffer_size
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer_size)
+    
+    def _recv(self, client_socket: socket.socket) -> bytes:
+        """Receive up to 4 KiB from a client, re-arming TCP_QUICKACK around the read."""
+        self._quickack(client_socket)
+        data = client_socket.recv(4096)
+        self._quickack(client_socket)
+        return data
+    
+    def _next_message(self, rx: bytearray):
+        """
+        Take the next complete message out of a client's receive buffer.
+        
+        Two framings are accepted on the same port:
+        
+        - Length-prefixed: a 4-byte big-endian length, then that many bytes of
+          JSON. Lets a client stream many commands over one connection; the
+          first byte is always 0 since messages are far smaller than 16 MiB.
+        - Legacy: raw JSON with no prefix (first byte '{'), one message per
+          receive, as sent by older clients.
+        
+        Args:
+            rx: Bytes received from this client but not yet consumed.
+        
+        Returns:
+            tuple: (message bytes, framed flag), or (None, False) if no complete
+            message has arrived yet.
+        
+        Raises:
+            ValueError: If a length prefix exceeds max_message_size.
+        """
+        if not rx:
+            return None, False
+        
+        if rx[0] != 0:
+            message = bytes(rx)
+            rx.clear()
+            return message, False
+        
+        if len(rx) < _LENGTH_PREFIX.size:
+            return None, False
+        (length,) = _LENGTH_PREFIX.unpack_from(rx)
+        if length > self.max_message_size:
+            raise ValueError(f"Message of {length} bytes exceeds limit of {self.max_message_size}")
+        
+        end = _LENGTH_PREFIX.size + length
+        if len(rx) < end:
+            return None, False
+        message = bytes(rx[_LENGTH_PREFIX.size:end])
+        del rx[:end]
+        return message, True
+    
+    def _send_message(self, client_socket: socket.socket, response: Dict[str, Any], framed: bool):
+        """
+        Send a response in the framing the request arrived in.
+        
+        Args:
+            client_socket: Socket object for the client connection.
+            response: Response dictionary to send.
+            framed: True for a length prefix, False for legacy newline-terminated JSON.
+        """
+        body = _json_dumps(response)
+        if framed:
+            client_socket.sendall(_LENGTH_PREFIX.pack(len(body)) + body)
+        else:
+            client_socket.sendall(body + b'\n')
+        self._quickack(client_socket)
+    
+    def _handle_message(self, client_socket: socket.socket, data: bytes, framed: bool):
+        """
+        Parse one message, run the command and send the response.
+        
+        Args:
+            client_socket: Socket object for the client connection.
+            data: Message bytes (JSON).
+            framed: Framing the message arrived in, used for the reply.
+        """
         try:
+            # Parse JSON command; ValueError covers JSONDecodeError and invalid UTF-8
+            command_data = _json_loads(data)
+        except ValueError as e:
+            error_response = {
+                'status': 'error',
+                'message': f'Invalid JSON: {str(e)}'
+            }
+            self._send_message(client_socket, error_response, framed)
+            logger.warning("JSON decode error: %s", e)
+            return
+        if not isinstance(command_data, dict):
+            error_response = {
+                'status': 'error',
+                'message': 'Command must be a JSON object'
+            }
+            self._send_message(client_socket, error_response, framed)
+            logger.warning("Rejected non-object command: %r", command_data)
+            return
+        logger.debug("Received command: %s", command_data)
+        
+        # Process the command (this might take time for robot movements)
+        try:
+            response = self._process_command(command_data)
+        except Exception as cmd_error:
+            logger.exception("Error executing command: %s", cmd_error)
+            response = {
+                'status': 'error',
+                'message': str(cmd_error),
+                'command': command_data.get('command', 'unknown')
+            }
+        
+        # Send response back to client
+        self._send_message(client_socket, response, framed)
+        logger.debug("Sent response: %s", response)
+    
+    def _accept_client(self, selector: selectors.BaseSelector):
+        """
+        Accept a pending connection and register it with the selector.
+        
+        A client that fails during accept or socket setup (e.g. it reset
+        right after connecting) is dropped on its own; the server keeps running.
+        """
+        try:
+            client_socket, address = self.server_socket.accept()
+        except OSError as e:
+            logger.warning("Failed to accept client: %s", e)
+            return
+        try:
+            self._configure_client_socket(client_socket)
+            # Reads only happen once the selector reports data, so the timeout
+            # just bounds how long a client that stops reading can stall sendall()
+            client_socket.settimeout(self.send_timeout)
+        except OSError as e:
+            logger.warning("Dropping client %s: socket setup failed: %s", address, e)
+            client_socket.close()
+            return
+        selector.register(client_socket, selectors.EVENT_READ, (address, bytearray()))
+        logger.info("Client connected from %s", address)
+    
+    def _close_client(self, selector: selectors.BaseSelector, client_socket: socket.socket, address: tuple):
+        """Unregister and close a client connection."""
+        selector.unregister(client_socket)
+        client_socket.close()
+        logger.info("Client disconnected: %s", address)
+    
+    def _handle_client(self, selector: selectors.BaseSelector, key: selectors.SelectorKey):
+        """
+        Handle data from a client the selector reported as readable.
+        
+        Reads what has arrived and runs every complete message in it; the
+        connection stays open for any number of commands until the client
+        disconnects.
+        
+        Args:
+            selector: Selector the client socket is registered with.
+            key: Selector key; key.data is (address, receive buffer).
+        """
+        client_socket = key.fileobj
+        address, rx = key.data
+        
+        try:
+            data = self._recv(client_socket)
+            if not data:
+                self._close_client(selector, client_socket, address)
+                return
+            rx.extend(data)
+            
             while self.running:
-                # Receive data from client
-                data = client_socket.recv(4096)
-                
-                if not data:
+                message, framed = self._next_message(rx)
+                if message is None:
                     break
-                
-                try:
-                    # Parse JSON command
-                    command_data = json.loads(data.decode('utf-8'))
-                    print(f"Received command: {command_data}")
-                    
-                    # Process the command (this might take time for robot movements)
-                    try:
-                        response = self._process_command(command_data)
-                    except Exception as cmd_error:
-                        print(f"Error executing command: {cmd_error}")
-                        import traceback
-                        traceback.print_exc()
-                        response = {
-                            'status': 'error',
-                            'message': str(cmd_error),
-                            'command': command_data.get('command', 'unknown')
-                        }
-                    
-                    # Send response back to client
-                    response_json = json.dumps(response) + '\n'
-                    client_socket.send(response_json.encode('utf-8'))
-                    print(f"Sent response: {response}")
-                    
-                except json.JSONDecodeError as e:
-                    error_response = {
-                        'status': 'error',
-                        'message': f'Invalid JSON: {str(e)}'
-                    }
-                    client_socket.send(json.dumps(error_response).encode('utf-8'))
-                    print(f"JSON decode error: {e}")
-                except Exception as e:
-                    print(f"Error processing message: {e}")
-                    import traceback
-                    traceback.print_exc()
-                
+                self._handle_message(client_socket, message, framed)
         except Exception as e:
-            print(f"Error handling client {address}: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            client_socket.close()
-            print(f"Client disconnected: {address}")
+            logger.exception("Error handling client %s: %s", address, e)
+            self._close_client(selector, client_socket, address)
     
     def start(self):
         """
         Start the command server and begin listening for connections.
+        
+        One thread serves every client: a selector waits on the listening
+        socket, all client sockets and a wakeup socket pair, so the loop sleeps
+        until a client connects, a command arrives, or stop() (or a signal
+        such as Ctrl+C) wakes it. Commands are therefore run one at a time,
+        in arrival order, which is also what the single robot and its RoboDK
+        connection need.
         """
         if not self.robot_controller:
             raise ValueError("Robot controller not set. Cannot start server.")
         
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._apply_socket_options(self.server_socket)
         
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        
+        # Let signals (Ctrl+C) interrupt the select, which otherwise blocks on Windows
+        previous_wakeup_fd = None
+        if threading.current_thread() is threading.main_thread():
+            previous_wakeup_fd = signal.set_wakeup_fd(self._wake_w.fileno(), warn_on_full_buffer=False)
+        
+        selector = selectors.DefaultSelector()
         try:
             self.server_socket.bind((self.host, self.port))
             self.server_socket.listen(5)
             self.running = True
             
-            print(f"Command server started on {self.host}:{self.port}")
-            print("Waiting for connections...")
+            logger.info("Command server started on %s:%s", self.host, self.port)
+            logger.info("Waiting for connections...")
+            
+            selector.register(self.server_socket, selectors.EVENT_READ)
+            selector.register(self._wake_r, selectors.EVENT_READ)
             
             while self.running:
                 try:
-                    # Set timeout to allow periodic checking of self.running
-                    self.server_socket.settimeout(1.0)
-                    
-                    try:
-                        client_socket, address = self.server_socket.accept()
-                        
-                        # Handle each client in a separate thread
-                        client_thread = threading.Thread(
-                            target=self._handle_client,
-                            args=(client_socket, address)
-                        )
-                        client_thread.daemon = True
-                        client_thread.start()
-                        
-                    except socket.timeout:
-                        continue
+                    for key, _ in selector.select():
+                        if key.fileobj is self._wake_r:
+                            self._drain_wakeup()
+                        elif key.fileobj is self.server_socket:
+                            self._accept_client(selector)
+                        else:
+                            self._handle_client(selector, key)
+                        if not self.running:
+                            break
                         
                 except KeyboardInterrupt:
-                    print("\nShutting down server...")
+                    logger.info("Shutting down server...")
                     break
                     
         except Exception as e:
-            print(f"Server error: {e}")
+            logger.error("Server error: %s", e)
         finally:
+            if previous_wakeup_fd is not None:
+                signal.set_wakeup_fd(previous_wakeup_fd)
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    self._close_client(selector, key.fileobj, key.data[0])
+            selector.close()
             self.stop()
+            self._wake_r.close()
+            self._wake_w.close()
+            self._wake_r = self._wake_w = None
+    
+    def _drain_wakeup(self):
+        """Discard pending bytes on the wakeup socket."""
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
     
     def stop(self):
         """
         Stop the command server and close all connections.
         """
         self.running = False
+        if self._wake_w is not None:
+            try:
+                self._wake_w.send(b'x')
+            except OSError:
+                pass
         if self.server_socket:
             self.server_socket.close()
-        print("Command server stopped.")
+        logger.info("Command server stopped.")
     
     def set_robot_controller(self, robot_controller):
         """
@@ -314,3 +669,17 @@ class CommandServer:
             robot_controller: Instance of RobotController to use for command execution.
         """
         self.robot_controller = robot_controller
+        
+        # Bind controller methods once so handlers skip the attribute lookups
+        rc = robot_controller
+        self._rc_move_home = rc.move_to_home if rc else None
+        self._rc_move_pose = rc.move_to_pose if rc else None
+        self._rc_move_through = rc.move_through if rc else None
+        self._rc_pick = rc.pick_object if rc else None
+        self._rc_place = rc.place_object if rc else None
+        self._rc_pick_named = rc.pick_named if rc else None
+        self._rc_place_named = rc.place_named if rc else None
+        self._rc_pick_place_program = rc.pick_place_program if rc else None
+        self._rc_wait = rc.wait if rc else None
+        self._rc_get_pose = rc.get_current_pose if rc else None
+        self._rc_get_joints = rc.get_current_joints if rc else None
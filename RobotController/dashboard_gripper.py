@@ -1,200 +1,605 @@
 """
 Dashboard Gripper Helper - Gripper control via Dashboard Server with RoboDK reconnection
+
+DashboardClient is the single client for the UR Dashboard Server protocol.
+It talks through a transport: SocketTransport for the real Dashboard Server
+(port 29999) or RoboDKTransport, which maps the same commands onto the
+RoboDK driver. Caching, locking and completion polling live in the client so
+every caller gets them.
 """
 import time
 import socket
-from robodk import robolink
+import logging
+import selectors
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 'programState' states that mean the program is no longer running
+STOPPED_STATES = frozenset({"STOPPED", "PAUSED"})
+
+# Wire form of the fixed Dashboard commands, encoded once
+CMD_ROBOTMODE = b"robotmode\n"
+CMD_PLAY = b"play\n"
+CMD_STOP = b"stop\n"
+CMD_PROGRAMSTATE = b"programState\n"
+CMD_GET_LOADED_PROGRAM = b"get loaded program\n"
+COMMAND_BYTES = {
+    "robotmode": CMD_ROBOTMODE,
+    "play": CMD_PLAY,
+    "stop": CMD_STOP,
+    "programState": CMD_PROGRAMSTATE,
+    "get loaded program": CMD_GET_LOADED_PROGRAM,
+}
+
+
+def wait_robodk_ready(robot, timeout=5.0):
+    """
+    Poll a robot's RoboDK connection state until it reports READY.
+
+    Polls back off from 20 ms up to 500 ms, so a driver that comes back
+    quickly is picked up right away instead of after a fixed delay.
+
+    Args:
+        robot: RoboDK robot item object
+        timeout (float): Maximum time to wait in seconds
+
+    Returns:
+        int: Last connection state seen (ROBOTCOM_READY on success)
+    """
+    from robodk import robolink
+    deadline = time.monotonic() + timeout
+    delay = 0.02
+    state = robot.ConnectedState()
+    while state != robolink.ROBOTCOM_READY and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.5)
+        state = robot.ConnectedState()
+    return state
+
+
+class CachedConnectedState:
+    """
+    A robot's RoboDK ConnectedState(), with READY readings reused for `ttl` seconds.
+
+    Only READY is cached: any other state is read again on the next call, so
+    a dropped connection is noticed as soon as it is checked. Call as
+    `state()` wherever `robot.ConnectedState()` would be called.
+    """
+
+    def __init__(self, robot, ttl=0.5):
+        """
+        Initialize the cache.
+
+        Args:
+            robot: RoboDK robot item object
+            ttl (float): Seconds a READY state is trusted without re-checking
+        """
+        self.robot = robot
+        self.ttl = ttl
+        self._ready_until = 0.0
+
+    def __call__(self):
+        """Return the connection state, from the cache while a READY reading is fresh."""
+        from robodk import robolink
+        if time.monotonic() < self._ready_until:
+            return robolink.ROBOTCOM_READY
+        state = self.robot.ConnectedState()
+        if state == robolink.ROBOTCOM_READY:
+            self.mark_ready()
+        return state
+
+    def mark_ready(self):
+        """Record a READY state seen elsewhere (e.g. after reconnecting)."""
+        self._ready_until = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        """Forget the cached state, so the next call asks RoboDK."""
+        self._ready_until = 0.0
+
+
+def program_call_name(program_name):
+    """Return the name RoboDK uses to call a .urp program (without the extension)."""
+    return program_name[:-4] if program_name.endswith('.urp') else program_name
+
+
+class SocketTransport:
+    """Persistent non-blocking TCP connection to the UR Dashboard Server."""
+
+    RECV_SIZE = 4096  # Read size; long replies are reassembled up to the newline
+
+    # Applied on connect: send each short command at once instead of Nagle-buffering it
+    DEFAULT_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+    # Reply deadlines (seconds) by command keyword; others use `timeout`
+    REPLY_TIMEOUTS = {
+        'programState': 0.5,
+        'load': 3.0,
+    }
+
+    def __init__(self, robot_ip, port=29999, timeout=5, socket_options=None):
+        """
+        Initialize the transport. The socket is opened on first use.
+
+        Args:
+            robot_ip (str): IP address of the UR robot
+            port (int): Dashboard Server port
+            timeout (float): Connect timeout and default reply deadline in seconds
+            socket_options (list, optional): (level, optname, value) triples applied with
+                setsockopt() on connect. Default is DEFAULT_SOCKET_OPTIONS (TCP_NODELAY).
+        """
+        self.robot_ip = robot_ip
+        self.port = port
+        self.timeout = timeout
+        self.socket_options = list(self.DEFAULT_SOCKET_OPTIONS if socket_options is None else socket_options)
+        self.welcome = None
+        self.tested = False  # Track if we've connected at least once
+        self._sock = None
+        self._selector = None
+        self._rx = bytearray()  # Bytes received but not yet consumed
+
+    def _ensure_connected(self):
+        """
+        Return the persistent socket, opening it if needed.
+
+        The socket is switched to non-blocking mode once connected, and the
+        welcome banner is consumed once here, so later commands only pay for
+        their own request/reply.
+        """
+        if self._sock is None:
+            # Log first Dashboard connection
+            if not self.tested:
+                logger.info("First Dashboard connection to %s:%s", self.robot_ip, self.port)
+                self.tested = True
+
+            sock = socket.create_connection((self.robot_ip, self.port), timeout=self.timeout)
+            for level, optname, value in self.socket_options:
+                sock.setsockopt(level, optname, value)
+            sock.setblocking(False)
+            self._sock = sock
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(sock, selectors.EVENT_READ)
+            self._rx.clear()
+
+            # Receive welcome message
+            self.welcome = self._recv_line(time.monotonic() + self.timeout)
+        return self._sock
+
+    def _send_all(self, payload, deadline):
+        """Write the whole payload before `deadline` (monotonic seconds)."""
+        view = memoryview(payload)
+        while view:
+            try:
+                sent = self._sock.send(view)
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("Dashboard Server send timed out")
+                self._selector.modify(self._sock, selectors.EVENT_WRITE)
+                try:
+                    self._selector.select(remaining)
+                finally:
+                    self._selector.modify(self._sock, selectors.EVENT_READ)
+                continue
+            view = view[sent:]
+
+    def _recv_line(self, deadline):
+        """
+        Receive one newline-terminated reply from the Dashboard Server.
+
+        The Dashboard Server answers every command with exactly one line, so
+        reading up to the newline both frames the reply and confirms the
+        command has been processed. Waits on the selector so the reply is
+        returned as soon as it arrives, and raises socket.timeout once
+        `deadline` (monotonic seconds) passes. Bytes past the newline are
+        kept for the next call.
+        """
+        while b'\n' not in self._rx:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                raise socket.timeout("Dashboard Server reply timed out")
+            try:
+                chunk = self._sock.recv(self.RECV_SIZE)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                raise ConnectionError("Dashboard Server closed the connection")
+            self._rx.extend(chunk)
+        line, _, rest = self._rx.partition(b'\n')
+        self._rx = bytearray(rest)
+        return line.decode('utf-8').strip()
+
+    def send_cmd(self, command):
+        """
+        Send one command and return its reply line.
+
+        Fixed commands use their pre-encoded bytes; others (e.g. 'load <file>')
+        are encoded on the fly, ASCII first since UR program names are ASCII.
+        """
+        payload = COMMAND_BYTES.get(command)
+        if payload is None:
+            try:
+                payload = (command + "\n").encode('ascii')
+            except UnicodeEncodeError:
+                payload = (command + "\n").encode('utf-8')
+        return self._send_bytes(payload, self.REPLY_TIMEOUTS.get(command.split(' ', 1)[0], self.timeout))
+
+    def _send_bytes(self, payload, reply_timeout):
+        """
+        Send an encoded, newline-terminated command and return its reply line.
+
+        If the connection turns out to be stale (the robot dropped it since
+        the last command), it is reopened once and the command resent. A
+        reply that misses its deadline closes the connection, so a late
+        reply can't be mistaken for the answer to the next command.
+        """
+        for attempt in (1, 2):
+            try:
+                self._ensure_connected()
+                deadline = time.monotonic() + reply_timeout
+                self._send_all(payload, deadline)
+                return self._recv_line(deadline)
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, ConnectionError):
+                self.close()
+                if attempt == 2:
+                    raise
+            except Exception:
+                self.close()
+                raise
+
+    def close(self):
+        """Close the socket, if open."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        self._rx.clear()
+
+
+class RoboDKTransport:
+    """
+    Dashboard command subset executed through the RoboDK driver.
+
+    'load' remembers the program name, 'play' calls it on the controller,
+    'programState' is derived from the robot's Busy() flag and 'stop' stops
+    the robot. Other commands are not available through RoboDK.
+    """
+
+    def __init__(self, robot_item):
+        """
+        Initialize the transport.
+
+        Args:
+            robot_item: RoboDK robot item object
+        """
+        self.robot = robot_item
+        self._program = None
+
+    def send_cmd(self, command):
+        """Execute a Dashboard-style command and return a Dashboard-style reply."""
+        if command.startswith("load "):
+            name = command[5:].strip()
+            self._program = program_call_name(name)
+            return f"Loading program: {name}"
+        if command == "play":
+            if not self._program:
+                return "Failed to execute: play"
+            from robodk import robolink
+            self.robot.RunInstruction(self._program, robolink.INSTRUCTION_CALL_PROGRAM)
+            return "Starting program"
+        if command == "programState":
+            state = "PLAYING" if self.robot.Busy() else "STOPPED"
+            return f"{state} {self._program or ''}".strip()
+        if command == "stop":
+            self.robot.Stop()
+            return "Stopped"
+        return f"Error: '{command}' is not available through RoboDK"
+
+    def close(self):
+        """Nothing to release; the RoboDK connection is owned by the caller."""
+
+
+class DashboardClient:
+    """Client for the UR Dashboard Server protocol over a pluggable transport."""
+
+    # Idempotent Dashboard queries whose replies may be reused briefly, with
+    # per-command TTL overrides (seconds); others use `cache_ttl`
+    READ_ONLY_CMDS = {
+        'robotmode': None,
+        'programState': 0.1,
+        'get loaded program': None,
+        'PolyscopeVersion': 60.0,
+    }
+
+    def __init__(self, transport, cache_ttl=0.2):
+        """
+        Initialize the client.
+
+        Args:
+            transport: SocketTransport or RoboDKTransport
+            cache_ttl (float): Default TTL for cached read-only replies
+        """
+        self.transport = transport
+        self.cache_ttl = cache_ttl
+        self._cache = {}  # command -> (expiry, response)
+        self._lock = threading.RLock()  # Serializes request/reply exchanges
+
+    def send_command(self, command):
+        """
+        Send a command and return its reply, or an 'Error: ...' string.
+
+        Replies to read-only queries are cached for a short TTL so overlapping
+        pollers share one round trip; any other command clears the cache.
+        """
+        read_only = command in self.READ_ONLY_CMDS
+        if read_only:
+            cached = self._cache.get(command)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+        else:
+            self._cache.clear()
+
+        try:
+            with self._lock:
+                # Returns once the command has been acknowledged
+                response = self.transport.send_cmd(command)
+        except socket.timeout:
+            return "Error: Connection timeout"
+        except Exception as e:
+            return f"Error: {e}"
+
+        if read_only:
+            ttl = self.READ_ONLY_CMDS[command] or self.cache_ttl
+            self._cache[command] = (time.monotonic() + ttl, response)
+        return response
+
+    def load_program(self, program_name):
+        """Load a .urp program file."""
+        return self.send_command(f"load {program_name}")
+
+    def play_program(self):
+        """Start/play the loaded program."""
+        return self.send_command("play")
+
+    def stop_program(self):
+        """Stop the running program."""
+        return self.send_command("stop")
+
+    def get_program_state(self):
+        """Get current program state."""
+        return self.send_command("programState")
+
+    def get_loaded_program(self):
+        """Get currently loaded program."""
+        return self.send_command("get loaded program")
+
+    def get_robot_mode(self):
+        """Get current robot mode."""
+        return self.send_command("robotmode")
+
+    def load_and_play(self, program_name):
+        """
+        Load a program and start it.
+
+        'play' is sent as soon as the 'load' acknowledgement arrives, and only
+        if it reports success, so a failed load never replays whatever program
+        was loaded before. Both commands run under one lock hold.
+
+        Returns:
+            tuple: (load_response, play_response); play_response is empty if
+            the program was not started
+        """
+        with self._lock:
+            load_response = self.load_program(program_name)
+            if not self.load_succeeded(load_response):
+                return load_response, ""
+            return load_response, self.play_program()
+
+    @staticmethod
+    def load_succeeded(load_response):
+        """Check whether a 'load' reply confirms the program was opened."""
+        return load_response.casefold().startswith(("loading", "file opened"))
+
+    @staticmethod
+    def is_stopped(state_response):
+        """Check whether a 'programState' reply ("<STATE> <program>") is STOPPED or PAUSED."""
+        return state_response.split(" ", 1)[0] in STOPPED_STATES
+
+    @staticmethod
+    def is_error(response):
+        """Check whether a reply is an error ('Error: ...' from the client or the robot)."""
+        return response.casefold().startswith("error")
+
+    def wait_program_stopped(self, timeout=30, initial_delay=0.02, max_delay=0.5):
+        """
+        Poll 'programState' until the program reports STOPPED or PAUSED.
+
+        Polls back off from `initial_delay` up to `max_delay` so short
+        programs are detected quickly while long ones don't flood the
+        controller.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if stopped, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            state = self.get_program_state()
+            if self.is_stopped(state):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Never sleep past the deadline; the state is checked once more there
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, max_delay)
+
+    def close(self):
+        """Close the underlying transport."""
+        with self._lock:
+            self.transport.close()
+        self._cache.clear()
+
 
 class DashboardGripper:
     """Gripper control using Dashboard Server TCP with RoboDK connection management."""
-    
-    def __init__(self, robot_item, robot_ip=None):
+
+    BACKENDS = ('dashboard', 'robodk_api')
+    OPEN_PROGRAM = "open-gripper.urp"
+    CLOSE_PROGRAM = "close-gripper.urp"
+
+    def __init__(self, robot_item, robot_ip=None, backend='dashboard'):
         """
         Initialize the gripper helper.
-        
+
         Args:
             robot_item: RoboDK robot item object
             robot_ip (str): IP address of the UR robot (required for Dashboard Server)
-        
+            backend (str): 'dashboard' to load/play programs over the Dashboard
+                Server, or 'robodk_api' to call them through the RoboDK driver
+
         Note: No Dashboard connection is made during initialization to avoid
         interfering with RoboDK connection. Dashboard connection happens only
         when open() or close() is called.
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown gripper backend: {backend}")
+
         self.robot = robot_item
+        self.backend = backend
         self.robot_ip = robot_ip if robot_ip else "192.168.1.10"
         self.dashboard_port = 29999
         self.connected = False
         self.socket_timeout = 5
-        self.dashboard_tested = False  # Track if we've tested Dashboard connection
-    
+
+        if backend == 'dashboard':
+            transport = SocketTransport(self.robot_ip, self.dashboard_port, self.socket_timeout)
+        else:
+            transport = RoboDKTransport(self.robot)
+        self.dashboard = DashboardClient(transport)
+
     def connect(self):
         """
         Test connection to robot (RoboDK only, no Dashboard connection).
-        
+
         This only checks if the robot item is valid in RoboDK.
         Dashboard connection will be made lazily when open()/close() is called.
         """
         try:
             if self.robot and self.robot.Valid():
                 self.connected = True
-                print("Gripper helper initialized (Dashboard will connect on first use)")
+                logger.info("Gripper helper initialized (Dashboard will connect on first use)")
                 return True
             return False
-        except:
+        except (ConnectionError, socket.timeout):
             return False
-    
+
     def is_connected(self):
         """Check if connected."""
         return self.connected
-    
+
     def disconnect(self):
         """Disconnect."""
+        self.dashboard.close()
         self.connected = False
-    
-    def _send_dashboard_command(self, command):
-        """
-        Send command to Dashboard Server via TCP.
-        
-        This is only called when actually needed (during open/close operations).
-        """
-        # Log first Dashboard connection
-        if not self.dashboard_tested:
-            print(f"  → First Dashboard connection to {self.robot_ip}:{self.dashboard_port}")
-            self.dashboard_tested = True
-        
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.socket_timeout)
-            sock.connect((self.robot_ip, self.dashboard_port))
-            
-            # Receive welcome message
-            sock.recv(1024)
-            
-            # Send command
-            sock.send((command + "\n").encode('utf-8'))
-            
-            # Receive response
-            response = sock.recv(1024).decode('utf-8').strip()
-            
-            sock.close()
-            return response
-            
-        except socket.timeout:
-            return "Error: Connection timeout"
-        except Exception as e:
-            return f"Error: {e}"
-    
+
     def _check_and_reconnect_robodk(self):
-        """Check RoboDK connection and reconnect if needed."""
+        """
+        Check RoboDK connection and reconnect if needed.
+
+        Runs right after a Dashboard load/play, which is when the driver
+        connection drops, so the state is always read from RoboDK rather
+        than from a CachedConnectedState. Only connection errors trigger a
+        reconnect; anything else propagates.
+        """
+        from robodk import robolink
+        connection_errors = (ConnectionError, socket.timeout, robolink.TargetReachError)
         try:
             # Check connection state
             state = self.robot.ConnectedState()
-            
-            if state != robolink.ROBOTCOM_READY:
-                print(f"  ⚠ RoboDK connection state: {state}, reconnecting...")
-                self.robot.Connect()
-                time.sleep(2)
-                
-                new_state = self.robot.ConnectedState()
-                if new_state == robolink.ROBOTCOM_READY:
-                    print("  ✓ RoboDK reconnected successfully")
-                    return True
-                else:
-                    print(f"  ⚠ Reconnection state: {new_state}")
-                    return False
-            return True
-            
-        except Exception as e:
-            print(f"  ⚠ Reconnection attempt: {e}")
-            try:
-                self.robot.Connect()
-                time.sleep(2)
-                print("  ✓ RoboDK reconnected")
+            if state == robolink.ROBOTCOM_READY:
                 return True
-            except:
-                print("  ✗ Failed to reconnect")
-                return False
-    
-    def open(self, program_name="open-gripper.urp"):
-        """Open the gripper by loading and running a .urp program via Dashboard Server."""
-        if not self.connected:
-            print("ERROR: Not connected to robot")
-            return False
-        
+            logger.warning("RoboDK connection state: %s, reconnecting...", state)
+        except connection_errors as e:
+            logger.warning("RoboDK connection check failed: %s, reconnecting...", e)
+
         try:
-            print(f"  → Loading program: {program_name}")
-            
-            # Send load command via Dashboard Server
-            load_response = self._send_dashboard_command(f"load {program_name}")
-            print(f"     Dashboard response: {load_response}")
-            
-            if "Error" in load_response or "File not found" in load_response:
-                print(f"  ✗ Failed to load program: {load_response}")
-                return False
-            
-            time.sleep(1)
-            
-            # Send play command via Dashboard Server
-            print(f"  → Playing program: {program_name}")
-            play_response = self._send_dashboard_command("play")
-            print(f"     Dashboard response: {play_response}")
-            
-            # Reconnect RoboDK after Dashboard interaction
-            print("  → Checking RoboDK connection...")
-            self._check_and_reconnect_robodk()
-            
-            print(f"  ✓ Program {program_name} started")
-            return True
-            
-        except Exception as e:
-            print(f"  ✗ Error running program {program_name}: {e}")
-            # Try to reconnect even on error
-            self._check_and_reconnect_robodk()
+            self.robot.Connect(blocking=False)
+            new_state = wait_robodk_ready(self.robot)
+        except connection_errors as e:
+            logger.error("Failed to reconnect: %s", e)
             return False
-    
-    def close(self, program_name="close-gripper.urp"):
-        """Close the gripper by loading and running a .urp program via Dashboard Server."""
+
+        if new_state == robolink.ROBOTCOM_READY:
+            logger.info("RoboDK reconnected successfully")
+            return True
+        logger.warning("Reconnection state: %s", new_state)
+        return False
+
+    def open(self, program_name=OPEN_PROGRAM):
+        """Open the gripper by running the open .urp program on the robot."""
+        return self._run_program(program_name)
+
+    def close(self, program_name=CLOSE_PROGRAM):
+        """Close the gripper by running the close .urp program on the robot."""
+        return self._run_program(program_name)
+
+    def _run_program(self, program_name):
+        """
+        Load and play a gripper program through the configured backend.
+
+        Args:
+            program_name (str): Name of the .urp program on the robot controller
+
+        Returns:
+            bool: True if the program was started
+        """
         if not self.connected:
-            print("ERROR: Not connected to robot")
+            logger.error("Not connected to robot")
             return False
-        
+
         try:
-            print(f"  → Loading program: {program_name}")
-            
-            # Send load command via Dashboard Server
-            load_response = self._send_dashboard_command(f"load {program_name}")
-            print(f"     Dashboard response: {load_response}")
-            
-            if "Error" in load_response or "File not found" in load_response:
-                print(f"  ✗ Failed to load program: {load_response}")
+            logger.debug("Loading and playing program: %s", program_name)
+
+            # Send load, then play as soon as the load is acknowledged
+            load_response, play_response = self.dashboard.load_and_play(program_name)
+            logger.debug("Dashboard response: %s", load_response)
+
+            if not self.dashboard.load_succeeded(load_response):
+                logger.error("Failed to load program: %s", load_response)
                 return False
-            
-            time.sleep(1)
-            
-            # Send play command via Dashboard Server
-            print(f"  → Playing program: {program_name}")
-            play_response = self._send_dashboard_command("play")
-            print(f"     Dashboard response: {play_response}")
-            
+
+            logger.debug("Dashboard response: %s", play_response)
+
             # Reconnect RoboDK after Dashboard interaction
-            print("  → Checking RoboDK connection...")
+            logger.debug("Checking RoboDK connection...")
             self._check_and_reconnect_robodk()
-            
-            print(f"  ✓ Program {program_name} started")
+
+            logger.debug("Program %s started", program_name)
             return True
-            
+
         except Exception as e:
-            print(f"  ✗ Error running program {program_name}: {e}")
+            logger.error("Error running program %s: %s", program_name, e)
             # Try to reconnect even on error
             self._check_and_reconnect_robodk()
             return False
-    
+
     def wait_completion(self, timeout=30):
-        """Wait for robot to finish current operation."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            # Check if robot is busy
-            if not self.robot.Busy():
-                return True
-            time.sleep(0.3)
-        return False
+        """
+        Wait for the gripper program to finish.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if finished, False on timeout
+        """
+        return self.dashboard.wait_program_stopped(timeout)
@@ -6,8 +6,84 @@ that integrates with the RobotController system via URScript commands.
 """
 
 import time
+import logging
+from functools import lru_cache
 from typing import Optional, Dict
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=128)
+def _rg2_script(width_mm: float, force_n: float) -> str:
+    """
+    Build the RG2 URCaps call for a width/force pair.
+    
+    Grippers cycle through a handful of widths and forces, so the strings
+    are cached instead of being formatted on every open/close.
+    """
+    # RG2(target_width, target_force, payload, set_payload, depth_compensation, slave)
+    return f"RG2({width_mm},{force_n},0.0,True,False,False)"
+
+
+class AwaitableGripperAction:
+    """
+    Handle for a gripper motion that was started without blocking.
+    
+    The URScript command returns as soon as it is queued, so the caller can
+    overlap the gripper motion with other work and call wait() when it needs
+    the gripper to have settled. Truth-testing the action tells whether the
+    command was sent, so `if gripper.open():` keeps working.
+    """
+    
+    def __init__(self, gripper, target_width_mm: float, sent: bool, expect_grip: bool = False):
+        """
+        Initialize the action.
+        
+        Args:
+            gripper (GripperController): Gripper that runs the motion
+            target_width_mm (float): Width the gripper is moving to
+            sent (bool): Whether the URScript command was sent
+            expect_grip (bool): True for a close, which also completes when an
+                object stops the jaws short of the target width
+        """
+        self.gripper = gripper
+        self.target_width_mm = target_width_mm
+        self.sent = sent
+        self.expect_grip = expect_grip
+        self.width_tolerance_mm = 2.0
+    
+    def __bool__(self):
+        return self.sent
+    
+    def wait(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until the gripper reaches the target width or, for a close,
+        detects a grip.
+        
+        An open only completes on the target width: grip_detected may still
+        be set from the object it is releasing. Polls back off from 20 ms up
+        to 200 ms.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+        
+        Returns:
+            bool: True if the motion completed, False if not sent or timeout
+        """
+        if not self.sent:
+            return False
+        
+        deadline = time.monotonic() + timeout
+        delay = 0.02
+        while time.monotonic() < deadline:
+            status = self.gripper.get_status()
+            if status and ((self.expect_grip and status['grip_detected']) or
+                           abs(status['width_mm'] - self.target_width_mm) <= self.width_tolerance_mm):
+                return True
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.2)
+        return False
+
 
 class GripperController:
     """
@@ -39,7 +115,14 @@ class GripperController:
         self.default_release_width = 70  # 70mm for opening
         self.default_release_force = 40  # 40N
         
-        print("Gripper controller initialized (URScript mode)")
+        # Last get_status() result as (monotonic timestamp, status dict)
+        self._status_cache = (0.0, None)
+        # Cleared if the controller can't return both readings in one call
+        self._combined_status_read = True
+        # Last open/close, whose target wait_for_completion() checks; None after stop()
+        self._last_action = None
+        
+        logger.info("Gripper controller initialized (URScript mode)")
     
     def connect(self) -> bool:
         """
@@ -50,13 +133,13 @@ class GripperController:
         """
         # Connection is through RoboDK robot object, no separate connection needed
         self.connected = True
-        print("Gripper connected via URScript")
+        logger.info("Gripper connected via URScript")
         return True
     
     def disconnect(self):
         """Disconnect from the gripper."""
         self.connected = False
-        print("Gripper disconnected")
+        logger.info("Gripper disconnected")
     
     def is_connected(self) -> bool:
         """Check if gripper is connected."""
@@ -66,6 +149,10 @@ class GripperController:
         """
         Send URScript command to robot.
         
+        The script is inserted as code in the robot program. RoboDK returns
+        once it is sent; waiting for the motion is up to the caller (see
+        AwaitableGripperAction).
+        
         Args:
             script (str): URScript command to execute
         
@@ -73,27 +160,30 @@ class GripperController:
             bool: True if successful
         """
         if not self.connected:
-            print("Gripper not connected")
+            logger.error("Gripper not connected")
             return False
         
         try:
-            self.robot.RunInstruction(script, True)
+            from robodk import robolink
+            self.robot.RunInstruction(script, robolink.INSTRUCTION_INSERT_CODE)
             return True
         except Exception as e:
-            print(f"Error sending URScript: {e}")
+            logger.error("Error sending URScript: %s", e)
             return False
     
-    def open(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> bool:
+    def open(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> AwaitableGripperAction:
         """
-        Open the gripper.
+        Start opening the gripper without waiting for the motion to finish.
         
         Args:
             width_mm (float, optional): Target width in mm. Default is 70mm
             force_n (float, optional): Force in N. Default is 40N
         
         Returns:
-            bool: True if successful
+            AwaitableGripperAction: Call wait() to block until the motion is done
         """
+        self._status_cache = (0.0, None)
+        
         if width_mm is None:
             width_mm = 70  # Use 70mm for opening as per user's script
         if force_n is None:
@@ -103,30 +193,42 @@ class GripperController:
         width_mm = max(self.min_width_mm, min(self.max_width_mm, width_mm))
         force_n = max(self.min_force_n, min(self.max_force_n, force_n))
         
-        print(f"Opening gripper: width={width_mm}mm, force={force_n}N")
+        logger.debug("Opening gripper: width=%smm, force=%sN", width_mm, force_n)
         
         # Send URScript command for RG2 - using the actual function from URCaps
-        # RG2(target_width, target_force, payload, set_payload, depth_compensation, slave)
-        script = f"RG2({width_mm},{force_n},0.0,True,False,False)"
+        script = _rg2_script(width_mm, force_n)
         
         if self._send_urscript(script):
-            print("Gripper opened")
-            return True
+            logger.debug("Gripper open command sent")
+            self._last_action = AwaitableGripperAction(self, width_mm, True)
+            return self._last_action
         else:
-            print("Failed to open gripper")
-            return False
+            logger.error("Failed to open gripper")
+            return AwaitableGripperAction(self, width_mm, False)
     
-    def close(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> bool:
+    def open_sync(self, width_mm: Optional[float] = None, force_n: Optional[float] = None,
+                  timeout: float = 5.0) -> bool:
         """
-        Close the gripper.
+        Open the gripper and wait for the motion to finish.
+        
+        Returns:
+            bool: True if the gripper reached the target width
+        """
+        return self.open(width_mm, force_n).wait(timeout)
+    
+    def close(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> AwaitableGripperAction:
+        """
+        Start closing the gripper without waiting for the motion to finish.
         
         Args:
             width_mm (float, optional): Target width in mm. Default is 60mm
             force_n (float, optional): Gripping force in N. Default is 40N
         
         Returns:
-            bool: True if successful
+            AwaitableGripperAction: Call wait() to block until the motion is done
         """
+        self._status_cache = (0.0, None)
+        
         if width_mm is None:
             width_mm = 60  # Use 60mm for gripping as per user's script
         if force_n is None:
@@ -136,18 +238,28 @@ class GripperController:
         width_mm = max(self.min_width_mm, min(self.max_width_mm, width_mm))
         force_n = max(self.min_force_n, min(self.max_force_n, force_n))
         
-        print(f"Closing gripper: width={width_mm}mm, force={force_n}N")
+        logger.debug("Closing gripper: width=%smm, force=%sN", width_mm, force_n)
         
         # Send URScript command for RG2 - using the actual function from URCaps
-        # RG2(target_width, target_force, payload, set_payload, depth_compensation, slave)
-        script = f"RG2({width_mm},{force_n},0.0,True,False,False)"
+        script = _rg2_script(width_mm, force_n)
         
         if self._send_urscript(script):
-            print("Gripper closed")
-            return True
+            logger.debug("Gripper close command sent")
+            self._last_action = AwaitableGripperAction(self, width_mm, True, expect_grip=True)
+            return self._last_action
         else:
-            print("Failed to close gripper")
-            return False
+            logger.error("Failed to close gripper")
+            return AwaitableGripperAction(self, width_mm, False, expect_grip=True)
+    
+    def close_sync(self, width_mm: Optional[float] = None, force_n: Optional[float] = None,
+                   timeout: float = 5.0) -> bool:
+        """
+        Close the gripper and wait for the motion to finish.
+        
+        Returns:
+            bool: True if the gripper reached the target width or detected a grip
+        """
+        return self.close(width_mm, force_n).wait(timeout)
     
     def stop(self) -> bool:
         """
@@ -156,58 +268,123 @@ class GripperController:
         Returns:
             bool: True if successful
         """
-        print("Stopping gripper")
+        self._status_cache = (0.0, None)
+        self._last_action = None
+        logger.debug("Stopping gripper")
         script = "rg2_stop()"
         return self._send_urscript(script)
     
-    def get_status(self) -> Optional[Dict]:
+    def get_status(self, max_age: float = 0.05) -> Optional[Dict]:
         """
         Read gripper status and current measurements.
         
+        A status read within the last `max_age` seconds is returned as-is, so
+        tight polling loops (e.g. is_gripped) don't repeat the URScript reads.
+        
+        Args:
+            max_age (float): Maximum age in seconds of a cached status; 0 forces a fresh read
+        
         Returns:
             dict: Status information or None if failed
         """
+        timestamp, cached = self._status_cache
+        if cached is not None and time.monotonic() - timestamp < max_age:
+            return cached
+        
         try:
-            # Get width using the measure_width global variable from URScript
-            # The RG2 script continuously updates this value
-            width_script = "return measure_width"
-            width_result = self.robot.RunInstruction(width_script, True)
-            
-            # Get grip detection status
-            grip_script = "return grip_detected"
-            grip_result = self.robot.RunInstruction(grip_script, True)
+            width_mm, grip_detected = self._read_width_and_grip()
             
-            # Parse results
-            width_mm = float(width_result) if width_result else 0.0
-            grip_detected = bool(grip_result) if grip_result else False
-            
-            return {
+            status = {
                 'status': 0,
                 'width_mm': width_mm,
                 'force_n': self.default_grip_force,
                 'busy': False,  # RG2 doesn't expose busy status directly
                 'grip_detected': grip_detected
             }
+            self._status_cache = (time.monotonic(), status)
+            return status
         except Exception as e:
-            print(f"Error reading gripper status: {e}")
+            logger.error("Error reading gripper status: %s", e)
             return None
     
+    def _read_width_and_grip(self):
+        """
+        Read measure_width and grip_detected from the RG2 URScript globals.
+        
+        Both values are fetched with one "return [measure_width, grip_detected]"
+        call, which the controller answers with a list such as "[70.5, False]".
+        If the reply can't be parsed (older firmware), falls back to one call
+        per value and stops trying the combined form.
+        
+        Returns:
+            tuple: (width_mm, grip_detected)
+        """
+        if self._combined_status_read:
+            result = self.robot.RunInstruction("return [measure_width, grip_detected]", True)
+            try:
+                width_text, grip_text = str(result).strip().strip('[]').split(',')
+                return float(width_text), grip_text.strip().lower() in ('true', '1')
+            except ValueError:
+                self._combined_status_read = False
+        
+        # Get width using the measure_width global variable from URScript
+        # The RG2 script continuously updates this value
+        width_script = "return measure_width"
+        width_result = self.robot.RunInstruction(width_script, True)
+        
+        # Get grip detection status
+        grip_script = "return grip_detected"
+        grip_result = self.robot.RunInstruction(grip_script, True)
+        
+        # Parse results
+        width_mm = float(width_result) if width_result else 0.0
+        grip_detected = bool(grip_result) if grip_result else False
+        return width_mm, grip_detected
+    
     def wait_for_completion(self, timeout: float = 5.0) -> bool:
         """
         Wait for gripper to complete current movement.
         
+        The RG2 doesn't expose a busy flag. The movement is done once the
+        width is at the last open/close target (or, for a close, a grip is
+        detected), or once measure_width stops changing after it has moved:
+        two fresh readings at least 30 ms apart that differ by less than
+        0.2 mm. Right after a command the jaws haven't started yet, so a
+        steady width only counts once it has changed. With no open/close
+        pending (none sent, or stopped), a steady width is enough. Polls back
+        off from 20 ms up to 100 ms.
+        
         Args:
             timeout (float): Maximum time to wait in seconds
         
         Returns:
             bool: True if completed, False if timeout
         """
-        start_time = time.time()
-        
-        # RG2 gripper doesn't have a direct "busy" status
-        # Wait a fixed time for the gripper to complete
-        time.sleep(0.5)  # 500ms is usually enough for RG2
-        return True
+        action = self._last_action
+        deadline = time.monotonic() + timeout
+        delay = 0.02
+        start_width = last_width = None
+        last_time = 0.0
+        moved = action is None
+        while time.monotonic() < deadline:
+            status = self.get_status(max_age=0)
+            now = time.monotonic()
+            if status:
+                width = status['width_mm']
+                if action is not None and (
+                        abs(width - action.target_width_mm) <= action.width_tolerance_mm or
+                        (action.expect_grip and status['grip_detected'])):
+                    return True
+                if start_width is None:
+                    start_width = width
+                moved = moved or abs(width - start_width) >= 0.2
+                if last_width is None or now - last_time >= 0.03:
+                    if moved and last_width is not None and abs(width - last_width) < 0.2:
+                        return True
+                    last_width, last_time = width, now
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.1)
+        return False
     
     def is_gripped(self) -> bool:
         """
@@ -236,4 +413,5 @@ class GripperController:
         self.default_grip_force = grip_force
         self.default_release_width = release_width
         self.default_release_force = release_force
-        print(f"Gripper defaults updated: grip={grip_width}mm/{grip_force}N, release={release_width}mm/{release_force}N")
+        logger.info("Gripper defaults updated: grip=%smm/%sN, release=%smm/%sN",
+                    grip_width, grip_force, release_width, release_force)
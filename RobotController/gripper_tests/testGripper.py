@@ -4,61 +4,60 @@ OnRobot RG2 Gripper Test - Dashboard TCP with RoboDK Management
 This test loads and runs URP programs via Dashboard Server (port 29999)
 while managing RoboDK connection to prevent disconnects.
 """
+import os
 import socket
+import sys
 import time
 from robodk import robolink
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_gripper import CachedConnectedState, DashboardClient, SocketTransport, wait_robodk_ready
+from robodk_session import get_rdk, get_robot
+
 ROBOT_IP = "192.168.1.10"
 PORT = 29999  # Dashboard server
+RG2_SETTLE_MS = 100  # Settle time after the program stops before the next step
+READY_TTL = 1.0  # Seconds a READY connection state is trusted without re-checking
 
-def dashboard(cmd):
-    """Send command to UR Dashboard Server."""
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(5)
-        s.connect((ROBOT_IP, PORT))
-        s.recv(1024)  # welcome msg
-        s.send((cmd + "\n").encode())
-        resp = s.recv(1024).decode().strip()
-        s.close()
-        return resp
-    except Exception as e:
-        return f"Error: {e}"
+client = DashboardClient(SocketTransport(ROBOT_IP, PORT))
+dashboard = client.send_command  # Send command to UR Dashboard Server
+
+def wait_program_stopped(timeout=10):
+    """Wait until the program stops, then let the RG2 settle."""
+    if client.wait_program_stopped(timeout, max_delay=0.2):
+        time.sleep(RG2_SETTLE_MS / 1000)
+        return True
+    return False
+
+CONNECTION_ERRORS = (ConnectionError, socket.timeout, robolink.TargetReachError)
 
 def check_robodk_connection(rdk, robot):
     """Check and restore RoboDK connection if needed."""
     try:
-        # Test connection by getting robot name
-        robot_name = robot.Name()
-        
         # Check connection state
-        state = robot.ConnectedState()
-        if state != robolink.ROBOTCOM_READY:
-            print(f"  ⚠ RoboDK connection state: {state}")
-            print("  → Reconnecting to robot...")
-            robot.Connect()
-            time.sleep(2)
-            
-            new_state = robot.ConnectedState()
-            if new_state == robolink.ROBOTCOM_READY:
-                print("  ✓ RoboDK reconnected successfully")
-                return True
-            else:
-                print(f"  ✗ Failed to reconnect (state: {new_state})")
-                return False
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ RoboDK connection check failed: {e}")
-        print("  → Attempting to reconnect...")
-        try:
-            robot.Connect()
-            time.sleep(2)
-            print("  ✓ RoboDK reconnected")
+        state = connected_state()
+        if state == robolink.ROBOTCOM_READY:
             return True
-        except:
-            print("  ✗ Failed to reconnect")
-            return False
+        print(f"  ⚠ RoboDK connection state: {state}")
+    except CONNECTION_ERRORS as e:
+        print(f"  ✗ RoboDK connection check failed: {e}")
+    
+    print("  → Reconnecting to robot...")
+    try:
+        robot.Connect(blocking=False)
+        new_state = wait_robodk_ready(robot)
+    except CONNECTION_ERRORS as e:
+        print(f"  ✗ Failed to reconnect: {e}")
+        return False
+    
+    if new_state == robolink.ROBOTCOM_READY:
+        print("  ✓ RoboDK reconnected successfully")
+        connected_state.mark_ready()
+        return True
+    print(f"  ✗ Failed to reconnect (state: {new_state})")
+    return False
 
 # ============================================================================
 # MAIN PROGRAM
@@ -72,9 +71,10 @@ print(f"Dashboard Port: {PORT}")
 print(f"Programs: open-gripper.urp, close-gripper.urp")
 
 # Initialize RoboDK connection
-print("\n[1/5] Connecting to RoboDK...")
-rdk = robolink.Robolink()
-robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+print("\n[1/4] Connecting to RoboDK...")
+rdk = get_rdk()
+robot = get_robot()
+connected_state = CachedConnectedState(robot, ttl=READY_TTL)
 
 if not robot.Valid():
     print("  ✗ ERROR: Robot not found in RoboDK!")
@@ -82,29 +82,27 @@ if not robot.Valid():
 
 print(f"  ✓ Connected to robot: {robot.Name()}")
 
-# Test Dashboard connection
-print("\n[2/5] Testing Dashboard Server connection...")
-response = dashboard("PolyscopeVersion")
-if "Error" in response:
-    print(f"  ✗ Failed to connect to Dashboard: {response}")
-    print("\n  Make sure:")
-    print("    • Robot is powered on")
-    print("    • IP address is correct (192.168.1.10)")
-    print("    • Dashboard Server is enabled on robot")
-    exit(1)
-print(f"  ✓ Dashboard connected: {response}")
-
 # Check RoboDK connection before Dashboard operations
-print("\n[3/5] Checking RoboDK connection status...")
+print("\n[2/4] Checking RoboDK connection status...")
 check_robodk_connection(rdk, robot)
 
-# Load and run open-gripper program
-print("\n[4/5] Opening gripper...")
+# Load and run open-gripper program. The Dashboard connection is opened by this
+# first command, so a separate connection probe isn't needed.
+print("\n[3/4] Opening gripper...")
 print("  → Loading open-gripper.urp")
 response = dashboard("load open-gripper.urp")
 print(f"     Response: {response}")
 
-if "File not found" in response or "Error" in response:
+if client.transport.welcome is None:  # No banner: the connection itself failed
+    print(f"  ✗ Failed to connect to Dashboard: {response}")
+    print("\n  Make sure:")
+    print("    • Robot is powered on")
+    print(f"    • IP address is correct ({ROBOT_IP})")
+    print("    • Dashboard Server is enabled on robot")
+    exit(1)
+print(f"  ✓ Dashboard connected: {client.transport.welcome}")
+
+if not client.load_succeeded(response):
     print("  ✗ Program not found on robot controller!")
     print("\n  Make sure open-gripper.urp exists in /programs/ on robot")
 else:
@@ -114,20 +112,25 @@ else:
     response = dashboard("play")
     print(f"     Response: {response}")
     
-    time.sleep(3)  # Wait for gripper to open
-    print("  ✓ Gripper opened")
-
-# Check RoboDK connection after Dashboard operation
+    # Wait for gripper to open
+    if wait_program_stopped():
+        print("  ✓ Gripper opened")
+    else:
+        print("  ⚠ Program still running after 10 s")
+
+# Check RoboDK connection after Dashboard operation; the program may have
+# dropped it, so a cached READY from before doesn't count
 print("\n  → Checking RoboDK connection...")
+connected_state.invalidate()
 check_robodk_connection(rdk, robot)
 
 # Load and run close-gripper program  
-print("\n[5/5] Closing gripper...")
+print("\n[4/4] Closing gripper...")
 print("  → Loading close-gripper.urp")
 response = dashboard("load close-gripper.urp")
 print(f"     Response: {response}")
 
-if "File not found" in response or "Error" in response:
+if not client.load_succeeded(response):
     print("  ✗ Program not found on robot controller!")
     print("\n  Make sure close-gripper.urp exists in /programs/ on robot")
 else:
@@ -137,11 +140,15 @@ else:
     response = dashboard("play")
     print(f"     Response: {response}")
     
-    time.sleep(3)  # Wait for gripper to close
-    print("  ✓ Gripper closed")
+    # Wait for gripper to close
+    if wait_program_stopped():
+        print("  ✓ Gripper closed")
+    else:
+        print("  ⚠ Program still running after 10 s")
 
 # Final RoboDK connection check
 print("\n  → Final RoboDK connection check...")
+connected_state.invalidate()
 if check_robodk_connection(rdk, robot):
     print("  ✓ RoboDK connection maintained")
 else:
@@ -157,3 +164,5 @@ print("  • Programs must exist on robot controller in /programs/")
 print("\nTo verify programs on robot:")
 print("  1. On teach pendant: Program → Load Program")
 print("  2. Check if open-gripper.urp and close-gripper.urp are listed")
+
+client.close()
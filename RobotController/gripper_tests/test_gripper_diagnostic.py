@@ -8,31 +8,113 @@ Approaches:
 1. Primary Interface (port 30001) - Script execution
 2. Real-time Interface (port 30002) - URScript commands
 3. Dashboard Server (port 29999) - Robot control commands
+
+For comparison, the menu can also call the RG2 URCap function through the
+RoboDK robot driver (real robot only).
 """
+import os
+import atexit
+import errno
+import selectors
 import socket
+import sys
 import time
+import select
 import struct
+from functools import lru_cache
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_gripper import DashboardClient, RoboDKTransport
+from urscript_programs import URScriptBatch
 
 
 # ============================================================================
 # TCP Interface Classes
 # ============================================================================
 
+# Socket options applied after connecting: send short URScript lines at once
+DEFAULT_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+# Linux only; the kernel clears it again, so it is re-armed after each send
+_TCP_QUICKACK = getattr(socket, 'TCP_QUICKACK', None)
+
+
+@lru_cache(maxsize=64)
+def _encode_line(text):
+    """Newline-terminated UTF-8 bytes for a script; repeated commands are encoded once."""
+    return (text + "\n").encode('utf-8')
+
+
+# (ip, port) -> open socket, reused by every interface object (and test) for that address
+_TCP_POOL = {}
+
+
+def _pooled_socket(address):
+    """
+    Return the pooled socket for an address, or None if there is none or it has closed.
+    
+    The controller streams state packets on these ports, which the tests
+    never read; they are discarded here so the receive buffer doesn't fill
+    up while a socket waits in the pool.
+    """
+    sock = _TCP_POOL.get(address)
+    if sock is None:
+        return None
+    try:
+        while select.select([sock], [], [], 0)[0]:
+            if not sock.recv(65536):
+                raise ConnectionError("closed by the robot")
+        return sock
+    except OSError:
+        _TCP_POOL.pop(address, None)
+        sock.close()
+        return None
+
+
+@atexit.register
+def _close_pool():
+    """Close every pooled socket at interpreter exit."""
+    for sock in _TCP_POOL.values():
+        sock.close()
+    _TCP_POOL.clear()
+
+
 class URPrimaryInterface:
     """Primary interface for URScript execution (port 30001)."""
     
-    def __init__(self, robot_ip, port=30001):
-        """Initialize primary interface."""
+    SEND_BUFFER_SIZE = 65536  # Room for a whole multi-line program in one write
+    
+    def __init__(self, robot_ip, port=30001, socket_options=None):
+        """
+        Initialize primary interface.
+        
+        Args:
+            robot_ip (str): IP address of the UR robot
+            port (int): Interface port
+            socket_options (list, optional): (level, optname, value) triples passed to
+                setsockopt() after connecting, e.g. to add TCP_QUICKACK on Linux.
+                Default is DEFAULT_SOCKET_OPTIONS (TCP_NODELAY).
+        """
         self.robot_ip = robot_ip
         self.port = port
+        self.socket_options = list(DEFAULT_SOCKET_OPTIONS if socket_options is None else socket_options)
         self.sock = None
     
     def connect(self):
-        """Connect to robot."""
+        """Connect to robot, reusing a pooled connection to the same address."""
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(5)
-            self.sock.connect((self.robot_ip, self.port))
+            self.sock = _pooled_socket((self.robot_ip, self.port))
+            if self.sock is not None:
+                print(f"  ✓ Reusing connection to {self.robot_ip}:{self.port}")
+                return True
+            self.sock = socket.create_connection((self.robot_ip, self.port), timeout=5)
+            for level, optname, value in self.socket_options:
+                self.sock.setsockopt(level, optname, value)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SEND_BUFFER_SIZE)
+            self._quickack()
+            _TCP_POOL[(self.robot_ip, self.port)] = self.sock
             print(f"  ✓ Connected to {self.robot_ip}:{self.port}")
             return True
         except Exception as e:
@@ -46,36 +128,73 @@ class URPrimaryInterface:
                 if not self.connect():
                     return False
             
-            script_with_end = script + "\n"
-            self.sock.send(script_with_end.encode('utf-8'))
+            # sendall: a plain send() may write only part of a long program
+            self.sock.sendall(_encode_line(script))
+            self._quickack()
             print(f"  ✓ Script sent: {script}")
             return True
         except Exception as e:
             print(f"  ✗ Error sending script: {e}")
+            self.disconnect()  # Don't leave a broken socket in the pool
             return False
     
+    def _quickack(self):
+        """Ask the kernel to ACK the controller's replies at once instead of delaying them."""
+        if _TCP_QUICKACK is not None:
+            try:
+                self.sock.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+            except OSError:
+                pass
+    
     def disconnect(self):
-        """Disconnect from robot."""
+        """Close the connection and remove it from the pool."""
         if self.sock:
+            if _TCP_POOL.get((self.robot_ip, self.port)) is self.sock:
+                del _TCP_POOL[(self.robot_ip, self.port)]
             self.sock.close()
             self.sock = None
+    
+    def __enter__(self):
+        """Use as `with ... as interface:` to hold one connection for a whole test."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Leave the connection pooled for the next test, or close it after an error."""
+        if exc_type is not None:
+            self.disconnect()
+        self.sock = None
 
 
 class URRealtimeInterface:
     """Real-time interface for URScript (port 30002)."""
     
-    def __init__(self, robot_ip, port=30002):
-        """Initialize real-time interface."""
+    def __init__(self, robot_ip, port=30002, socket_options=None):
+        """
+        Initialize real-time interface.
+        
+        Args:
+            robot_ip (str): IP address of the UR robot
+            port (int): Interface port
+            socket_options (list, optional): (level, optname, value) triples passed to
+                setsockopt() after connecting, e.g. to add TCP_QUICKACK on Linux.
+                Default is DEFAULT_SOCKET_OPTIONS (TCP_NODELAY).
+        """
         self.robot_ip = robot_ip
         self.port = port
+        self.socket_options = list(DEFAULT_SOCKET_OPTIONS if socket_options is None else socket_options)
         self.sock = None
     
     def connect(self):
-        """Connect to robot."""
+        """Connect to robot, reusing a pooled connection to the same address."""
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(5)
-            self.sock.connect((self.robot_ip, self.port))
+            self.sock = _pooled_socket((self.robot_ip, self.port))
+            if self.sock is not None:
+                print(f"  ✓ Reusing connection to {self.robot_ip}:{self.port}")
+                return True
+            self.sock = socket.create_connection((self.robot_ip, self.port), timeout=5)
+            for level, optname, value in self.socket_options:
+                self.sock.setsockopt(level, optname, value)
+            _TCP_POOL[(self.robot_ip, self.port)] = self.sock
             print(f"  ✓ Connected to {self.robot_ip}:{self.port}")
             return True
         except Exception as e:
@@ -89,26 +208,38 @@ class URRealtimeInterface:
                 if not self.connect():
                     return False
             
-            command_with_end = command + "\n"
-            self.sock.send(command_with_end.encode('utf-8'))
+            self.sock.sendall(_encode_line(command))
             print(f"  ✓ Command sent: {command}")
             return True
         except Exception as e:
             print(f"  ✗ Error: {e}")
+            self.disconnect()  # Don't leave a broken socket in the pool
             return False
     
     def disconnect(self):
-        """Disconnect from robot."""
+        """Close the connection and remove it from the pool."""
         if self.sock:
+            if _TCP_POOL.get((self.robot_ip, self.port)) is self.sock:
+                del _TCP_POOL[(self.robot_ip, self.port)]
             self.sock.close()
             self.sock = None
+    
+    def __enter__(self):
+        """Use as `with ... as interface:` to hold one connection for a whole test."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Leave the connection pooled for the next test, or close it after an error."""
+        if exc_type is not None:
+            self.disconnect()
+        self.sock = None
 
 
 # ============================================================================
 # Test Functions
 # ============================================================================
 
-def test_primary_interface():
+def test_primary_interface(robot_ip=None):
     """Test gripper control via Primary Interface (port 30001)."""
     print("\n" + "="*70)
     print("APPROACH 1: Primary Interface (Port 30001)")
@@ -116,65 +247,55 @@ def test_primary_interface():
     print("\nThis sends URScript programs to the robot's primary interface.")
     print("Best for: Complex scripts, programs with logic")
     
-    robot_ip = input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
-    
-    interface = URPrimaryInterface(robot_ip)
+    if robot_ip is None:
+        robot_ip = ask_robot_ip()
     
-    try:
-        print("\n[Step 1] Connecting to primary interface...")
-        if not interface.connect():
+    with URPrimaryInterface(robot_ip) as interface:
+        try:
+            print("\n[Step 1] Connecting to primary interface...")
+            if not interface.connect():
+                return False
+            
+            print("\n[Step 2] Testing gripper commands...")
+            
+            # (description, command, seconds to let it act)
+            steps = [
+                ("Digital output - Open gripper", "set_digital_out(0, True)", 2),
+                ("Digital output - Close gripper", "set_digital_out(0, False)", 2),
+                ("OnRobot RG2 - Open", "RG2(110, 40, 0.0, True, False)", 3),
+                ("OnRobot RG2 - Close", "RG2(40, 40, 0.0, True, False)", 3),
+                ("Robotiq - Open", "rq_open()", 2),
+                ("Robotiq - Close", "rq_close()", 2),
+            ]
+            
+            # Sent as one program with the waits run on the controller
+            batch = URScriptBatch(interface.send_script, name="primary_gripper_test",
+                                  max_lines=None, max_latency=None)
+            for i, (desc, cmd, wait_s) in enumerate(steps, 1):
+                print(f"\n  [Test {i}] {desc}: {cmd}")
+                batch.add(f"textmsg(\"Test {i}: {desc}\")")
+                batch.add(cmd)
+                batch.add(f"sleep({wait_s})")
+            
+            if batch.flush():
+                total_s = sum(wait_s for _, _, wait_s in steps)
+                print(f"\n  → Waiting {total_s}s for the sequence to run...")
+                print("    (If nothing moves, check the robot log: a function from a missing")
+                print("     URCap makes the controller reject the whole program)")
+                time.sleep(total_s)
+            
+            print("\n✓ Primary interface tests complete!")
+            return True
+            
+        except KeyboardInterrupt:
+            print("\n  Test interrupted")
+            return False
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
             return False
-        
-        print("\n[Step 2] Testing gripper commands...")
-        
-        # Test 1: Digital output control
-        print("\n  [Test 1] Digital output - Open gripper")
-        script = "set_digital_out(0, True)"
-        interface.send_script(script)
-        time.sleep(2)
-        
-        print("\n  [Test 2] Digital output - Close gripper")
-        script = "set_digital_out(0, False)"
-        interface.send_script(script)
-        time.sleep(2)
-        
-        # Test 3: OnRobot RG2 command
-        print("\n  [Test 3] OnRobot RG2 - Open")
-        script = "RG2(110, 40, 0.0, True, False)"
-        interface.send_script(script)
-        time.sleep(3)
-        
-        print("\n  [Test 4] OnRobot RG2 - Close")
-        script = "RG2(40, 40, 0.0, True, False)"
-        interface.send_script(script)
-        time.sleep(3)
-        
-        # Test 5: Robotiq gripper
-        print("\n  [Test 5] Robotiq - Open")
-        script = "rq_open()"
-        interface.send_script(script)
-        time.sleep(2)
-        
-        print("\n  [Test 6] Robotiq - Close")
-        script = "rq_close()"
-        interface.send_script(script)
-        time.sleep(2)
-        
-        print("\n✓ Primary interface tests complete!")
-        interface.disconnect()
-        return True
-        
-    except KeyboardInterrupt:
-        print("\n  Test interrupted")
-        interface.disconnect()
-        return False
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
-        interface.disconnect()
-        return False
 
 
-def test_realtime_interface():
+def test_realtime_interface(robot_ip=None):
     """Test gripper control via Real-time Interface (port 30002)."""
     print("\n" + "="*70)
     print("APPROACH 2: Real-time Interface (Port 30002)")
@@ -182,65 +303,74 @@ def test_realtime_interface():
     print("\nThis sends real-time URScript commands.")
     print("Best for: Quick commands, real-time control")
     
-    robot_ip = input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
-    
-    interface = URRealtimeInterface(robot_ip)
+    if robot_ip is None:
+        robot_ip = ask_robot_ip()
     
-    try:
-        print("\n[Step 1] Connecting to real-time interface...")
-        if not interface.connect():
+    with URRealtimeInterface(robot_ip) as interface:
+        try:
+            print("\n[Step 1] Connecting to real-time interface...")
+            if not interface.connect():
+                return False
+            
+            print("\n[Step 2] Testing gripper commands...")
+            
+            # Test sequence
+            commands = [
+                ("Open gripper (digital out)", "set_digital_out(0, True)"),
+                ("Close gripper (digital out)", "set_digital_out(0, False)"),
+                ("Open RG2", "RG2(110, 40, 0.0, True, False)"),
+                ("Close RG2", "RG2(40, 40, 0.0, True, False)"),
+                ("Partial close RG2", "RG2(60, 40, 0.0, True, False)"),
+            ]
+            
+            # One program with the pauses run on the controller, instead of one
+            # send (which replaces the running program) and a Python sleep per command
+            step_s = 2
+            batch = URScriptBatch(interface.send_command, name="realtime_gripper_test",
+                                  max_lines=None, max_latency=None)
+            for i, (desc, cmd) in enumerate(commands, 1):
+                print(f"\n  [Test {i}] {desc}: {cmd}")
+                batch.add(f"textmsg(\"Test {i}: {desc}\")")
+                batch.add(cmd)
+                batch.add(f"sleep({step_s})")
+            
+            if batch.flush():
+                print(f"\n  → Waiting {len(commands) * step_s}s for the sequence to run...")
+                print("    (If nothing moves, check the robot log: a function from a missing")
+                print("     URCap makes the controller reject the whole program)")
+                time.sleep(len(commands) * step_s)
+            
+            print("\n✓ Real-time interface tests complete!")
+            return True
+            
+        except KeyboardInterrupt:
+            print("\n  Test interrupted")
+            return False
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
             return False
-        
-        print("\n[Step 2] Testing gripper commands...")
-        
-        # Test sequence
-        commands = [
-            ("Open gripper (digital out)", "set_digital_out(0, True)"),
-            ("Close gripper (digital out)", "set_digital_out(0, False)"),
-            ("Open RG2", "RG2(110, 40, 0.0, True, False)"),
-            ("Close RG2", "RG2(40, 40, 0.0, True, False)"),
-            ("Partial close RG2", "RG2(60, 40, 0.0, True, False)"),
-        ]
-        
-        for i, (desc, cmd) in enumerate(commands, 1):
-            print(f"\n  [Test {i}] {desc}")
-            interface.send_command(cmd)
-            time.sleep(2)
-        
-        print("\n✓ Real-time interface tests complete!")
-        interface.disconnect()
-        return True
-        
-    except KeyboardInterrupt:
-        print("\n  Test interrupted")
-        interface.disconnect()
-        return False
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
-        interface.disconnect()
-        return False
 
 
-def test_combined_script():
+def test_combined_script(robot_ip=None):
     """Test sending complete URScript program via TCP."""
     print("\n" + "="*70)
     print("APPROACH 3: Complete URScript Program")
     print("="*70)
     print("\nThis sends a complete multi-line URScript program.")
     
-    robot_ip = input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
-    
-    interface = URPrimaryInterface(robot_ip)
+    if robot_ip is None:
+        robot_ip = ask_robot_ip()
     
-    try:
-        print("\n[Step 1] Connecting...")
-        if not interface.connect():
-            return False
-        
-        print("\n[Step 2] Creating gripper test program...")
-        
-        # Complete URScript program
-        script = """def gripper_test():
+    with URPrimaryInterface(robot_ip) as interface:
+        try:
+            print("\n[Step 1] Connecting...")
+            if not interface.connect():
+                return False
+            
+            print("\n[Step 2] Creating gripper test program...")
+            
+            # Complete URScript program
+            script = """def gripper_test():
   # Open gripper
   RG2(110, 40, 0.0, True, False)
   sleep(2.0)
@@ -259,43 +389,101 @@ end
 
 gripper_test()
 """
-        
-        print("  Program:")
-        for line in script.split('\n')[:10]:
-            print(f"    {line}")
-        print("    ...")
-        
-        print("\n[Step 3] Sending program to robot...")
-        input("  Press ENTER to execute (Ctrl+C to cancel)...")
-        
-        interface.send_script(script)
-        
-        print("\n  ✓ Program sent!")
-        print("  ⏳ Executing (watch robot)...")
-        time.sleep(10)
-        
-        print("\n✓ Program execution complete!")
-        interface.disconnect()
-        return True
-        
-    except KeyboardInterrupt:
-        print("\n  Test cancelled")
-        interface.disconnect()
-        return False
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
-        interface.disconnect()
-        return False
+            
+            print("  Program:")
+            for line in script.split('\n')[:10]:
+                print(f"    {line}")
+            print("    ...")
+            
+            print("\n[Step 3] Sending program to robot...")
+            input("  Press ENTER to execute (Ctrl+C to cancel)...")
+            
+            interface.send_script(script)
+            
+            print("\n  ✓ Program sent!")
+            print("  ⏳ Executing (watch robot)...")
+            time.sleep(10)
+            
+            print("\n✓ Program execution complete!")
+            return True
+            
+        except KeyboardInterrupt:
+            print("\n  Test cancelled")
+            return False
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
+            return False
+
 
+def ask_robot_ip():
+    """Prompt for the robot IP (default 192.168.0.10)."""
+    return input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
 
-def test_diagnostic():
+
+def _probe_ports(robot_ip, ports, timeout=2):
+    """
+    Try several TCP ports at once and describe each result.
+    
+    All connects are started non-blocking and completed through one
+    selector, so the whole scan takes at most one `timeout`.
+    
+    Returns:
+        dict: port -> one result line, e.g. "✓ Connected (no immediate data)"
+    """
+    results = {}
+    selector = selectors.DefaultSelector()
+    for port in ports:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        err = sock.connect_ex((robot_ip, port))
+        if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', -1)):
+            selector.register(sock, selectors.EVENT_WRITE, port)
+        else:
+            results[port] = f"✗ Error: {os.strerror(err)}"
+            sock.close()
+    
+    deadline = time.monotonic() + timeout
+    while selector.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        for key, _ in selector.select(remaining):
+            sock, port = key.fileobj, key.data
+            selector.unregister(sock)
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err == 0:
+                # Read a banner only if the port has already sent one
+                results[port] = "✓ Connected (no immediate data)"
+                ready, _, _ = select.select([sock], [], [], 0.1)
+                if ready:
+                    try:
+                        data = sock.recv(1024)
+                        results[port] = f"✓ Connected - Received: {data[:50]}"
+                    except (BlockingIOError, socket.timeout, ConnectionError):
+                        pass
+            elif err == errno.ECONNREFUSED:
+                results[port] = "✗ Connection refused"
+            else:
+                results[port] = f"✗ Error: {os.strerror(err)}"
+            sock.close()
+    
+    # Whatever is still registered never finished connecting
+    for key in list(selector.get_map().values()):
+        results[key.data] = "✗ Timeout"
+        key.fileobj.close()
+    selector.close()
+    return results
+
+
+def test_diagnostic(robot_ip=None):
     """Run diagnostic on TCP connection."""
     print("\n" + "="*70)
     print("APPROACH 4: Connection Diagnostic")
     print("="*70)
     print("\nTest all TCP ports and connection methods.")
     
-    robot_ip = input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
+    if robot_ip is None:
+        robot_ip = ask_robot_ip()
     
     ports_to_test = [
         (29999, "Dashboard Server"),
@@ -307,31 +495,15 @@ def test_diagnostic():
     
     print(f"\n[Testing connectivity to {robot_ip}]")
     
+    # Probe all ports at once, so an offline robot costs one timeout rather than one per port
+    results = _probe_ports(robot_ip, [port for port, _ in ports_to_test])
     for port, name in ports_to_test:
         print(f"\n  Port {port} ({name})...")
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            sock.connect((robot_ip, port))
-            
-            # Try to receive data
-            try:
-                data = sock.recv(1024, socket.MSG_DONTWAIT)
-                print(f"    ✓ Connected - Received: {data[:50]}")
-            except:
-                print(f"    ✓ Connected (no immediate data)")
-            
-            sock.close()
-            
-        except socket.timeout:
-            print(f"    ✗ Timeout")
-        except ConnectionRefusedError:
-            print(f"    ✗ Connection refused")
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
+        print(f"    {results[port]}")
     
     print("\n✓ Diagnostic complete!")
-    return True
+    # False if no port answered, e.g. the robot is off or the IP is wrong
+    return any(result.startswith("✓") for result in results.values())
 
 
 def main():
@@ -345,9 +517,10 @@ def main():
     print("  3 - Complete Script - Multi-line program")
     print("  4 - Connection Diagnostic - Test all ports")
     print("  5 - Run ALL tests")
+    print("  6 - RG2 calls via RoboDK - Real robot only")
     print("="*70)
     
-    choice = input("\nEnter choice (1-5): ").strip()
+    choice = input("\nEnter choice (1-6): ").strip()
     
     if choice == '1':
         test_primary_interface()
@@ -359,13 +532,20 @@ def main():
         test_diagnostic()
     elif choice == '5':
         print("\nRunning ALL tests...")
-        test_diagnostic()
+        # The tests run one at a time: each sends programs to the same
+        # controller, and a new program replaces the one running
+        robot_ip = ask_robot_ip()
+        if not test_diagnostic(robot_ip):
+            print("\n✗ No port reachable - skipping the gripper tests")
+            return
         input("\nPress ENTER for next test...")
-        test_primary_interface()
+        test_primary_interface(robot_ip)
         input("\nPress ENTER for next test...")
-        test_realtime_interface()
+        test_realtime_interface(robot_ip)
         input("\nPress ENTER for next test...")
-        test_combined_script()
+        test_combined_script(robot_ip)
+    elif choice == '6':
+        test_robodk_gripper()
     else:
         print("Invalid choice")
         return
@@ -375,86 +555,113 @@ def main():
     print("="*70)
 
 
-if __name__ == "__main__":
-    main()
-
-# Set to real robot mode
-choice = input("\n[6] Switch to REAL ROBOT mode and test? (y/n): ").strip().lower()
-if choice == 'y':
-    print("\n    ⚠ SWITCHING TO REAL ROBOT MODE")
-    print("    Make sure the robot is:")
-    print("      - Connected in RoboDK")
-    print("      - In a safe position")
-    print("      - RG2 gripper is installed and configured in URCaps")
-    input("    Press ENTER to continue or Ctrl+C to cancel...")
-    
-    rdk.setRunMode(robolink.RUNMODE_RUN_ROBOT)
-    time.sleep(1)
-    
-    new_mode = rdk.RunMode()
-    print(f"    New mode: {new_mode} - {mode_names.get(new_mode, 'Unknown')}")
-    
-    # Try gripper commands with detailed feedback
-    print("\n[7] Testing gripper commands...")
-    
-    print("\n    Test 1: Open gripper (70mm, 40N force)")
-    result = robot.RunInstruction("RG2(70,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
-    print(f"    Result: {result}")
-    print("    Waiting 5 seconds... (watch the gripper!)")
-    time.sleep(5)
-    
-    print("\n    Test 2: Close gripper (40mm, 40N force)")
-    result = robot.RunInstruction("RG2(40,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
-    print(f"    Result: {result}")
-    print("    Waiting 5 seconds... (watch the gripper!)")
-    time.sleep(5)
-    
-    print("\n    Test 3: Open gripper again (70mm)")
-    result = robot.RunInstruction("RG2(70,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
-    print(f"    Result: {result}")
-    print("    Waiting 5 seconds...")
-    time.sleep(5)
-    
-    print("\n[8] Did the gripper move? (y/n): ", end='')
-    moved = input().strip().lower()
-    
-    if moved != 'y':
-        print("\n" + "="*60)
-        print("TROUBLESHOOTING - Gripper not moving:")
-        print("="*60)
-        print("1. Check URCaps Installation:")
-        print("   - On the UR teach pendant, go to Program → Installation")
-        print("   - Check if 'OnRobot' or 'RG2' URCaps is installed")
-        print("   - The RG2 function must be available in the Installation")
-        print("")
-        print("2. Verify Gripper Connection:")
-        print("   - RG2 should be connected to robot tool connector")
-        print("   - Check physical connections")
-        print("")
-        print("3. Check RoboDK Robot Driver:")
-        print("   - Right-click robot in RoboDK")
-        print("   - Go to 'Connect to robot'")
-        print("   - Make sure correct driver is selected (UR)")
-        print("   - IP address should match your robot")
-        print("")
-        print("4. Test from UR Pendant:")
-        print("   - Try running RG2(70,40,0.0,True,False,False) from pendant")
-        print("   - If it doesn't work there, it's a URCaps issue")
-        print("="*60)
+def test_robodk_gripper():
+    """
+    Call the RG2 URCap function through RoboDK on the real robot.
+    
+    Unlike the other tests, this goes through the RoboDK robot driver rather
+    than a direct socket, so RoboDK must be running with the robot connected.
+    """
+    from robodk import robolink
+    from robodk_session import get_rdk, get_robot
+    
+    print("\n" + "="*70)
+    print("APPROACH 5: RG2 Calls via RoboDK (real robot)")
+    print("="*70)
+    print("\nThis calls the RG2 URCap function through the RoboDK robot driver.")
+    
+    rdk = get_rdk()
+    robot = get_robot()
+    if not robot.Valid():
+        print("✗ ERROR: Robot not found in RoboDK!")
+        return False
+    print(f"✓ Connected to: {robot.Name()}")
+    
+    mode_names = {robolink.RUNMODE_SIMULATE: 'Simulation', robolink.RUNMODE_RUN_ROBOT: 'Real robot'}
+    
+    choice = input("\n[1] Switch to REAL ROBOT mode and test? (y/n): ").strip().lower()
+    if choice == 'y':
+        print("\n    ⚠ SWITCHING TO REAL ROBOT MODE")
+        print("    Make sure the robot is:")
+        print("      - Connected in RoboDK")
+        print("      - In a safe position")
+        print("      - RG2 gripper is installed and configured in URCaps")
+        input("    Press ENTER to continue or Ctrl+C to cancel...")
+    
+        rdk.setRunMode(robolink.RUNMODE_RUN_ROBOT)
+        time.sleep(1)
+    
+        new_mode = rdk.RunMode()
+        print(f"    New mode: {new_mode} - {mode_names.get(new_mode, 'Unknown')}")
+    
+        # programState through RoboDK follows the robot's Busy() flag, so each
+        # wait ends when the gripper call finishes (at most 5 s) instead of after 5 s
+        gripper_state = DashboardClient(RoboDKTransport(robot))
+    
+        # Try gripper commands with detailed feedback
+        print("\n[2] Testing gripper commands...")
+    
+        print("\n    Test 1: Open gripper (70mm, 40N force)")
+        result = robot.RunInstruction("RG2(70,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
+        print(f"    Result: {result}")
+        print("    Waiting for the gripper (up to 5 s)... (watch the gripper!)")
+        gripper_state.wait_program_stopped(timeout=5)
+    
+        print("\n    Test 2: Close gripper (40mm, 40N force)")
+        result = robot.RunInstruction("RG2(40,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
+        print(f"    Result: {result}")
+        print("    Waiting for the gripper (up to 5 s)... (watch the gripper!)")
+        gripper_state.wait_program_stopped(timeout=5)
+    
+        print("\n    Test 3: Open gripper again (70mm)")
+        result = robot.RunInstruction("RG2(70,40,0.0,True,False,False)", robolink.INSTRUCTION_CALL_PROGRAM)
+        print(f"    Result: {result}")
+        print("    Waiting for the gripper (up to 5 s)...")
+        gripper_state.wait_program_stopped(timeout=5)
+    
+        print("\n[3] Did the gripper move? (y/n): ", end='')
+        moved = input().strip().lower()
+    
+        if moved != 'y':
+            print("\n" + "="*60)
+            print("TROUBLESHOOTING - Gripper not moving:")
+            print("="*60)
+            print("1. Check URCaps Installation:")
+            print("   - On the UR teach pendant, go to Program → Installation")
+            print("   - Check if 'OnRobot' or 'RG2' URCaps is installed")
+            print("   - The RG2 function must be available in the Installation")
+            print("")
+            print("2. Verify Gripper Connection:")
+            print("   - RG2 should be connected to robot tool connector")
+            print("   - Check physical connections")
+            print("")
+            print("3. Check RoboDK Robot Driver:")
+            print("   - Right-click robot in RoboDK")
+            print("   - Go to 'Connect to robot'")
+            print("   - Make sure correct driver is selected (UR)")
+            print("   - IP address should match your robot")
+            print("")
+            print("4. Test from UR Pendant:")
+            print("   - Try running RG2(70,40,0.0,True,False,False) from pendant")
+            print("   - If it doesn't work there, it's a URCaps issue")
+            print("="*60)
+        else:
+            print("\n" + "="*60)
+            print("✓ GRIPPER IS WORKING!")
+            print("="*60)
+        return moved == 'y'
     else:
+        print("\n    Skipping real robot test")
         print("\n" + "="*60)
-        print("✓ GRIPPER IS WORKING!")
+        print("DIAGNOSTIC INFO:")
         print("="*60)
-else:
-    print("\n    Skipping real robot test")
-    print("\n" + "="*60)
-    print("DIAGNOSTIC INFO:")
-    print("="*60)
-    print("- Commands are reaching RoboDK successfully (Response: 0)")
-    print("- To test with real robot, you must:")
-    print("  1. Connect robot in RoboDK (right-click → Connect)")
-    print("  2. Run this script and select 'y' for real robot mode")
-    print("  3. Ensure RG2 URCaps is installed on robot controller")
-    print("="*60)
-
-print("\nDiagnostic test completed.")
+        print("- To test with real robot, you must:")
+        print("  1. Connect robot in RoboDK (right-click → Connect)")
+        print("  2. Run this test again and select 'y' for real robot mode")
+        print("  3. Ensure RG2 URCaps is installed on robot controller")
+        print("="*60)
+        return False
+
+
+if __name__ == "__main__":
+    main()
@@ -9,89 +9,61 @@ Three approaches:
 2. Generate and upload .urp program from RoboDK
 3. Run program directly from RoboDK (transfers automatically)
 """
-import socket
-import time
-from robodk import robolink
+import argparse
 import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_gripper import DashboardClient, SocketTransport
+from robodk_session import get_rdk, get_robot
+
+# Defaults for unattended runs (override with --robot-ip/--program or ROBOT_IP)
+DEFAULT_ROBOT_IP = os.environ.get("ROBOT_IP", "192.168.0.10")
+DEFAULT_PROGRAM = "open_gripper.urp"
+
+# Cleared by --no-prompt; prompts are also skipped when stdin isn't a terminal
+PROMPTS_ENABLED = True
+
+
+def ask(message, default=""):
+    """Prompt the user, or return `default` when running unattended."""
+    if PROMPTS_ENABLED and sys.stdin.isatty():
+        return input(message).strip() or default
+    return default
 
 
 # ============================================================================
 # APPROACH 1: Dashboard Server - Load/Run Programs via TCP
 # ============================================================================
 
-class URDashboardClient:
-    """Client for UR robot Dashboard Server (port 29999)."""
-    
-    def __init__(self, robot_ip, port=29999):
-        """Initialize dashboard client."""
-        self.robot_ip = robot_ip
-        self.port = port
-        self.timeout = 5
-    
-    def send_command(self, command):
-        """Send command to Dashboard Server."""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.robot_ip, self.port))
-            
-            # Receive welcome message
-            welcome = sock.recv(1024).decode('utf-8')
-            
-            # Send command
-            sock.send((command + "\n").encode('utf-8'))
-            
-            # Receive response
-            response = sock.recv(1024).decode('utf-8').strip()
-            
-            sock.close()
-            return response
-            
-        except socket.timeout:
-            return f"ERROR: Timeout connecting to {self.robot_ip}:{self.port}"
-        except ConnectionRefusedError:
-            return f"ERROR: Connection refused - Check robot IP and power"
-        except Exception as e:
-            return f"ERROR: {str(e)}"
-    
-    def load_program(self, program_path):
-        """Load a .urp program file."""
-        return self.send_command(f"load {program_path}")
-    
-    def play_program(self):
-        """Start/play the loaded program."""
-        return self.send_command("play")
-    
-    def stop_program(self):
-        """Stop the running program."""
-        return self.send_command("stop")
-    
-    def get_program_state(self):
-        """Get current program state."""
-        return self.send_command("programState")
+def test_dashboard_load_program(robot_ip=None, program_name=None, timeout_s=15):
+    """
+    Test loading and running program via Dashboard Server.
     
-    def get_loaded_program(self):
-        """Get currently loaded program."""
-        return self.send_command("get loaded program")
-
-
-def test_dashboard_load_program():
-    """Test loading and running program via Dashboard Server."""
+    Args:
+        robot_ip (str, optional): Robot IP; prompted for (or DEFAULT_ROBOT_IP) if None
+        program_name (str, optional): Program to run; prompted for (or DEFAULT_PROGRAM) if None
+        timeout_s (float): Maximum time to wait for the program to finish
+    """
     print("\n" + "="*70)
     print("APPROACH 1: Load/Run Program via TCP Dashboard Server")
     print("="*70)
     print("\nThis loads and runs a .urp program that exists on the robot.")
     print("Program must be located in: /programs/ on robot controller")
     
-    robot_ip = input("\nEnter robot IP (default: 192.168.0.10): ").strip() or "192.168.0.10"
-    dashboard = URDashboardClient(robot_ip)
+    if robot_ip is None:
+        robot_ip = ask(f"\nEnter robot IP (default: {DEFAULT_ROBOT_IP}): ", DEFAULT_ROBOT_IP)
+    dashboard = DashboardClient(SocketTransport(robot_ip))
     
     try:
         print(f"\n[Step 1] Connecting to robot at {robot_ip}...")
         mode = dashboard.send_command("robotmode")
         print(f"  Robot mode: {mode}")
         
-        if "ERROR" in mode:
+        if dashboard.is_error(mode):
             print("  ✗ Cannot connect - check IP and power")
             return False
         
@@ -100,32 +72,32 @@ def test_dashboard_load_program():
         print("  • close_gripper.urp")
         print("  • gripper_test.urp")
         
-        program_name = input("\n  Enter program name: ").strip() or "open_gripper.urp"
+        if program_name is None:
+            program_name = ask("\n  Enter program name: ", DEFAULT_PROGRAM)
         
         print(f"\n[Step 3] Loading program: {program_name}")
         result = dashboard.load_program(program_name)
         print(f"  Response: {result}")
         
-        if "File not found" in result or "ERROR" in result:
+        if not dashboard.load_succeeded(result):
             print(f"  ✗ Program not found on robot!")
             return False
         
         time.sleep(1)
         
         print("\n[Step 4] Starting program...")
-        input("  Press ENTER to run (Ctrl+C to cancel)...")
+        ask("  Press ENTER to run (Ctrl+C to cancel)...")
         
         result = dashboard.play_program()
         print(f"  Response: {result}")
         
         print("\n[Step 5] Monitoring execution...")
-        for i in range(10):
-            state = dashboard.get_program_state()
-            print(f"  State: {state}")
-            if "STOPPED" in state:
-                print("  ✓ Program finished!")
-                break
-            time.sleep(1)
+        start = time.monotonic()
+        if dashboard.wait_program_stopped(timeout_s, initial_delay=0.05):
+            print(f"  ✓ Program finished! ({time.monotonic() - start:.2f} s)")
+        else:
+            print(f"  ⚠ Program still running after {timeout_s} s")
+        print(f"  State: {dashboard.get_program_state()}")
         
         print("\n✓ Dashboard program test complete!")
         return True
@@ -136,6 +108,8 @@ def test_dashboard_load_program():
     except Exception as e:
         print(f"\n✗ Error: {e}")
         return False
+    finally:
+        dashboard.close()
 
 
 # ============================================================================
@@ -148,8 +122,10 @@ def test_robodk_generate_program():
     print("APPROACH 2: Generate URP Program from RoboDK")
     print("="*70)
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    from robodk import robolink
+    
+    rdk = get_rdk()
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -159,15 +135,15 @@ def test_robodk_generate_program():
     
     try:
         print("\n[Step 1] Creating gripper program...")
-        prog = rdk.AddProgram("gripper_test_generated")
+        prog = rdk.AddProgram("gripper_test_generated", robot)
         
         print("\n[Step 2] Adding gripper commands...")
         # Open gripper
-        robot.RunInstruction("RG2(110, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
+        prog.RunInstruction("RG2(110, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
         print("  Added: Open gripper")
         
         # Close gripper
-        robot.RunInstruction("RG2(40, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
+        prog.RunInstruction("RG2(40, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
         print("  Added: Close gripper")
         
         print("\n[Step 3] Generating .urp file...")
@@ -203,8 +179,10 @@ def test_robodk_direct_execution():
     print("="*70)
     print("\nRoboDK automatically transfers and executes on robot if connected.")
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    from robodk import robolink
+    
+    rdk = get_rdk()
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -212,11 +190,11 @@ def test_robodk_direct_execution():
     
     print(f"✓ Connected to: {robot.Name()}")
     
-    run_mode = input("\n  Connect to REAL robot? (y/n): ").strip().lower()
+    run_mode = ask("\n  Connect to REAL robot? (y/n): ", "n").lower()
     
     if run_mode == 'y':
         print("  ⚠ REAL ROBOT MODE")
-        input("  Press ENTER to continue...")
+        ask("  Press ENTER to continue...")
         rdk.setRunMode(robolink.RUNMODE_RUN_ROBOT)
     else:
         print("  ✓ SIMULATION mode")
@@ -236,20 +214,23 @@ def test_robodk_direct_execution():
         print("\n[Test 2] Create and run program...")
         home_joints = robot.Joints().list()
         
-        prog = rdk.AddProgram("gripper_sequence")
-        robot.MoveJ(home_joints)
-        robot.RunInstruction("RG2(110, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
-        robot.RunInstruction("RG2(60, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
-        robot.RunInstruction("RG2(40, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
-        robot.RunInstruction("RG2(110, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
-        
-        print("  ✓ Program built")
-        
-        input("\n  Press ENTER to run program...")
-        prog.RunProgram()
-        print("  ✓ Program started")
-        
-        time.sleep(10)
+        # The calls go into the program, so the whole sequence is sent and
+        # run as one item instead of executing one RoboDK call at a time
+        prog = rdk.AddProgram("gripper_sequence", robot)
+        try:
+            prog.MoveJ(home_joints)
+            for width in (110, 60, 40, 110):
+                prog.RunInstruction(f"RG2({width}, 40, 0.0, True, False)", robolink.INSTRUCTION_CALL_PROGRAM)
+            
+            print("  ✓ Program built")
+            
+            ask("\n  Press ENTER to run program...")
+            prog.RunProgram()
+            print("  ✓ Program started")
+            
+            prog.WaitFinished()
+        finally:
+            prog.Delete()
         print("\n✓ Direct execution complete!")
         return True
         
@@ -260,6 +241,17 @@ def test_robodk_direct_execution():
 
 def main():
     """Main test menu."""
+    global PROMPTS_ENABLED
+    
+    parser = argparse.ArgumentParser(description="Load/execute URP gripper programs")
+    parser.add_argument("--robot-ip", help="Robot IP for the Dashboard test")
+    parser.add_argument("--program", help="Program to run in the Dashboard test")
+    parser.add_argument("--test", choices=['1', '2', '3', '4'], help="Run this test without the menu")
+    parser.add_argument("--no-prompt", action="store_true", help="Never wait for keyboard input")
+    args = parser.parse_args()
+    if args.no_prompt:
+        PROMPTS_ENABLED = False
+    
     print("\n" + "="*70)
     print("  GRIPPER METHOD 2: Load/Execute URP Programs")
     print("="*70)
@@ -270,20 +262,20 @@ def main():
     print("  4 - Run ALL tests")
     print("="*70)
     
-    choice = input("\nEnter choice (1-4): ").strip()
+    choice = args.test or ask("\nEnter choice (1-4): ")
     
     if choice == '1':
-        test_dashboard_load_program()
+        test_dashboard_load_program(args.robot_ip, args.program)
     elif choice == '2':
         test_robodk_generate_program()
     elif choice == '3':
         test_robodk_direct_execution()
     elif choice == '4':
         print("\nRunning ALL tests...")
-        test_dashboard_load_program()
-        input("\nPress ENTER for next test...")
+        test_dashboard_load_program(args.robot_ip, args.program)
+        ask("\nPress ENTER for next test...")
         test_robodk_generate_program()
-        input("\nPress ENTER for next test...")
+        ask("\nPress ENTER for next test...")
         test_robodk_direct_execution()
     else:
         print("Invalid choice")
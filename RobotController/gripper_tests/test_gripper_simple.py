@@ -18,8 +18,15 @@ Examples:
     RG2(0, 40, 0.0, True, False)    # Fully closed
     RG2(50, 60, 0.0, True, False)   # 50mm width, high force
 """
-from robodk import robolink
+import os
+import sys
 import time
+from robodk import robolink
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from robodk_session import get_rdk, get_robot
 
 
 def test_onrobot_rg2_basic():
@@ -29,8 +36,7 @@ def test_onrobot_rg2_basic():
     print("="*70)
     print("\nTesting basic OnRobot RG2 commands.")
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -75,8 +81,7 @@ def test_onrobot_rg2_widths():
     print("="*70)
     print("\nTesting various widths (0-110mm range).")
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -115,8 +120,7 @@ def test_onrobot_rg2_forces():
     print("="*70)
     print("\nTesting various force levels (0-100).")
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -163,8 +167,7 @@ def test_onrobot_rg2_sequence():
     print("="*70)
     print("\nSimulating a complete pick and place operation.")
     
-    rdk = robolink.Robolink()
-    robot = rdk.Item('', robolink.ITEM_TYPE_ROBOT)
+    robot = get_robot()
     
     if not robot.Valid():
         print("✗ ERROR: Robot not found!")
@@ -233,7 +236,7 @@ def main():
     choice = input("\nEnter choice (1-5): ").strip()
     
     # Check connection mode
-    rdk = robolink.Robolink()
+    rdk = get_rdk()
     run_mode = input("\nRun on REAL robot? (y/n): ").strip().lower()
     
     if run_mode == 'y':
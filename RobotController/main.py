@@ -8,7 +8,10 @@ This script demonstrates how to:
 """
 
 import sys
+import queue
 import signal
+import logging
+import logging.handlers
 from robot_controller import RobotController
 from command_server import CommandServer
 
@@ -33,6 +36,15 @@ def main():
     # Register signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     
+    # Server lifecycle messages at INFO; per-command traces stay at DEBUG.
+    # Records are queued and written by a listener thread, so robot and
+    # server threads never wait on the console.
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, format='%(message)s',
+                        handlers=[logging.handlers.QueueHandler(log_queue)])
+    log_listener.start()
+    
     try:
         # ====================================
         # Step 1: Initialize RobotController
@@ -69,8 +81,9 @@ def main():
         )
         
         print("\nRobot initialized successfully!")
-        print(f"Current position: {robot.get_current_pose()}")
-        print(f"Current joints: {robot.get_current_joints()}")
+        pose, joints = robot.get_current_state()
+        print(f"Current position: {pose}")
+        print(f"Current joints: {joints}")
         
         # ====================================
         # Step 2: Create Command Server
@@ -123,6 +136,7 @@ def main():
             robot.disconnect()
         except:
             pass
+        log_listener.stop()
     
     return 0
 
@@ -133,19 +147,45 @@ def example_commands():
     
     This function is not executed in normal operation but serves as documentation
     for how to send commands from a Raspberry Pi or other client device.
+    
+    One connection is kept open for all commands. Each message is a 4-byte
+    big-endian length followed by that many bytes of JSON, in both directions.
     """
     import socket
+    import struct
+    try:
+        import orjson as json_lib  # dumps() returns bytes, loads() takes bytes
+    except ImportError:
+        json_lib = None
     import json
     
+    def send_command(sock, command):
+        if json_lib is not None:
+            body = json_lib.dumps(command)
+        else:
+            body = json.dumps(command).encode('utf-8')
+        sock.sendall(struct.pack('>I', len(body)) + body)
+        (length,) = struct.unpack('>I', recv_exact(sock, 4))
+        reply = recv_exact(sock, length)
+        return json_lib.loads(reply) if json_lib is not None else json.loads(reply.decode('utf-8'))
+    
+    def recv_exact(sock, size):
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            data += chunk
+        return data
+    
     # Example: Connect to the server
     client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Send small commands immediately
     client.connect(('192.168.1.100', 5000))  # Replace with actual server IP
     
     # Example 1: Move to home position
     command = {"command": "move_home"}
-    client.send(json.dumps(command).encode('utf-8'))
-    response = client.recv(4096)
-    print(json.loads(response.decode('utf-8')))
+    print(send_command(client, command))
     
     # Example 2: Pick object
     command = {
@@ -153,9 +193,7 @@ def example_commands():
         "position": [300, 200, 150],
         "orientation": [0, 90, 0]
     }
-    client.send(json.dumps(command).encode('utf-8'))
-    response = client.recv(4096)
-    print(json.loads(response.decode('utf-8')))
+    print(send_command(client, command))
     
     # Example 3: Place object
     command = {
@@ -163,15 +201,23 @@ def example_commands():
         "position": [400, 200, 150],
         "orientation": [0, 90, 0]
     }
-    client.send(json.dumps(command).encode('utf-8'))
-    response = client.recv(4096)
-    print(json.loads(response.decode('utf-8')))
+    print(send_command(client, command))
     
     # Example 4: Get current pose
     command = {"command": "get_pose"}
-    client.send(json.dumps(command).encode('utf-8'))
-    response = client.recv(4096)
-    print(json.loads(response.decode('utf-8')))
+    print(send_command(client, command))
+    
+    # Example 5: Whole pick/place cycle in one message; the reply has one
+    # entry in "results" per op and stops at the first failure
+    command = {
+        "command": "batch",
+        "ops": [
+            {"command": "move_home"},
+            {"command": "pick", "position": [300, 200, 150], "orientation": [0, 90, 0]},
+            {"command": "place", "position": [400, 200, 150], "orientation": [0, 90, 0]},
+        ]
+    }
+    print(send_command(client, command))
     
     client.close()
 
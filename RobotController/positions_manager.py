@@ -2,7 +2,35 @@
 Positions Manager - Loads and manages robot positions from file
 """
 
+import mmap
 import os
+import re
+
+# One record per line: "name : [x, y, z, rx, ry, rz]" or
+# "name : [x, y, z] with orientation: [rx, ry, rz]"
+_POSITION_RECORD = re.compile(
+    rb'^[ \t]*([^:\r\n]+?)[ \t]*:[ \t]*\[([^\]\r\n]*)\]'
+    rb'(?:[ \t]*with orientation:[ \t]*\[([^\]\r\n]*)\])?',
+    re.MULTILINE)
+
+# Any line with a ':' is meant to be a record, so one that doesn't match is reported
+_RECORD_LINE = re.compile(rb'^[^\r\n:]*:[^\r\n]*', re.MULTILINE)
+
+
+def _parse_numbers(text):
+    """
+    Parse the comma-separated numbers between a list's brackets.
+    
+    Args:
+        text (bytes): List contents, e.g. b"1.0, -2.5, 3"
+    
+    Returns:
+        list: Parsed numbers as floats
+    
+    Raises:
+        ValueError: If an item is not a number
+    """
+    return [float(x) for x in text.split(b',')]
 
 
 class PositionsManager:
@@ -14,17 +42,26 @@ class PositionsManager:
         """
         Initialize the positions manager.
         
+        The file is not read until a position is first requested, and is
+        only re-read when its modification time changes.
+        
         Args:
             positions_file (str): Path to positions file
         """
         self.positions_file = positions_file
         self.positions = {}
-        self.load_positions()
+        self._matrices = {}     # name -> pose matrix, built on first use
+        self._mtime = None      # st_mtime of the file when last loaded
+        self._loaded = False
     
     def load_positions(self):
         """
         Load positions from the positions file.
         
+        The file is memory-mapped and scanned for lines containing ':', so
+        blank and other lines are skipped without per-line Python string
+        handling. Lines with a ':' that aren't a valid record are reported.
+        
         Format expected:
         name : [x, y, z, rx, ry, rz]
         or
@@ -36,32 +73,25 @@ class PositionsManager:
         
         print(f"Loading positions from {self.positions_file}...")
         
-        with open(self.positions_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                
-                # Skip empty lines
-                if not line:
-                    continue
-                
-                # Parse line
-                if ':' in line:
-                    # Split by colon
-                    parts = line.split(':', 1)
-                    name = parts[0].strip().lower()
-                    value_part = parts[1].strip()
+        with open(self.positions_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                print("✓ Loaded 0 positions")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for line_match in _RECORD_LINE.finditer(data):
+                    match = _POSITION_RECORD.match(line_match.group(0))
+                    if match is None:
+                        line = line_match.group(0).decode('utf-8', 'replace').strip()
+                        print(f"  Error parsing line '{line}': expected 'name : [x, y, z, rx, ry, rz]' "
+                              f"or 'name : [x, y, z] with orientation: [rx, ry, rz]'")
+                        continue
+                    name = match.group(1).decode('utf-8').strip().lower()
                     
                     try:
-                        # Check if it has "with orientation" format
-                        if 'with orientation:' in value_part:
+                        pose = _parse_numbers(match.group(2))
+                        if match.group(3) is not None:
                             # Format: [x, y, z] with orientation: [rx, ry, rz]
-                            pos_part, orient_part = value_part.split('with orientation:')
-                            position = eval(pos_part.strip())  # [x, y, z]
-                            orientation = eval(orient_part.strip())  # [rx, ry, rz]
-                            pose = position + orientation  # [x, y, z, rx, ry, rz]
-                        else:
-                            # Format: [x, y, z, rx, ry, rz]
-                            pose = eval(value_part)
+                            pose += _parse_numbers(match.group(3))
                         
                         # Store as [position, orientation] for pick/place commands
                         if len(pose) == 6:
@@ -73,11 +103,26 @@ class PositionsManager:
                         else:
                             print(f"  Warning: Invalid pose format for '{name}': {pose}")
                     
-                    except Exception as e:
+                    except ValueError as e:
+                        line = match.group(0).decode('utf-8', 'replace').strip()
                         print(f"  Error parsing line '{line}': {e}")
         
         print(f"✓ Loaded {len(self.positions)} positions")
     
+    def _maybe_reload(self):
+        """Load the positions file if it hasn't been loaded or has changed since."""
+        try:
+            mtime = os.stat(self.positions_file).st_mtime
+        except OSError:
+            mtime = None
+        if self._loaded and mtime == self._mtime:
+            return
+        self.positions = {}
+        self._matrices = {}
+        self.load_positions()
+        self._mtime = mtime
+        self._loaded = True
+    
     def get_position(self, name):
         """
         Get position and orientation by name.
@@ -88,9 +133,35 @@ class PositionsManager:
         Returns:
             dict: {'position': [x, y, z], 'orientation': [rx, ry, rz]} or None
         """
+        self._maybe_reload()
         name = name.lower().strip()
         return self.positions.get(name)
     
+    def get_pose_matrix(self, name):
+        """
+        Get the RoboDK pose matrix for a named position.
+        
+        Named positions don't change between file reloads, so the matrix is
+        computed once and reused. Don't modify the returned matrix; copy it first.
+        
+        Args:
+            name (str): Position name (e.g., 'piece 1', 'bad bin')
+        
+        Returns:
+            Mat: Pose matrix for the position, or None if the name is unknown
+        """
+        pose_data = self.get_position(name)
+        if pose_data is None:
+            return None
+        
+        name = name.lower().strip()
+        matrix = self._matrices.get(name)
+        if matrix is None:
+            from robodk import robomath
+            matrix = robomath.TxyzRxyz_2_Pose(pose_data['position'] + pose_data['orientation'])
+            self._matrices[name] = matrix
+        return matrix
+    
     def get_all_positions(self):
         """
         Get all available position names.
@@ -98,14 +169,14 @@ class PositionsManager:
         Returns:
             list: List of position names
         """
+        self._maybe_reload()
         return list(self.positions.keys())
     
     def reload_positions(self):
         """
-        Reload positions from file.
+        Reload positions from file if it has changed since the last load.
         """
-        self.positions = {}
-        self.load_positions()
+        self._maybe_reload()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""
+RoboDK Session - Shared Robolink connection
+============================================
+Scripts that talk to RoboDK several times (e.g. the gripper tests) share one
+Robolink connection instead of opening a new API connection each time, and
+look each robot item up only once.
+"""
+import threading
+
+_RDK_SINGLETON = None
+_ROBOTS = {}  # Robot name ('' = first robot) -> robot item on _RDK_SINGLETON
+_LOCK = threading.Lock()
+
+
+def get_rdk(reconnect=False):
+    """
+    Return the shared Robolink connection, creating it on first use.
+
+    Args:
+        reconnect (bool): Discard the cached connection and open a new one
+
+    Returns:
+        Robolink: Connection to the RoboDK API
+    """
+    global _RDK_SINGLETON
+    with _LOCK:
+        if _RDK_SINGLETON is None or reconnect:
+            from robodk import robolink
+            _RDK_SINGLETON = robolink.Robolink()
+            _ROBOTS.clear()
+        return _RDK_SINGLETON
+
+
+def get_robot(name=''):
+    """
+    Return a robot item on the shared connection, looked up once per name.
+
+    Args:
+        name (str): Robot name in the station; '' for the first robot
+
+    Returns:
+        Item: RoboDK robot item (check Valid() before use)
+    """
+    rdk = get_rdk()
+    robot = _ROBOTS.get(name)
+    if robot is None:
+        from robodk import robolink
+        robot = rdk.Item(name, robolink.ITEM_TYPE_ROBOT)
+        if robot.Valid():
+            _ROBOTS[name] = robot  # Not cached if missing, so a robot loaded later is found
+    return robot
@@ -4,10 +4,41 @@ RobotController Module - Handles robot operations using RoboDK API
 
 from robodk import robolink, robomath
 from robodk.robolink import Robolink, Item
+import re
+import math
 import time
-from dashboard_gripper import DashboardGripper
+import socket
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from dashboard_gripper import DashboardGripper, program_call_name
 from positions_manager import PositionsManager
 
+logger = logging.getLogger(__name__)
+
+# Reach from the base axis in mm, by UR model. The workspace check allows a
+# margin on top for the base-to-shoulder offset, plus the tool's length.
+ROBOT_REACH_MM = {'UR3': 500.0, 'UR5': 850.0, 'UR10': 1300.0, 'UR16': 900.0}
+REACH_MARGIN_MM = 100.0
+# Targets this close to the reach limit (or inside the minimum reach) are
+# checked with RoboDK's IK instead of being rejected by distance alone
+REACH_IK_BAND_MM = 200.0
+
+
+@lru_cache(maxsize=256)
+def _pose_from_tuple(x: float, y: float, z: float, rx: float, ry: float, rz: float) -> robomath.Mat:
+    """
+    Build the pose matrix for [x, y, z, rx, ry, rz], cached.
+    
+    Campaigns keep returning to the same targets (bins, approach poses), so
+    the trig-heavy TxyzRxyz_2_Pose is only run once per distinct pose. The
+    matrix is shared between callers: copy it before modifying it.
+    """
+    return robomath.TxyzRxyz_2_Pose([x, y, z, rx, ry, rz])
+
 
 class RobotController:
     """
@@ -17,7 +48,17 @@ class RobotController:
     moving to home position, moving to specific poses, and pick-and-place operations.
     """
     
-    def __init__(self, robot_name=None, robot_ip=None, use_gripper=True, speed=10, acceleration=10, connect_real_robot=False):
+    __slots__ = (
+        'rdk', 'robot', '_robot_name', 'robot_ip', 'gripper', 'positions_manager', 'home_joints',
+        '_planner', '_planner_robot', '_pending_program', '_gripper_pending', '_pending_retract',
+        'rounding_mm', 'reach_max_mm', 'reach_min_mm', '_base_from_frame', '_ik_cache', 'ik_cache_size',
+        'pick_descend', 'approach_rounding_mm', '_state', 'state_max_age', '_conn_ok',
+        '_monitor_stop', '_monitor_thread', '_urscript_programs', 'urscript_preamble',
+    )
+    
+    def __init__(self, robot_name: Optional[str] = None, robot_ip: Optional[str] = None, use_gripper: bool = True,
+                 speed: int = 10, acceleration: int = 10, connect_real_robot: bool = False,
+                 gripper_backend: str = 'dashboard', state_poll_hz: float = 20):
         """
         Initialize the RobotController.
         
@@ -28,8 +69,16 @@ class RobotController:
             speed (int): Robot speed percentage (1-100).
             acceleration (int): Robot acceleration percentage (1-100).
             connect_real_robot (bool): If True, connect to real robot instead of simulation.
+            gripper_backend (str): 'dashboard' to run gripper programs over the Dashboard Server,
+                or 'robodk_api' to call them through RoboDK, which lets pick/place run as one
+                RoboDK program.
+            state_poll_hz (float): Rate at which a background thread samples the robot pose
+                and joints for get_current_pose/get_current_joints. 0 disables sampling,
+                and every call reads from RoboDK. On a real robot the same thread also
+                supervises the RoboDK connection.
         """
         self.rdk = Robolink()
+        self._set_api_nodelay()
         
         # Connect to the robot
         if robot_name:
@@ -40,59 +89,133 @@ class RobotController:
         if not self.robot.Valid():
             raise Exception("Robot not found. Please ensure RoboDK is running with a robot loaded.")
         
-        print(f"Connected to robot: {self.robot.Name()}")
+        self._robot_name = self.robot.Name()
+        logger.info("Connected to robot: %s", self._robot_name)
         
         # Initialize positions manager
         self.positions_manager = PositionsManager()
         
+        # Computes the next target's pose matrices while the robot is moving
+        self._planner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pose-planner")
+        self._planner_robot = None  # Robot item on the planner thread's own Robolink
+        
+        # Work left running by a non-blocking pick/place, finished before the next motion
+        self._pending_program = None
+        self._gripper_pending = False
+        self._pending_retract = None  # Retract queued behind a non-blocking pick's gripper close
+        
         # Connect to real robot if requested
         if connect_real_robot:
-            print("\nSetting mode to RUN on REAL ROBOT...")
-            print("Make sure you have already connected to the robot in RoboDK:")
-            print("  Right-click robot → Connect to robot → Connect")
+            logger.info("Setting mode to RUN on REAL ROBOT...")
+            logger.info("Make sure you have already connected to the robot in RoboDK:")
+            logger.info("  Right-click robot → Connect to robot → Connect")
             
             # Check if robot is already connected in RoboDK
             connection_status = self.robot.ConnectedState()
             if connection_status == robolink.ROBOTCOM_READY:
-                print("✓ Robot is already connected in RoboDK")
+                logger.info("✓ Robot is already connected in RoboDK")
             elif connection_status == robolink.ROBOTCOM_WORKING:
-                print("⚠ Robot is connected but busy")
+                logger.warning("⚠ Robot is connected but busy")
             else:
-                print(f"⚠ Robot connection status: {connection_status}")
-                print("  Please connect manually in RoboDK first:")
-                print("  Right-click robot → Connect to robot → Select driver → Connect")
+                logger.warning("⚠ Robot connection status: %s", connection_status)
+                logger.info("  Please connect manually in RoboDK first:")
+                logger.info("  Right-click robot → Connect to robot → Select driver → Connect")
             
             # Set RoboDK to run on real robot (not simulation)
             self.rdk.setRunMode(robolink.RUNMODE_RUN_ROBOT)
-            print("✓ RoboDK set to RUN mode (real robot)")
+            logger.info("✓ RoboDK set to RUN mode (real robot)")
         else:
-            print("Running in SIMULATION mode")
+            logger.info("Running in SIMULATION mode")
             self.rdk.setRunMode(robolink.RUNMODE_SIMULATE)
         
         # Store home position (current position on initialization)
         self.home_joints = self.robot.Joints()
        
-        self.set_speed(speed)
-        self.set_acceleration(acceleration)
+        self.set_speed_and_acceleration(speed, acceleration)
+        self.rounding_mm = 0  # Rounding restored after a blended move_through()
+        
+        # Workspace sphere around the robot base: targets well outside it are
+        # rejected before RoboDK spends time failing to solve them. Only known
+        # models are checked. Targets are given in the robot's reference frame,
+        # so its pose (and the tool's length) is read once here.
+        model = re.match(r'UR\d+', self._robot_name.upper())
+        reach = ROBOT_REACH_MM.get(model.group()) if model else None
+        tool_mm = math.hypot(*self.robot.PoseTool().Pos())
+        self.reach_max_mm = reach + REACH_MARGIN_MM + tool_mm if reach else None  # None disables the check
+        self.reach_min_mm = 150.0
+        self._base_from_frame = [tuple(row) for row in self.robot.PoseFrame().rows[:3]]
+        
+        # Joints reached at each cached target matrix, so repeated targets
+        # (home, bins, pieces) are sent as joint moves without IK
+        self._ik_cache = OrderedDict()  # id(matrix) -> (matrix, joints)
+        self.ik_cache_size = 512
+        
+        # Grasp pick_offset_mm below the approach pose and retract afterwards.
+        # Off by default: the received pick pose is used as the grasp pose.
+        self.pick_descend = False
+        self.approach_rounding_mm = 5  # Blend radius at the approach pose when descending
+        
+        # Latest (monotonic timestamp, pose, joints) sample from the monitor
+        self._state = (0.0, None, None)
+        self.state_max_age = 0.25  # Older samples are ignored and RoboDK is read directly
+        
+        # Set while the RoboDK driver is connected; kept up to date by
+        # the monitor on a real robot (the simulator has no connection to watch)
+        self._conn_ok = threading.Event()
+        if not connect_real_robot:
+            self._conn_ok.set()
+        
+        # One background thread, on one extra RoboDK connection, does all the polling
+        self._monitor_stop = threading.Event()
+        self._monitor_thread = None
+        if state_poll_hz or connect_real_robot:
+            period = 1.0 / state_poll_hz if state_poll_hz else 0.25
+            self._monitor_thread = threading.Thread(target=self._monitor,
+                                                    args=(self._robot_name, period,
+                                                          bool(state_poll_hz), connect_real_robot),
+                                                    name="robodk-monitor", daemon=True)
+            self._monitor_thread.start()
         
         # Initialize gripper if requested
         self.gripper = None
         self.robot_ip = robot_ip
+        self._urscript_programs = None  # Created on first pick_place_program()
+        self.urscript_preamble = ""  # RG2 URCap script definitions for generated programs
         if use_gripper:
             try:
-                self.gripper = DashboardGripper(robot_item=self.robot, robot_ip=robot_ip)
+                self.gripper = DashboardGripper(robot_item=self.robot, robot_ip=robot_ip, backend=gripper_backend)
                 if self.gripper.connect():
-                    print("Gripper initialized successfully via RoboDK API")
+                    logger.info("Gripper initialized successfully via RoboDK API")
                 else:
-                    print("Warning: Gripper connection failed, continuing without gripper")
+                    logger.warning("Gripper connection failed, continuing without gripper")
                     self.gripper = None
             except Exception as e:
-                print(f"Warning: Failed to initialize gripper: {e}")
+                logger.warning("Failed to initialize gripper: %s", e)
                 self.gripper = None
         else:
-            print("Gripper disabled")
+            logger.info("Gripper disabled")
     
-    def set_speed(self, speed_percent):
+    def _set_api_nodelay(self) -> None:
+        """
+        Disable Nagle's algorithm on the RoboDK API socket.
+        
+        Every API call (Pose, Joints, MoveJ, WaitMove...) is a small
+        request/reply on this socket, so it should not wait to be coalesced.
+        """
+        api_socket = getattr(self.rdk, 'COM', None)
+        if api_socket is None:
+            return
+        try:
+            api_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            logger.warning("Could not set TCP_NODELAY on RoboDK API socket: %s", e)
+    
+    @property
+    def name(self) -> str:
+        """Name of the robot in the RoboDK station, read once at connection."""
+        return self._robot_name
+    
+    def set_speed(self, speed_percent: float) -> None:
         """
         Set robot speed.
         
@@ -103,9 +226,9 @@ class RobotController:
             raise ValueError("Speed must be between 0 and 100")
         
         self.robot.setSpeed(speed_percent)
-        print(f"Speed set to {speed_percent}%")
+        logger.info("Speed set to %s%%", speed_percent)
     
-    def set_acceleration(self, accel_percent):
+    def set_acceleration(self, accel_percent: float) -> None:
         """
         Set robot acceleration.
         
@@ -116,9 +239,26 @@ class RobotController:
             raise ValueError("Acceleration must be between 0 and 100")
         
         self.robot.setAcceleration(accel_percent)
-        print(f"Acceleration set to {accel_percent}%")
+        logger.info("Acceleration set to %s%%", accel_percent)
     
-    def set_rounding(self, radius_mm):
+    def set_speed_and_acceleration(self, speed_percent: float, accel_percent: float) -> None:
+        """
+        Set robot speed and acceleration in one RoboDK call.
+        
+        Args:
+            speed_percent: Speed as percentage (0-100)
+            accel_percent: Acceleration as percentage (0-100)
+        """
+        if not 0 <= speed_percent <= 100:
+            raise ValueError("Speed must be between 0 and 100")
+        if not 0 <= accel_percent <= 100:
+            raise ValueError("Acceleration must be between 0 and 100")
+        
+        # -1 leaves the joint speed and joint acceleration unchanged
+        self.robot.setSpeed(speed_percent, -1, accel_percent, -1)
+        logger.info("Speed set to %s%%, acceleration to %s%%", speed_percent, accel_percent)
+    
+    def set_rounding(self, radius_mm: float) -> None:
         """
         Set corner rounding radius.
         
@@ -126,36 +266,247 @@ class RobotController:
             radius_mm: Rounding radius in mm (0 = sharp corners)
         """
         self.robot.setRounding(radius_mm)
-        print(f"Rounding set to {radius_mm}mm")
+        self.rounding_mm = radius_mm
+        logger.info("Rounding set to %smm", radius_mm)
+    
+    def _require_connection(self, timeout: float = 10.0) -> None:
+        """
+        Wait for the monitor to report the RoboDK connection up.
+        
+        Returns at once while it is up; after a drop, waits for the monitor
+        to reconnect (its retries back off up to 8 s apart).
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+        
+        Raises:
+            ConnectionError: If the connection isn't back within `timeout`,
+                so the caller stops before sending the next motion
+        """
+        if not self._conn_ok.wait(timeout):
+            raise ConnectionError(f"RoboDK connection not ready after {timeout}s")
+
+    def _check_reachable(self, pose: Sequence[float]) -> None:
+        """
+        Reject a target outside the workspace sphere.
+        
+        Targets beyond reach_max_mm are rejected outright. Targets within
+        REACH_IK_BAND_MM of it, or closer to the base than reach_min_mm, may
+        still be reachable depending on the tool and orientation, so RoboDK's
+        IK decides for those.
+        
+        Args:
+            pose (list): [x, y, z, rx, ry, rz] in the robot's reference frame, in mm and degrees
+        
+        Raises:
+            ValueError: If the target is out of reach, naming the limit that was hit
+        """
+        if self.reach_max_mm is None:
+            return
+        x, y, z = pose[:3]
+        distance = math.hypot(*(r[0] * x + r[1] * y + r[2] * z + r[3] for r in self._base_from_frame))
+        if distance > self.reach_max_mm:
+            raise ValueError(f"Target {list(pose[:3])} is out of reach: {distance:.0f}mm from the robot base, "
+                             f"beyond the {self._robot_name} reach limit of {self.reach_max_mm:.0f}mm")
+        
+        if distance < self.reach_min_mm:
+            limit = f"inside the minimum reach of {self.reach_min_mm:.0f}mm"
+        elif distance > self.reach_max_mm - REACH_IK_BAND_MM:
+            limit = f"near the {self._robot_name} reach limit of {self.reach_max_mm:.0f}mm"
+        else:
+            return
+        if self._solve_ik(_pose_from_tuple(*pose)) is None:
+            raise ValueError(f"Target {list(pose[:3])} is out of reach: {distance:.0f}mm from the robot base, "
+                             f"{limit}, and has no IK solution")
+    
+    def _solve_ik(self, target_pose: robomath.Mat, robot: Optional[Item] = None) -> Optional[robomath.Mat]:
+        """
+        Solve IK for a target the way MoveJ interprets it.
+        
+        Targets are TCP poses in the robot's active reference frame, so the
+        active tool and frame are passed; without them RoboDK solves for the
+        flange in base coordinates.
+        
+        Args:
+            target_pose (Mat): Target matrix
+            robot (Item, optional): Robot item to solve with; defaults to self.robot,
+                on the main RoboDK connection
+        
+        Returns:
+            Mat: Joint solution, or None if the target has no solution
+        """
+        robot = self.robot if robot is None else robot
+        joints = robot.SolveIK(target_pose, tool=robot.PoseTool(), reference=robot.PoseFrame())
+        return joints if len(joints.list()) >= 6 else None
+    
+    def _move_joint_cached(self, target_pose: robomath.Mat, blocking: bool = True) -> None:
+        """
+        MoveJ to a target matrix, reusing the joints reached there last time.
+        
+        Target matrices come from the pose caches (_pose_from_tuple and
+        PositionsManager), so a repeated target is the same object and is
+        looked up by identity. The first blocking move to a target is sent as
+        a pose and the joints it ends at are stored; later moves go straight
+        to those joints. Non-blocking misses aren't stored, since the joints
+        can only be read once the move is done.
+        
+        Args:
+            target_pose (Mat): Target matrix
+            blocking (bool): Wait for the move to finish
+        """
+        joints = self._cached_joints(target_pose)
+        if joints is not None:
+            self.robot.MoveJ(joints, blocking)
+            return
+        
+        self.robot.MoveJ(target_pose, blocking)
+        if blocking:
+            self._store_joints(target_pose, self.robot.Joints())
     
-    def _reconnect_if_needed(self):
-        """Check RoboDK connection and reconnect if needed after Dashboard commands."""
+    def _cached_joints(self, target_pose: robomath.Mat) -> Optional[robomath.Mat]:
+        """Return the cached joints for a target matrix, or None."""
+        key = id(target_pose)
+        entry = self._ik_cache.get(key)
+        if entry is None or entry[0] is not target_pose:
+            return None
+        self._ik_cache.move_to_end(key)
+        return entry[1]
+    
+    def _store_joints(self, target_pose: robomath.Mat, joints: robomath.Mat) -> None:
+        """Cache the joints for a target matrix, evicting the least recently used."""
+        self._ik_cache[id(target_pose)] = (target_pose, joints)
+        while len(self._ik_cache) > self.ik_cache_size:
+            self._ik_cache.popitem(last=False)
+    
+    def _presolve(self, target_pose: robomath.Mat) -> Optional[robomath.Mat]:
+        """
+        Solve IK for a target on the planner thread.
+        
+        Used while the robot stands still (e.g. during a gripper wait), so
+        the solution closest to the current joints is the one MoveJ would
+        pick. The planner thread has its own Robolink, since the main
+        connection isn't thread-safe. Like MoveJ, the target is solved for
+        the TCP in the robot's active reference frame.
+        
+        Args:
+            target_pose (Mat): Target matrix
+        
+        Returns:
+            Mat: Joint solution, or None if the target has no solution
+        """
+        if self._planner_robot is None:
+            self._planner_robot = Robolink().Item(self._robot_name, robolink.ITEM_TYPE_ROBOT)
+        return self._solve_ik(target_pose, self._planner_robot)
+    
+    def _can_batch_gripper(self) -> bool:
+        """True if gripper programs can be called from inside a RoboDK program."""
+        return self.gripper is not None and self.gripper.backend == 'robodk_api'
+    
+    def _run_sequence(self, steps: Sequence[Tuple[str, Any]], blocking: bool = True) -> None:
+        """
+        Run moves and gripper program calls as one RoboDK program.
+        
+        The whole sequence is sent to RoboDK up front and waited on once,
+        instead of one MoveJ/WaitMove round trip per step.
+        
+        Args:
+            steps (list): ('movej', pose), ('movel', pose), ('rounding', radius_mm)
+                or ('call', program_name) tuples
+            blocking (bool): Wait for the program to finish. If False, the
+                program is left running and finished by the next motion.
+        """
+        self._finish_pending()
+        prog = self.rdk.AddProgram("pick_place_seq", self.robot)
         try:
-            state = self.robot.ConnectedState()
-            
-            if state != robolink.ROBOTCOM_READY:
-                print(f"     RoboDK disconnected (state: {state}), reconnecting...")
-                self.robot.Connect()
-                time.sleep(2)
-                
-                new_state = self.robot.ConnectedState()
-                if new_state == robolink.ROBOTCOM_READY:
-                    print("     \u2713 RoboDK reconnected successfully")
-                else:
-                    print(f"     \u26a0 Connection state: {new_state}")
-            else:
-                print("     \u2713 RoboDK connection OK")
-                
-        except Exception as e:
-            print(f"     \u26a0 Reconnection check: {e}")
+            # Adding each instruction would otherwise redraw the station; render once when built
+            self.rdk.Render(False)
             try:
-                self.robot.Connect()
-                time.sleep(2)
-                print("     \u2713 RoboDK reconnected")
-            except:
-                print("     \u2717 Failed to reconnect")
-
-    def move_to_home(self):
+                for kind, arg in steps:
+                    if kind == 'movej':
+                        prog.MoveJ(arg)
+                    elif kind == 'movel':
+                        prog.MoveL(arg)
+                    elif kind == 'rounding':
+                        prog.setRounding(arg)
+                    else:
+                        prog.RunInstruction(program_call_name(arg), robolink.INSTRUCTION_CALL_PROGRAM)
+            finally:
+                self.rdk.Render(True)
+            prog.RunProgram()
+            if not blocking:
+                self._pending_program, prog = prog, None
+                return
+            prog.WaitFinished()
+        finally:
+            if prog is not None:
+                prog.Delete()
+    
+    def _finish_pending(self) -> None:
+        """
+        Wait for work left running by a non-blocking pick/place.
+        
+        Called before every motion so the robot never moves while the last
+        gripper program (or batched sequence) is still running.
+        """
+        if self._pending_program is not None:
+            prog, self._pending_program = self._pending_program, None
+            try:
+                prog.WaitFinished()
+            finally:
+                prog.Delete()
+        
+        if self._gripper_pending:
+            self._gripper_pending = False
+            logger.debug("  → Waiting for previous gripper action...")
+            self._wait_gripper_ready()
+        
+        # The Dashboard program can drop the RoboDK connection; don't move until it is back
+        self._require_connection()
+        
+        if self._pending_retract is not None:
+            target, self._pending_retract = self._pending_retract, None
+            logger.debug("  → Moving back to approach position...")
+            self.robot.MoveL(target)
+    
+    def _finish_gripper_action(self, action: str, settle_s: float = 1.0) -> None:
+        """
+        Wait for a gripper program and for the robot to be ready for the next motion.
+        
+        Args:
+            action (str): 'open' or 'close', for logging
+            settle_s (float): Maximum time to wait for the robot once the program has finished
+        """
+        # Wait for gripper program to complete
+        logger.debug("  → Waiting for gripper to %s...", action)
+        self.gripper.wait_completion(timeout=10)
+        # The Dashboard program can drop the RoboDK connection; the monitor restores it
+        self._require_connection()
+        
+        self._wait_ready(timeout=settle_s)
+    
+    def _wait_ready(self, timeout: float = 2.0, poll: float = 0.02) -> bool:
+        """
+        Wait until RoboDK reports the robot is no longer busy.
+        
+        Replaces a fixed settle delay: returns as soon as the robot is ready,
+        and waits up to `timeout` when it takes longer.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            poll (float): Seconds between Busy() checks
+        
+        Returns:
+            bool: True if the robot is ready, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self.robot.Busy():
+            if time.monotonic() >= deadline:
+                logger.warning("     ⚠ Robot still busy")
+                return False
+            time.sleep(poll)
+        return True
+    
+    def move_to_home(self) -> bool:
         """
         Move the robot to its home position from positions file.
         
@@ -163,33 +514,32 @@ class RobotController:
             bool: True if successful, False otherwise.
         """
         try:
+            self._finish_pending()
+            
             # Get home position from positions file
             home_data = self.positions_manager.get_position('home pose')
             
             if home_data:
                 # Use position from file
                 position = home_data['position']
-                orientation = home_data['orientation']
-                pose = position + orientation
-                target_pose = robomath.TxyzRxyz_2_Pose(pose)
+                target_pose = self.positions_manager.get_pose_matrix('home pose')
                 
-                print(f"Moving to home position from file: {position}")
-                self.robot.MoveJ(target_pose)
-                self.robot.WaitMove()
-                print("Reached home position.")
+                logger.info("Moving to home position from file: %s", position)
+                self._move_joint_cached(target_pose)
+                logger.info("Reached home position.")
             else:
                 # Fallback to stored joints if home not in file
-                print("Home position not found in file, using stored joints...")
+                logger.info("Home position not found in file, using stored joints...")
                 self.robot.MoveJ(self.home_joints)
                 self.robot.WaitMove()
-                print("Reached home position.")
+                logger.info("Reached home position.")
             
             return True
         except Exception as e:
-            print(f"Error moving to home: {e}")
+            logger.error("Error moving to home: %s", e)
             return False
     
-    def move_to_pose(self, pose):
+    def move_to_pose(self, pose: Sequence[float]) -> bool:
         """
         Move the robot to a specific pose.
         
@@ -204,35 +554,80 @@ class RobotController:
         try:
             if len(pose) != 6:
                 raise ValueError("Pose must contain 6 elements [x, y, z, rx, ry, rz]")
+            self._check_reachable(pose)
             
             # Create pose matrix from position and orientation
-            target_pose = robomath.TxyzRxyz_2_Pose(pose)
+            target_pose = _pose_from_tuple(*pose)
+            self._finish_pending()
+            
+            logger.info("Moving to pose: %s", pose)
+            self._move_joint_cached(target_pose)
+            logger.info("Reached target pose.")
+            return True
+        except Exception as e:
+            logger.error("Error moving to pose: %s", e)
+            return False
+    
+    def move_through(self, poses: Sequence[Sequence[float]], rounding_mm: float = 20) -> bool:
+        """
+        Move through a list of poses without stopping at the intermediate ones.
+        
+        All moves are queued with a blend radius of rounding_mm, so the robot
+        rounds the corners at the intermediate poses; only the last pose is
+        reached exactly, and only it is waited on.
+        
+        Args:
+            poses (list): Target poses, each [x, y, z, rx, ry, rz]
+            rounding_mm (float): Blend radius in mm at the intermediate poses
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            if not poses or any(len(pose) != 6 for pose in poses):
+                raise ValueError("Each pose must contain 6 elements [x, y, z, rx, ry, rz]")
+            for pose in poses:
+                self._check_reachable(pose)
+            
+            targets = [_pose_from_tuple(*pose) for pose in poses]
+            self._finish_pending()
             
-            print(f"Moving to pose: {pose}")
-            self.robot.MoveJ(target_pose)
+            logger.info("Moving through %s poses (rounding %smm)", len(targets), rounding_mm)
+            self.robot.setRounding(rounding_mm)
+            try:
+                for target in targets[:-1]:
+                    self.robot.MoveJ(target, False)
+            finally:
+                self.robot.setRounding(self.rounding_mm)
+            self.robot.MoveJ(targets[-1], False)
             self.robot.WaitMove()
-            print("Reached target pose.")
+            logger.info("Reached final pose.")
             return True
         except Exception as e:
-            print(f"Error moving to pose: {e}")
+            logger.error("Error moving through poses: %s", e)
             return False
     
-    def pick_object(self, position, orientation, pick_offset_mm=30):
+    def pick_object(self, position: Sequence[float], orientation: Sequence[float], pick_offset_mm: float = 30,
+                    blocking: bool = True) -> bool:
         """
         Execute a pick operation at the specified position and orientation.
         The received pose is the approach position (above the object).
         
         Sequence:
-        1. Move to approach position
-        2. Open gripper
-        3. Move down by pick_offset_mm
+        1. Open gripper
+        2. Move to approach position
+        3. Move down by pick_offset_mm (only if pick_descend is set)
         4. Close gripper
-        5. Move back to approach position
+        5. Move back to approach position (only if pick_descend is set)
         
         Args:
             position (list): [x, y, z] coordinates in mm (approach position)
             orientation (list): [rx, ry, rz] orientation angles in degrees
-            pick_offset_mm (float): Distance to move down to grasp object (default: 40mm)
+            pick_offset_mm (float): Distance to move down to grasp object when
+                pick_descend is set (default: 30mm)
+            blocking (bool): True (default) waits for the gripper to close before
+                returning. False returns once the close is started; the next
+                motion waits for it, so the next command can be queued meanwhile.
         
         Returns:
             bool: True if successful, False otherwise.
@@ -240,65 +635,111 @@ class RobotController:
         try:
             if len(position) != 3 or len(orientation) != 3:
                 raise ValueError("Position and orientation must contain 3 elements each")
+            self._check_reachable([*position, *orientation])
             
-            # Received pose is the approach position
-            approach_pose = position + orientation
-            approach_target = robomath.TxyzRxyz_2_Pose(approach_pose)
+            approach_target, pick_target = self._pick_targets(position, orientation, pick_offset_mm)
+            return self._pick_at(position, approach_target, pick_target, blocking)
+        except Exception as e:
+            logger.error("Error during pick operation: %s", e)
+            return False
+    
+    def _pick_at(self, position: Sequence[float], approach_target: robomath.Mat, pick_target: robomath.Mat,
+                 blocking: bool = True) -> bool:
+        """
+        Run the pick sequence against already computed target matrices.
+        
+        Args:
+            position (list): [x, y, z] approach position in mm, for logging
+            approach_target (Mat): Approach target from _pick_targets()
+            pick_target (Mat): Pick target from _pick_targets()
+            blocking (bool): Wait for the gripper to close before returning
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            logger.info("Picking object at approach position: %s", position)
             
-            # Calculate pick position (move down on Z)
-            pick_pose = approach_pose.copy()
-            pick_pose[2] -= pick_offset_mm  # Move down from approach
-            pick_target = robomath.TxyzRxyz_2_Pose(pick_pose)
+            if self._can_batch_gripper():
+                logger.debug("  → Running open / approach / close as one program...")
+                if self.pick_descend:
+                    self._run_sequence([
+                        ('call', self.gripper.OPEN_PROGRAM),
+                        ('rounding', self.approach_rounding_mm),
+                        ('movej', approach_target),
+                        ('rounding', 0),
+                        ('movel', pick_target),
+                        ('call', self.gripper.CLOSE_PROGRAM),
+                        ('movel', approach_target),
+                    ], blocking)
+                else:
+                    self._run_sequence([
+                        ('call', self.gripper.OPEN_PROGRAM),
+                        ('movej', approach_target),
+                        ('call', self.gripper.CLOSE_PROGRAM),
+                    ], blocking)
+                logger.info("✓ Pick operation completed." if blocking else "✓ Pick operation started.")
+                return True
             
-            print(f"Picking object at approach position: {position}")
+            self._finish_pending()
             
              # Step 2: Open gripper
-            print("  → Opening gripper...")
+            logger.debug("  → Opening gripper...")
             self.gripper.open()
-            # Wait for gripper program to complete
-            print("  → Waiting for gripper to open...")
-            self.gripper.wait_completion(timeout=10)
-            # Ensure RoboDK reconnection after Dashboard command
-            print("  → Verifying RoboDK connection...")
-            self._reconnect_if_needed()
-            time.sleep(1)  # Extra delay to ensure robot is ready
+            # Solve the approach IK while the gripper opens
+            presolved = None
+            if self._cached_joints(approach_target) is None:
+                presolved = self._planner.submit(self._presolve, approach_target)
+            self._finish_gripper_action("open")
+            if presolved is not None:
+                try:
+                    joints = presolved.result()
+                except Exception as e:
+                    logger.debug("Approach IK not presolved: %s", e)
+                else:
+                    if joints is not None:
+                        self._store_joints(approach_target, joints)
             
             # Step 1: Move to approach position
-            print("  → Moving to approach position...")
-            self.robot.MoveJ(approach_target)
-            self.robot.WaitMove()
-            
-           
-            
-            # # Step 3: Move down to pick position
-            # print(f"  → Moving down {pick_offset_mm}mm to grasp object...")
-            # self.robot.MoveL(pick_target)
-            # self.robot.WaitMove()
+            logger.debug("  → Moving to approach position...")
+            if self.pick_descend:
+                # Step 3: Move down to pick position, blending through the
+                # approach pose; the grasp is the only stop before the gripper
+                self.robot.setRounding(self.approach_rounding_mm)
+                try:
+                    self._move_joint_cached(approach_target, False)
+                finally:
+                    self.robot.setRounding(self.rounding_mm)
+                logger.debug("  → Moving down to grasp object...")
+                self.robot.MoveL(pick_target, False)
+                self.robot.WaitMove()
+            else:
+                self._move_joint_cached(approach_target)
             
             # Step 4: Close gripper to grip object
-            print("  → Closing gripper...")
+            logger.debug("  → Closing gripper...")
             self.gripper.close()
-            # Wait for gripper program to complete
-            print("  → Waiting for gripper to close...")
-            self.gripper.wait_completion(timeout=10)
-            # Ensure RoboDK reconnection after Dashboard command
-            print("  → Verifying RoboDK connection...")
-            self._reconnect_if_needed()
-            time.sleep(1)  # Extra delay to ensure robot is ready
+            if not blocking:
+                self._gripper_pending = True
+                if self.pick_descend:
+                    self._pending_retract = approach_target
+                logger.info("✓ Pick operation started.")
+                return True
+            self._finish_gripper_action("close")
             
-            # # Step 5: Move back to approach position
-            # print("  → Moving back to approach position...")
-            # self.robot.MoveL(approach_target)
-            # self.robot.WaitMove()
+            # Step 5: Move back to approach position
+            if self.pick_descend:
+                logger.debug("  → Moving back to approach position...")
+                self.robot.MoveL(approach_target)
             
-            print("✓ Pick operation completed.")
+            logger.info("✓ Pick operation completed.")
             return True
         except Exception as e:
 
-            print(f"Error during pick operation: {e}")
+            logger.error("Error during pick operation: %s", e)
             return False
     
-    def place_object(self, position, orientation):
+    def place_object(self, position: Sequence[float], orientation: Sequence[float], blocking: bool = True) -> bool:
         """
         Execute a place operation at the specified position and orientation.
         
@@ -309,6 +750,8 @@ class RobotController:
         Args:
             position (list): [x, y, z] coordinates in mm (place position)
             orientation (list): [rx, ry, rz] orientation angles in degrees
+            blocking (bool): True (default) waits for the gripper to open before
+                returning. False returns once the release is started.
         
         Returns:
             bool: True if successful, False otherwise.
@@ -316,35 +759,202 @@ class RobotController:
         try:
             if len(position) != 3 or len(orientation) != 3:
                 raise ValueError("Position and orientation must contain 3 elements each")
+            self._check_reachable([*position, *orientation])
+            
+            return self._place_at(position, self._place_target(position, orientation), blocking)
+        except Exception as e:
+            logger.error("Error during place operation: %s", e)
+            return False
+    
+    def _place_at(self, position: Sequence[float], target_pose: robomath.Mat, blocking: bool = True) -> bool:
+        """
+        Run the place sequence against an already computed target matrix.
+        
+        Args:
+            position (list): [x, y, z] place position in mm, for logging
+            target_pose (Mat): Place target from _place_target()
+            blocking (bool): Wait for the gripper to open before returning
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            logger.info("Placing object at position: %s", position)
             
-            pose = position + orientation
-            target_pose = robomath.TxyzRxyz_2_Pose(pose)
+            if self._can_batch_gripper():
+                logger.debug("  → Running move / release as one program...")
+                self._run_sequence([
+                    ('movej', target_pose),
+                    ('call', self.gripper.OPEN_PROGRAM),
+                ], blocking)
+                logger.info("✓ Place operation completed." if blocking else "✓ Place operation started.")
+                return True
             
-            print(f"Placing object at position: {position}")
+            self._finish_pending()
             
             # Step 1: Move to place position
-            print("  → Moving to place position...")
-            self.robot.MoveJ(target_pose)
-            self.robot.WaitMove()
+            logger.debug("  → Moving to place position...")
+            self._move_joint_cached(target_pose)
             
             # Step 2: Open gripper to release object
-            print("  → Opening gripper to release object...")
+            logger.debug("  → Opening gripper to release object...")
             self.gripper.open()
-            # Wait for gripper program to complete
-            print("  → Waiting for gripper to open...")
-            self.gripper.wait_completion(timeout=10)
-            # Ensure RoboDK reconnection after Dashboard command
-            print("  → Verifying RoboDK connection...")
-            self._reconnect_if_needed()
-            time.sleep(1)  # Extra delay to ensure robot is ready
+            if not blocking:
+                self._gripper_pending = True
+                logger.info("✓ Place operation started.")
+                return True
+            self._finish_gripper_action("open")
+            
+            logger.info("✓ Place operation completed.")
+            return True
+        except Exception as e:
+            logger.error("Error during place operation: %s", e)
+            return False
+    
+    @staticmethod
+    def _pick_targets(position: Sequence[float], orientation: Sequence[float],
+                      pick_offset_mm: float = 30) -> Tuple[robomath.Mat, robomath.Mat]:
+        """
+        Compute the approach and pick target matrices for a pick.
+        
+        The received pose is the approach position; the pick position is
+        pick_offset_mm below it.
+        
+        Returns:
+            tuple: (approach_target, pick_target)
+        """
+        approach_target = _pose_from_tuple(*position, *orientation)
+        return approach_target, RobotController._pick_target(approach_target, position, pick_offset_mm)
+    
+    @staticmethod
+    def _pick_target(approach_target: robomath.Mat, position: Sequence[float], pick_offset_mm: float) -> robomath.Mat:
+        """
+        Derive the pick target from the approach target.
+        
+        The pick position only differs in Z, so the approach matrix's
+        translation is shifted instead of building a second pose list and matrix.
+        The new position is passed as a tuple; setPos() only indexes it.
+        """
+        x, y, z = position
+        return approach_target.copy().setPos((x, y, z - pick_offset_mm))
+    
+    @staticmethod
+    def _place_target(position: Sequence[float], orientation: Sequence[float]) -> robomath.Mat:
+        """Compute the target matrix for a place."""
+        return _pose_from_tuple(*position, *orientation)
+    
+    def pick_named(self, name: str, pick_offset_mm: float = 30, blocking: bool = True) -> bool:
+        """
+        Pick at a named position from the positions file (e.g. 'piece 1').
+        
+        Uses the target matrix PositionsManager keeps for the position, so no
+        pose transform is computed per call.
+        
+        Args:
+            name (str): Position name
+            pick_offset_mm (float): Distance to move down to grasp the object
+            blocking (bool): Wait for the gripper to close before returning
+        
+        Returns:
+            bool: True if successful, False otherwise (including unknown names).
+        """
+        pose_data = self.positions_manager.get_position(name)
+        if not pose_data:
+            logger.error("Error during pick operation: Unknown position '%s'", name)
+            return False
+        
+        position = pose_data['position']
+        approach_target = self.positions_manager.get_pose_matrix(name)
+        pick_target = self._pick_target(approach_target, position, pick_offset_mm)
+        return self._pick_at(position, approach_target, pick_target, blocking)
+    
+    def place_named(self, name: str, blocking: bool = True) -> bool:
+        """
+        Place at a named position from the positions file (e.g. 'bad bin').
+        
+        Args:
+            name (str): Position name
+            blocking (bool): Wait for the gripper to open before returning
+        
+        Returns:
+            bool: True if successful, False otherwise (including unknown names).
+        """
+        pose_data = self.positions_manager.get_position(name)
+        if not pose_data:
+            logger.error("Error during place operation: Unknown position '%s'", name)
+            return False
+        
+        return self._place_at(pose_data['position'], self.positions_manager.get_pose_matrix(name), blocking)
+    
+    def pick_place_program(self, piece: str, location: str, timeout: float = 60.0) -> bool:
+        """
+        Pick at one named position and place at another with a generated URScript program.
+        
+        The whole cycle runs on the controller as one program (see
+        urscript_programs), so it needs the real robot's IP address and no
+        RoboDK calls once the program for the pair has been generated.
+        
+        Args:
+            piece (str): Named position to pick at (e.g. 'piece 1')
+            location (str): Named position to place at (e.g. 'bad bin')
+            timeout (float): Maximum time to wait for the program in seconds
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            if not self.robot_ip:
+                raise ValueError("URScript programs need the robot IP address")
+            if self._urscript_programs is None:
+                from urscript_programs import URScriptPickPlace
+                self._urscript_programs = URScriptPickPlace(self.robot, self.positions_manager, self.robot_ip,
+                                                            preamble=self.urscript_preamble)
             
-            print("✓ Place operation completed.")
+            self._finish_pending()
+            logger.info("Running pick/place program: %s -> %s", piece, location)
+            if not self._urscript_programs.run(piece, location, timeout):
+                logger.error("Error during pick/place program: program did not finish")
+                return False
+            logger.info("✓ Pick/place program completed.")
             return True
         except Exception as e:
-            print(f"Error during place operation: {e}")
+            logger.error("Error during pick/place program: %s", e)
+            return False
+    
+    def pick_and_place(self, pick_position: Sequence[float], pick_orientation: Sequence[float],
+                       place_position: Sequence[float], place_orientation: Sequence[float],
+                       pick_offset_mm: float = 30, blocking: bool = True) -> bool:
+        """
+        Pick an object and place it, as one cycle.
+        
+        The place pose is validated before picking, so nothing is picked up
+        that can't be put down.
+        
+        Args:
+            pick_position (list): [x, y, z] approach position for the pick in mm
+            pick_orientation (list): [rx, ry, rz] pick orientation in degrees
+            place_position (list): [x, y, z] place position in mm
+            place_orientation (list): [rx, ry, rz] place orientation in degrees
+            pick_offset_mm (float): Distance to move down to grasp the object
+            blocking (bool): Wait for the final release before returning
+        
+        Returns:
+            bool: True if both the pick and the place succeeded.
+        """
+        if len(place_position) != 3 or len(place_orientation) != 3:
+            logger.error("Error during place operation: Position and orientation must contain 3 elements each")
+            return False
+        try:
+            self._check_reachable([*place_position, *place_orientation])  # Before picking up something we can't put down
+        except ValueError as e:
+            logger.error("Error during place operation: %s", e)
+            return False
+        
+        if not self.pick_object(pick_position, pick_orientation, pick_offset_mm):
             return False
+        return self._place_at(place_position, self._place_target(place_position, place_orientation), blocking)
     
-    def wait(self, time_sec):
+    def wait(self, time_sec: float) -> bool:
         """
         Wait for a specified amount of time.
         
@@ -354,12 +964,12 @@ class RobotController:
         Returns:
             bool: True when wait is complete.
         """
-        print(f"Waiting for {time_sec} seconds...")
+        logger.info("Waiting for %s seconds...", time_sec)
         time.sleep(time_sec)
-        print("Wait completed.")
+        logger.info("Wait completed.")
         return True
     
-    def _activate_gripper(self, close=True):
+    def _activate_gripper(self, close: bool = True) -> None:
         """
         Activate or deactivate the gripper.
         
@@ -371,62 +981,196 @@ class RobotController:
         """
         if self.gripper and self.gripper.is_connected():
             # Use real gripper
-            if close:
-                success = self.gripper.close()
-                if success:
-                    self.gripper.wait_for_completion()
-            else:
-                success = self.gripper.open()
-                if success:
-                    self.gripper.wait_for_completion()
+            success = self.gripper.close() if close else self.gripper.open()
+            if success:
+                self._wait_gripper_ready()
         else:
             # Simulated gripper
             action = "Closing" if close else "Opening"
-            print(f"{action} gripper (simulated)")
-            time.sleep(0.5)
+            logger.info("%s gripper (simulated)", action)
+    
+    def _wait_gripper_ready(self, timeout: float = 10) -> bool:
+        """
+        Wait until the gripper program has finished.
+        
+        Returns as soon as the controller reports the program stopped, instead
+        of padding every gripper action with a fixed delay. A simulated gripper
+        (no gripper connected) is always ready.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+        
+        Returns:
+            bool: True if the gripper is ready, False on timeout
+        """
+        if not (self.gripper and self.gripper.is_connected()):
+            return True
+        return self.gripper.wait_completion(timeout=timeout)
+    
+    def _monitor(self, robot_name: str, period: float, sample_state: bool, watch_connection: bool,
+                 check_period: float = 0.25) -> None:
+        """
+        Poll RoboDK in the background until disconnect().
+        
+        Runs on its own Robolink connection: the API socket carries one
+        request/reply at a time, and the main connection is tied up for the
+        whole of a blocking move. Each pass does the polling every caller
+        would otherwise do on its own:
+        
+        - Samples the pose and joints into _state for get_current_pose and
+          get_current_joints.
+        - Every `check_period` seconds, checks ConnectedState() and keeps
+          _conn_ok set while the driver is connected (READY, or WORKING /
+          WAITING during a move). When the connection drops (e.g. after a
+          Dashboard program), it reconnects, backing off from 0.5 s up to
+          8 s between attempts, so pick/place only has to check the event.
+          Other states (e.g. while the driver is connecting) are left alone.
+        
+        Args:
+            robot_name (str): Name of the robot item in RoboDK
+            period (float): Seconds between passes
+            sample_state (bool): Sample the pose and joints
+            watch_connection (bool): Supervise the robot connection
+            check_period (float): Seconds between connection checks
+        """
+        connection_errors = (OSError, robolink.TargetReachError)
+        # The driver reports WORKING/WAITING for the whole of a move; only a
+        # dropped connection (or a failed check, None) triggers a reconnect
+        connected_states = (robolink.ROBOTCOM_READY, robolink.ROBOTCOM_WORKING, robolink.ROBOTCOM_WAITING)
+        dropped_states = (None, robolink.ROBOTCOM_DISCONNECTED, robolink.ROBOTCOM_NOT_CONNECTED,
+                          robolink.ROBOTCOM_PROBLEMS)
+        try:
+            robot = Robolink().Item(robot_name, robolink.ITEM_TYPE_ROBOT)
+        except Exception as e:
+            logger.warning("Robot monitor disabled: %s", e)
+            self._conn_ok.set()  # Don't hold up motions on a check that can't run
+            return
+        
+        backoff = 0.5
+        next_check = next_attempt = 0.0
+        while not self._monitor_stop.is_set():
+            now = time.monotonic()
+            if watch_connection and now >= next_check:
+                next_check = now + check_period
+                try:
+                    connected = robot.ConnectedState()
+                except connection_errors:
+                    connected = None
+                
+                if connected in connected_states:
+                    if not self._conn_ok.is_set():
+                        logger.info("     ✓ RoboDK connection ready")
+                        self._conn_ok.set()
+                    backoff = 0.5
+                elif connected in dropped_states:
+                    if self._conn_ok.is_set():
+                        logger.info("     RoboDK disconnected (state: %s), reconnecting...", connected)
+                        self._conn_ok.clear()
+                    if now >= next_attempt:
+                        try:
+                            robot.Connect(blocking=False)
+                        except connection_errors as e:
+                            logger.warning("     ⚠ Reconnect attempt failed: %s", e)
+                        next_attempt = now + backoff
+                        backoff = min(backoff * 2, 8.0)
+            
+            if sample_state:
+                try:
+                    pose = tuple(robomath.Pose_2_TxyzRxyz(robot.Pose()))
+                    joints = tuple(robot.Joints().list())
+                    self._state = (time.monotonic(), pose, joints)
+                except Exception:
+                    pass  # Sample goes stale; the getters fall back to direct reads
+            
+            self._monitor_stop.wait(period)
     
-    def get_current_pose(self):
+    def _fresh_state(self) -> Optional[Tuple[float, Tuple[float, ...], Tuple[float, ...]]]:
+        """Return the latest monitor sample, or None if it is older than state_max_age."""
+        state = self._state
+        if state[1] is not None and time.monotonic() - state[0] < self.state_max_age:
+            return state
+        return None
+    
+    def get_current_pose(self) -> List[float]:
         """
         Get the current robot pose.
         
+        Returns the state monitor's latest sample when it is recent, otherwise
+        waits for the robot to stop and reads it from RoboDK.
+        
         Returns:
             list: Current pose as [x, y, z, rx, ry, rz]
         """
+        state = self._fresh_state()
+        if state is not None:
+            return list(state[1])
+        
         # Wait for robot to be ready (not busy)
         self.robot.WaitMove()
-        time.sleep(0.1)  # Small delay to ensure robot is fully ready
+        self._wait_ready(timeout=0.1)
         
         pose_matrix = self.robot.Pose()
         pose = robomath.Pose_2_TxyzRxyz(pose_matrix)
         return pose
     
-    def get_current_joints(self):
+    def get_current_joints(self) -> List[float]:
         """
         Get the current robot joint angles.
         
         Returns:
             list: Current joint angles in degrees.
         """
+        state = self._fresh_state()
+        if state is not None:
+            return list(state[2])
+        
         # Wait for robot to be ready (not busy)
         self.robot.WaitMove()
-        time.sleep(0.1)  # Small delay to ensure robot is fully ready
+        self._wait_ready(timeout=0.1)
         
         return self.robot.Joints().list()
     
-    def disconnect(self):
+    def get_current_state(self) -> Tuple[List[float], List[float]]:
+        """
+        Get the current robot pose and joint angles together.
+        
+        Both come from the same monitor sample when it is recent; otherwise
+        the robot is waited on once and both are read from RoboDK, instead of
+        once per getter.
+        
+        Returns:
+            tuple: (pose as [x, y, z, rx, ry, rz], joint angles in degrees)
+        """
+        state = self._fresh_state()
+        if state is not None:
+            return list(state[1]), list(state[2])
+        
+        # Wait for robot to be ready (not busy)
+        self.robot.WaitMove()
+        self._wait_ready(timeout=0.1)
+        
+        pose = robomath.Pose_2_TxyzRxyz(self.robot.Pose())
+        return pose, self.robot.Joints().list()
+    
+    def disconnect(self) -> None:
         """
         Disconnect from the robot and clean up resources.
         """
-        print(f"Disconnecting from robot: {self.robot.Name()}")
+        logger.info("Disconnecting from robot: %s", self._robot_name)
         
         # Disconnect gripper if connected
         if self.gripper and self.gripper.is_connected():
             self.gripper.disconnect()
         
+        self._planner.shutdown(wait=False)
+        if self._urscript_programs is not None:
+            self._urscript_programs.close()
+        self._monitor_stop.set()
+        
         # Connection is automatically closed when object is destroyed
-        print("Disconnected successfully.")
+        logger.info("Disconnected successfully.")
     
-    def gripper_open(self, width_mm=None, force_n=None):
+    def gripper_open(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> bool:
         """
         Open the gripper to specified width.
         
@@ -440,11 +1184,10 @@ class RobotController:
         if self.gripper and self.gripper.is_connected():
             return self.gripper.open(width_mm, force_n)
         else:
-            print("Opening gripper (simulated)")
-            time.sleep(0.5)
+            logger.info("Opening gripper (simulated)")
             return True
     
-    def gripper_close(self, width_mm=None, force_n=None):
+    def gripper_close(self, width_mm: Optional[float] = None, force_n: Optional[float] = None) -> bool:
         """
         Close the gripper to specified width.
         
@@ -458,11 +1201,10 @@ class RobotController:
         if self.gripper and self.gripper.is_connected():
             return self.gripper.close(width_mm, force_n)
         else:
-            print("Closing gripper (simulated)")
-            time.sleep(0.5)
+            logger.info("Closing gripper (simulated)")
             return True
     
-    def gripper_status(self):
+    def gripper_status(self) -> Optional[Dict]:
         """
         Get gripper status.
         
@@ -473,7 +1215,7 @@ class RobotController:
             return self.gripper.get_status()
         return None
     
-    def is_object_gripped(self):
+    def is_object_gripped(self) -> bool:
         """
         Check if an object is gripped.
         
@@ -22,10 +22,10 @@ echo.
 
 REM Check if RoboDK is installed
 echo [2/5] Checking dependencies...
-pip show robodk >nul 2>&1
+pip show robodk fastjsonschema >nul 2>&1
 if errorlevel 1 (
     echo Installing RoboDK Python API...
-    pip install robodk
+    pip install robodk fastjsonschema
     if errorlevel 1 (
         echo [ERROR] Failed to install robodk
         pause
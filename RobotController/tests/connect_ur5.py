@@ -48,6 +48,10 @@ def find_and_connect_ur5():
     print("\n[Step 3] Searching for robots in station...")
     try:
         robots = rdk.ItemList(ITEM_TYPE_ROBOT)
+        # Names fetched in one call instead of one Name() request per robot
+        names = rdk.ItemList(ITEM_TYPE_ROBOT, list_names=True)
+        if len(names) != len(robots):
+            names = [robot.Name() for robot in robots]  # Station changed between the two calls
         
         if len(robots) == 0:
             print("  ❌ No robots found in the station!")
@@ -59,35 +63,35 @@ def find_and_connect_ur5():
             return None
         
         print(f"  ✅ Found {len(robots)} robot(s):")
-        for i, robot in enumerate(robots, 1):
-            print(f"     {i}. {robot.Name()}")
+        for i, name in enumerate(names, 1):
+            print(f"     {i}. {name}")
         
         # Step 4: Try to find UR5 specifically
         print("\n[Step 4] Looking for UR5 robot...")
         ur5_robot = None
+        ur5_name = None
         
         # Try common UR5 names
         ur5_names = ['UR5', 'UR5 Base', 'UR5e', 'Universal Robots UR5']
         
         for name in ur5_names:
-            test_robot = rdk.Item(name, ITEM_TYPE_ROBOT)
-            if test_robot.Valid():
-                ur5_robot = test_robot
+            if name in names:
+                ur5_robot, ur5_name = robots[names.index(name)], name
                 print(f"  ✅ Found UR5 with name: '{name}'")
                 break
         
         # If not found by name, check if any robot contains "UR5" in name
         if not ur5_robot:
-            for robot in robots:
-                if 'UR5' in robot.Name().upper() or 'UR' in robot.Name().upper():
-                    ur5_robot = robot
-                    print(f"  ✅ Found UR-type robot: '{robot.Name()}'")
+            for robot, name in zip(robots, names):
+                if 'UR5' in name.upper() or 'UR' in name.upper():
+                    ur5_robot, ur5_name = robot, name
+                    print(f"  ✅ Found UR-type robot: '{name}'")
                     break
         
         # If still not found, use first robot
         if not ur5_robot:
-            ur5_robot = robots[0]
-            print(f"  ⚠️  UR5 not found by name, using: '{ur5_robot.Name()}'")
+            ur5_robot, ur5_name = robots[0], names[0]
+            print(f"  ⚠️  UR5 not found by name, using: '{ur5_name}'")
         
         # Step 5: Test robot connection
         print("\n[Step 5] Testing robot connection...")
@@ -96,7 +100,7 @@ def find_and_connect_ur5():
             pose = ur5_robot.Pose()
             
             print(f"  ✅ Robot is responsive!")
-            print(f"     Name: {ur5_robot.Name()}")
+            print(f"     Name: {ur5_name}")
             print(f"     DOF: {len(joints.list())} joints")
             print(f"     Joint angles: {[f'{j:.1f}°' for j in joints.list()]}")
             
@@ -10,6 +10,7 @@ Usage:
 
 from robot_controller import RobotController
 import time
+import logging
 
 
 def my_custom_sequence(robot):
@@ -217,7 +218,7 @@ def main():
         # Connect to robot
         print("\nConnecting to robot...")
         robot = RobotController()
-        print(f"✓ Connected to: {robot.robot.Name()}\n")
+        print(f"✓ Connected to: {robot.name}\n")
         
         # Show menu
         print("Select test to run:")
@@ -259,4 +260,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
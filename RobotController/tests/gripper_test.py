@@ -71,9 +71,8 @@ class OnRobotRG2:
             bool: True if connection successful
         """
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(5.0)
-            self.socket.connect((self.robot_ip, self.port))
+            self.socket = socket.create_connection((self.robot_ip, self.port), timeout=5.0)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.connected = True
             print(f"✓ Connected to RG2 gripper at {self.robot_ip}:{self.port}")
             return True
@@ -163,13 +162,33 @@ class OnRobotRG2:
             return None
         
         try:
-            self.socket.send(frame)
-            response = self.socket.recv(1024)
-            return response
-        except socket.error as e:
+            self.socket.sendall(frame)
+            # MBAP header: transaction id, protocol id, then the byte count that follows
+            header = self._recv_exact(6)
+            _, _, length = struct.unpack('>HHH', header)
+            return header + self._recv_exact(length)
+        except (socket.error, ConnectionError) as e:
             print(f"✗ Communication error: {e}")
             return None
     
+    def _recv_exact(self, size):
+        """
+        Read exactly `size` bytes, however the reply was split into packets.
+        
+        Args:
+            size (int): Number of bytes to read
+        
+        Returns:
+            bytes: The received data
+        """
+        data = b''
+        while len(data) < size:
+            chunk = self.socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Gripper closed the connection")
+            data += chunk
+        return data
+    
     def set_target_width(self, width_mm):
         """
         Set target gripper width.
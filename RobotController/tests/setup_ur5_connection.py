@@ -115,12 +115,13 @@ if len(robots) == 0:
     print("❌ No robots found in the station")
 else:
     print(f"✅ Found {len(robots)} robot(s):")
-    for i, robot in enumerate(robots, 1):
-        print(f"   {i}. {robot.Name()}")
+    names = rdk.ItemList(ITEM_TYPE_ROBOT, list_names=True)
+    for i, name in enumerate(names, 1):
+        print(f"   {i}. {name}")
     
     # Use the first robot
     robot = robots[0]
-    print(f"\n✅ Using robot: {robot.Name()}")
+    print(f"\n✅ Using robot: {names[0] if names else robot.Name()}")
 
 # ============================================================================
 # EXAMPLE 4: Using RobotController with UR5
@@ -141,6 +142,16 @@ robot_controller = RobotController(robot_name="UR5 Base")
 # EXAMPLE 5: Complete Connection Test
 # ============================================================================
 
+def fmt_joints(joints, decimals=2):
+    """
+    Format joint angles as one string, e.g. '0.00°, -90.00°, ...'.
+    
+    Builds one format string for the whole list, so it stays cheap when
+    used for longer joint histories.
+    """
+    return ", ".join([f"{{:.{decimals}f}}°"] * len(joints)).format(*joints)
+
+
 def test_ur5_connection():
     """
     Complete test to verify UR5 connection and basic operations.
@@ -171,28 +182,33 @@ def test_ur5_connection():
         print("   ⚠️  Could not get version")
     
     # Step 3: List all items in station
+    # Robot names and items are fetched once; the UR5 is then picked from them locally
     print("\n3. Station contents:")
+    names, robots = [], []
     try:
         station = rdk.ActiveStation()
         print(f"   Station: {station.Name()}")
         
         # List all robots
+        names = rdk.ItemList(ITEM_TYPE_ROBOT, list_names=True)
         robots = rdk.ItemList(ITEM_TYPE_ROBOT)
         print(f"   Robots found: {len(robots)}")
-        for robot in robots:
-            print(f"     • {robot.Name()}")
+        for name in names:
+            print(f"     • {name}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
     # Step 4: Connect to UR5
     print("\n4. Connecting to UR5 robot...")
-    robot = rdk.Item('UR5', ITEM_TYPE_ROBOT)
-    
-    if not robot.Valid():
+    robot, robot_name = None, None
+    if 'UR5' in names and len(names) == len(robots):
+        robot, robot_name = robots[names.index('UR5')], 'UR5'
+    elif robots:
         print("   ❌ UR5 not found by name, trying first available robot...")
-        robot = rdk.Item('', ITEM_TYPE_ROBOT)
+        robot = robots[0]
+        robot_name = names[0] if len(names) == len(robots) else robot.Name()
     
-    if not robot.Valid():
+    if robot is None or not robot.Valid():
         print("   ❌ No robot available")
         print("\n   Troubleshooting:")
         print("   1. Load UR5 in RoboDK: File → Open online library → UR5")
@@ -200,16 +216,15 @@ def test_ur5_connection():
         print("   3. Make sure RoboDK station is active")
         return False
     
-    print(f"   ✅ Connected to: {robot.Name()}")
+    print(f"   ✅ Connected to: {robot_name}")
     
     # Step 5: Get robot info
     print("\n5. Robot information:")
     try:
-        joints = robot.Joints()
-        pose = robot.Pose()
+        joints = robot.Joints().list()
         
-        print(f"   Number of joints: {len(joints.list())}")
-        print(f"   Current joints: {[f'{j:.2f}°' for j in joints.list()]}")
+        print(f"   Number of joints: {len(joints)}")
+        print(f"   Current joints: {fmt_joints(joints)}")
         print(f"   Robot is connected and responsive")
         
         return True
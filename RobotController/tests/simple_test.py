@@ -9,7 +9,7 @@ Usage:
 """
 
 from robot_controller import RobotController
-import time
+import logging
 
 
 def main():
@@ -21,7 +21,7 @@ def main():
         # 1. Connect to robot
         print("\n1. Connecting to robot...")
         robot = RobotController()
-        print(f"   ✓ Connected to: {robot.robot.Name()}")
+        print(f"   ✓ Connected to: {robot.name}")
         
         # 2. Show current position
         print("\n2. Current robot state:")
@@ -33,25 +33,25 @@ def main():
         print("\n3. Moving to home position...")
         robot.move_to_home()
         print("   ✓ At home position")
-        time.sleep(7)
+        robot.robot.WaitMove(30)
         
         # 4. Pick object
         print("\n4. Picking object...")
         pick_pos = [400, 200, 100]      # x, y, z in mm
         pick_orient = [0, 90, 0]        # rx, ry, rz in degrees
         print(f"   From: {pick_pos}")
-        robot.pick_object(pick_pos, pick_orient)
+        # Don't wait for the gripper here: the controller finishes the close
+        # before the next motion, so the place command is issued meanwhile
+        robot.pick_object(pick_pos, pick_orient, blocking=False)
         print("   ✓ Object picked")
-        time.sleep(7)
         
         # 5. Place object
         print("\n5. Placing object...")
         place_pos = [400, -200, 100]    # x, y, z in mm
         place_orient = [0, 90, 0]       # rx, ry, rz in degrees
         print(f"   To: {place_pos}")
-        robot.place_object(place_pos, place_orient)
+        robot.place_object(place_pos, place_orient, blocking=False)
         print("   ✓ Object placed")
-        time.sleep(7)
         
         # 6. Return home
         print("\n6. Returning to home...")
@@ -74,4 +74,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -9,18 +9,23 @@ Usage:
 """
 
 from robot_controller import RobotController
+import sys
 import time
+import logging
 
 
-def demo_speed_variations():
+def demo_speed_variations(robot=None):
     """
     Demonstrate different speed settings.
+    
+    Args:
+        robot (RobotController, optional): Controller to use; a new one is created if None
     """
     print("=" * 70)
     print("  Speed Control Demonstration")
     print("=" * 70)
     
-    robot = RobotController()
+    robot = robot or RobotController()
     
     # Define a test position
     test_position = [400, 200, 300, 0, 90, 0]
@@ -30,8 +35,7 @@ def demo_speed_variations():
     
     for speed in speeds:
         print(f"\n→ Testing at {speed}% speed...")
-        robot.robot.setSpeed(speed)
-        robot.robot.setAcceleration(speed)
+        robot.set_speed_and_acceleration(speed, speed)
         
         print(f"  Moving to test position...")
         start_time = time.time()
@@ -47,15 +51,18 @@ def demo_speed_variations():
     print("\n✓ Speed demonstration complete!")
 
 
-def demo_variable_speed_operation():
+def demo_variable_speed_operation(robot=None):
     """
     Demonstrate using different speeds for different phases of operation.
+    
+    Args:
+        robot (RobotController, optional): Controller to use; a new one is created if None
     """
     print("\n" + "=" * 70)
     print("  Variable Speed Pick and Place")
     print("=" * 70)
     
-    robot = RobotController()
+    robot = robot or RobotController()
     
     # Define positions
     pick_pos = [400, 200, 100]
@@ -65,52 +72,49 @@ def demo_variable_speed_operation():
     
     # Phase 1: Approach at medium speed
     print("\n[Phase 1] Approaching pick location (50% speed)...")
-    robot.robot.setSpeed(50)
-    robot.robot.setAcceleration(50)
+    robot.set_speed_and_acceleration(50, 50)
     approach_pose = pick_pos + pick_orient
     approach_pose[2] += 50  # 50mm above
     robot.move_to_pose(approach_pose)
     
     # Phase 2: Pick at slow speed for accuracy
     print("\n[Phase 2] Picking object (20% speed - careful)...")
-    robot.robot.setSpeed(20)
-    robot.robot.setAcceleration(20)
+    robot.set_speed_and_acceleration(20, 20)
     robot.pick_object(pick_pos, pick_orient)
     
     # Phase 3: Move to place location at high speed
     print("\n[Phase 3] Moving to place location (80% speed)...")
-    robot.robot.setSpeed(80)
-    robot.robot.setAcceleration(70)
+    robot.set_speed_and_acceleration(80, 70)
     approach_place = place_pos + place_orient
     approach_place[2] += 50
     robot.move_to_pose(approach_place)
     
     # Phase 4: Place at slow speed
     print("\n[Phase 4] Placing object (20% speed - careful)...")
-    robot.robot.setSpeed(20)
-    robot.robot.setAcceleration(20)
+    robot.set_speed_and_acceleration(20, 20)
     robot.place_object(place_pos, place_orient)
     
     # Phase 5: Return home at normal speed
     print("\n[Phase 5] Returning home (60% speed)...")
-    robot.robot.setSpeed(60)
-    robot.robot.setAcceleration(60)
+    robot.set_speed_and_acceleration(60, 60)
     robot.move_to_home()
     
     print("\n✓ Variable speed operation complete!")
 
 
-def demo_smooth_vs_sharp_corners():
+def demo_smooth_vs_sharp_corners(robot=None):
     """
     Demonstrate smooth vs sharp corner movements using rounding.
+    
+    Args:
+        robot (RobotController, optional): Controller to use; a new one is created if None
     """
     print("\n" + "=" * 70)
     print("  Smooth vs Sharp Corners")
     print("=" * 70)
     
-    robot = RobotController()
-    robot.robot.setSpeed(60)
-    robot.robot.setAcceleration(60)
+    robot = robot or RobotController()
+    robot.set_speed_and_acceleration(60, 60)
     
     # Define waypoints (square pattern)
     waypoints = [
@@ -121,45 +125,41 @@ def demo_smooth_vs_sharp_corners():
         [400, 0, 300, 0, 90, 0],
     ]
     
+    # Each lap is queued as one path and waited on once, not one blocking move per waypoint
     # Test 1: Sharp corners (stop at each point)
     print("\n[Test 1] Sharp corners (rounding = 0mm)...")
-    robot.robot.setRounding(0)
-    
-    for i, waypoint in enumerate(waypoints, 1):
-        print(f"  Waypoint {i}/{len(waypoints)}")
-        robot.move_to_pose(waypoint)
+    print(f"  Moving through {len(waypoints)} waypoints")
+    robot.move_through(waypoints, rounding_mm=0)
     
     print("  ✓ Sharp corners complete (robot stopped at each point)")
     robot.wait(1)
     
     # Test 2: Smooth corners
     print("\n[Test 2] Smooth corners (rounding = 15mm)...")
-    robot.robot.setRounding(15)
-    
-    for i, waypoint in enumerate(waypoints, 1):
-        print(f"  Waypoint {i}/{len(waypoints)}")
-        robot.move_to_pose(waypoint)
+    print(f"  Moving through {len(waypoints)} waypoints")
+    robot.move_through(waypoints, rounding_mm=15)
     
     print("  ✓ Smooth corners complete (continuous motion)")
     
-    # Reset rounding
-    robot.robot.setRounding(0)
+    # move_through restores the controller's default rounding afterwards
     robot.move_to_home()
     
     print("\n✓ Corner demonstration complete!")
 
 
-def demo_orientation_variations():
+def demo_orientation_variations(robot=None):
     """
     Demonstrate different orientations at the same position.
+    
+    Args:
+        robot (RobotController, optional): Controller to use; a new one is created if None
     """
     print("\n" + "=" * 70)
     print("  Orientation Variations")
     print("=" * 70)
     
-    robot = RobotController()
-    robot.robot.setSpeed(40)
-    robot.robot.setAcceleration(40)
+    robot = robot or RobotController()
+    robot.set_speed_and_acceleration(40, 40)
     
     # Same position, different orientations
     position = [400, 0, 250]
@@ -189,6 +189,12 @@ def demo_orientation_variations():
     print("\n✓ Orientation demonstration complete!")
 
 
+def pause_between_demos():
+    """Wait for ENTER between demos, unless stdin isn't a terminal (batch/CI runs)."""
+    if sys.stdin.isatty():
+        input("\nPress ENTER to continue to next demo...")
+
+
 def main():
     """
     Main menu for speed control demonstrations.
@@ -205,28 +211,32 @@ def main():
     print("=" * 70)
     
     choice = input("\nEnter choice (1-5): ").strip()
+    if choice not in ('1', '2', '3', '4', '5'):
+        print("Invalid choice")
+        return
     
+    robot = None
     try:
+        # One controller (and RoboDK connection) shared by every demo
+        robot = RobotController()
+        
         if choice == '1':
-            demo_speed_variations()
+            demo_speed_variations(robot)
         elif choice == '2':
-            demo_variable_speed_operation()
+            demo_variable_speed_operation(robot)
         elif choice == '3':
-            demo_smooth_vs_sharp_corners()
+            demo_smooth_vs_sharp_corners(robot)
         elif choice == '4':
-            demo_orientation_variations()
+            demo_orientation_variations(robot)
         elif choice == '5':
             print("\n Running all demonstrations...")
-            demo_speed_variations()
-            input("\nPress ENTER to continue to next demo...")
-            demo_variable_speed_operation()
-            input("\nPress ENTER to continue to next demo...")
-            demo_smooth_vs_sharp_corners()
-            input("\nPress ENTER to continue to next demo...")
-            demo_orientation_variations()
-        else:
-            print("Invalid choice")
-            return
+            demo_speed_variations(robot)
+            pause_between_demos()
+            demo_variable_speed_operation(robot)
+            pause_between_demos()
+            demo_smooth_vs_sharp_corners(robot)
+            pause_between_demos()
+            demo_orientation_variations(robot)
         
         print("\n" + "=" * 70)
         print("  All demonstrations complete!")
@@ -238,7 +248,11 @@ def main():
         print("  • RoboDK is running")
         print("  • UR5 robot is loaded")
         print("  • Positions are within robot reach")
+    finally:
+        if robot is not None:
+            robot.disconnect()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -0,0 +1,95 @@
+"""
+CommandServer Message Handling Tests
+
+Checks that malformed messages get an error reply instead of closing the
+client connection. Needs no robot or RoboDK.
+
+Usage:
+    python -m unittest test_command_server
+"""
+
+import os
+import sys
+import json
+import socket
+import selectors
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_server import CommandServer
+
+
+class HandleMessageTest(unittest.TestCase):
+    """Replies from CommandServer._handle_message for bad payloads."""
+
+    def setUp(self):
+        self.server = CommandServer()
+        self.server_side, self.client_side = socket.socketpair()
+        self.client_side.settimeout(2)
+
+    def tearDown(self):
+        self.server_side.close()
+        self.client_side.close()
+
+    def reply_to(self, data):
+        """Run one legacy (unframed) message through the server and return the parsed reply."""
+        self.server._handle_message(self.server_side, data, False)
+        return json.loads(self.client_side.recv(4096).decode('utf-8'))
+
+    def test_non_object_json_gets_error_reply(self):
+        for data in (b'[]', b'"x"', b'42', b'null'):
+            with self.subTest(data=data):
+                response = self.reply_to(data)
+                self.assertEqual(response['status'], 'error')
+                self.assertIn('JSON object', response['message'])
+
+    def test_invalid_utf8_gets_error_reply(self):
+        response = self.reply_to(b'{"command": "\xff\xfe"}')
+        self.assertEqual(response['status'], 'error')
+        self.assertIn('Invalid JSON', response['message'])
+
+    def test_connection_still_usable_after_bad_message(self):
+        self.reply_to(b'[]')
+        response = self.reply_to(b'{"command": "nonexistent"}')
+        self.assertEqual(response['message'], 'Unknown command: nonexistent')
+
+
+class AcceptClientTest(unittest.TestCase):
+    """CommandServer._accept_client when a client fails during setup."""
+
+    def setUp(self):
+        self.server = CommandServer()
+        self.server.server_socket = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(self.server.server_socket.close)
+        self.selector = selectors.DefaultSelector()
+        self.addCleanup(self.selector.close)
+
+    def connect(self):
+        client = socket.create_connection(self.server.server_socket.getsockname(), timeout=2)
+        self.addCleanup(client.close)
+        return client
+
+    def test_setup_error_drops_only_that_client(self):
+        client = self.connect()
+        with mock.patch.object(self.server, '_configure_client_socket',
+                               side_effect=ConnectionResetError("reset by peer")):
+            self.server._accept_client(self.selector)  # Must not raise
+        self.assertEqual(len(self.selector.get_map()), 0)
+        self.assertEqual(client.recv(1), b'')  # Closed by the server
+
+        self.connect()
+        self.server._accept_client(self.selector)
+        self.assertEqual(len(self.selector.get_map()), 1)
+
+    def test_accept_error_is_not_raised(self):
+        self.server.server_socket = mock.Mock()
+        self.server.server_socket.accept.side_effect = ConnectionAbortedError("aborted")
+        self.server._accept_client(self.selector)  # Must not raise
+        self.assertEqual(len(self.selector.get_map()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
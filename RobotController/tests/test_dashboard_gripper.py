@@ -0,0 +1,120 @@
+"""
+Dashboard Client Tests
+
+Runs SocketTransport and DashboardClient against the far end of a socket
+pair standing in for the UR Dashboard Server. Needs no robot or RoboDK.
+
+Usage:
+    python -m unittest test_dashboard_gripper
+"""
+
+import os
+import sys
+import socket
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_gripper import DashboardClient, SocketTransport
+
+WELCOME = b"Connected: Universal Robots Dashboard Server\n"
+
+
+class FakeDashboardServer:
+    """Mixin: every connect opens a socket pair and returns its client end."""
+
+    def setUp(self):
+        self.servers = []
+        # Each connect gets a fresh socket pair; the test keeps the server ends
+        patcher = mock.patch('dashboard_gripper.socket.create_connection', side_effect=self.connect)
+        self.create_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        # TCP options don't apply to socket pairs
+        self.transport = SocketTransport('192.168.1.10', timeout=1, socket_options=[])
+        self.addCleanup(self.transport.close)
+        self.pending = []  # Bytes each new server end sends on connect
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def connect(self, address, timeout=None):
+        client, server = socket.socketpair()
+        server.settimeout(1)
+        server.sendall(self.pending.pop(0) if self.pending else WELCOME)
+        self.servers.append(server)
+        return client
+
+    def received(self, server):
+        """Everything the client has sent to a server end so far."""
+        server.setblocking(False)
+        try:
+            return server.recv(4096)
+        except BlockingIOError:
+            return b""
+
+
+class SocketTransportTest(FakeDashboardServer, unittest.TestCase):
+    """SocketTransport framing, deadlines and reconnects."""
+
+    def test_reply_split_across_reads(self):
+        self.pending.append(WELCOME + b"PLAYING open-gripper.urp\nSTOPPED\n")
+        self.transport.RECV_SIZE = 5  # Force every line to span several recv() calls
+        self.assertEqual(self.transport.send_cmd("programState"), "PLAYING open-gripper.urp")
+        self.assertEqual(self.transport.welcome, WELCOME.decode().strip())
+        # Bytes past the first newline are kept for the next reply
+        self.assertEqual(self.transport.send_cmd("programState"), "STOPPED")
+
+    def test_reply_deadline_closes_socket(self):
+        self.transport.timeout = 0.1
+        with self.assertRaises(socket.timeout):
+            self.transport.send_cmd("robotmode")
+        self.assertIsNone(self.transport._sock)
+
+    def test_stale_connection_reopened_once(self):
+        self.transport._ensure_connected()
+        # The robot drops the first connection; the second answers
+        self.pending.append(WELCOME + b"Robotmode: IDLE\n")
+        self.servers[0].close()
+        self.assertEqual(self.transport.send_cmd("robotmode"), "Robotmode: IDLE")
+        self.assertEqual(self.create_connection.call_count, 2)
+
+    def test_stale_connection_not_retried_twice(self):
+        self.transport._ensure_connected()
+        self.servers[0].close()
+        original_connect = self.connect
+
+        def connect_and_drop(address, timeout=None):
+            client = original_connect(address, timeout)
+            self.servers[-1].close()
+            return client
+
+        self.create_connection.side_effect = connect_and_drop
+        with self.assertRaises(ConnectionError):
+            self.transport.send_cmd("robotmode")
+        self.assertEqual(self.create_connection.call_count, 2)
+
+
+class LoadAndPlayTest(FakeDashboardServer, unittest.TestCase):
+    """DashboardClient.load_and_play over a SocketTransport."""
+
+    def test_play_not_sent_after_failed_load(self):
+        self.pending.append(WELCOME + b"File not found: missing.urp\n")
+        client = DashboardClient(self.transport)
+        load_response, play_response = client.load_and_play("missing.urp")
+        self.assertFalse(client.load_succeeded(load_response))
+        self.assertEqual(play_response, "")
+        self.assertEqual(self.received(self.servers[0]), b"load missing.urp\n")
+
+    def test_play_sent_after_successful_load(self):
+        self.pending.append(WELCOME + b"Loading program: open-gripper.urp\nStarting program\n")
+        client = DashboardClient(self.transport)
+        self.assertEqual(client.load_and_play("open-gripper.urp"),
+                         ("Loading program: open-gripper.urp", "Starting program"))
+        self.assertEqual(self.received(self.servers[0]), b"load open-gripper.urp\nplay\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
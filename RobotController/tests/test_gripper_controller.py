@@ -0,0 +1,82 @@
+"""
+Gripper Controller Tests
+
+Checks when GripperController.wait_for_completion() considers an RG2 move
+done, against scripted measure_width readings. Needs no robot or RoboDK.
+
+Usage:
+    python -m unittest test_gripper_controller
+"""
+
+import os
+import sys
+import itertools
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gripper_controller import GripperController
+
+
+class WaitForCompletionTest(unittest.TestCase):
+    """GripperController.wait_for_completion against a stubbed get_status."""
+
+    def setUp(self):
+        self.gripper = GripperController(mock.Mock())
+        patcher = mock.patch.object(self.gripper, '_send_urscript', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.reads = 0
+
+    def script_widths(self, widths, grip_detected=False):
+        """Make get_status return these widths in turn, then repeat the last one."""
+        readings = itertools.chain(widths, itertools.repeat(widths[-1]))
+
+        def get_status(max_age=0.05):
+            self.reads += 1
+            return {'status': 0, 'width_mm': next(readings), 'force_n': 40,
+                    'busy': False, 'grip_detected': grip_detected}
+
+        self.gripper.get_status = get_status
+
+    def test_waits_for_motion_to_start(self):
+        # Called right after close(): the jaws haven't moved for the first reads
+        self.gripper.close(20)
+        self.script_widths([70.0, 70.0, 70.0, 66.0, 61.0, 58.5, 58.5])
+        self.assertTrue(self.gripper.wait_for_completion(timeout=2))
+        self.assertGreaterEqual(self.reads, 6)  # Settled at 58.5 mm, not at the initial 70 mm
+
+    def test_completes_at_target(self):
+        self.gripper.open(70)
+        self.script_widths([60.0, 64.0, 69.0])
+        self.assertTrue(self.gripper.wait_for_completion(timeout=2))
+        self.assertEqual(self.reads, 3)
+
+    def test_no_op_move_completes_at_once(self):
+        # Already at the commanded width, so the jaws never move
+        self.gripper.open(70)
+        self.script_widths([70.0])
+        self.assertTrue(self.gripper.wait_for_completion(timeout=2))
+        self.assertEqual(self.reads, 1)
+
+    def test_close_completes_on_grip(self):
+        self.gripper.close(20)
+        self.script_widths([45.0], grip_detected=True)
+        self.assertTrue(self.gripper.wait_for_completion(timeout=2))
+
+    def test_motion_that_never_starts_times_out(self):
+        self.gripper.close(20)
+        self.script_widths([70.0])
+        self.assertFalse(self.gripper.wait_for_completion(timeout=0.3))
+
+    def test_steady_width_is_enough_after_stop(self):
+        self.gripper.close(20)
+        self.gripper.stop()
+        self.script_widths([50.0])
+        self.assertTrue(self.gripper.wait_for_completion(timeout=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ Usage:
 """
 
 import time
+import logging
 from robot_controller import RobotController
 
 
@@ -26,7 +27,7 @@ def test_connection():
     try:
         robot = RobotController()
         print("✓ Successfully connected to robot")
-        print(f"  Robot name: {robot.robot.Name()}")
+        print(f"  Robot name: {robot.name}")
         return robot
     except Exception as e:
         print(f"✗ Failed to connect: {e}")
@@ -42,8 +43,7 @@ def test_get_current_state(robot):
     print_section("TEST 2: Get Current State")
     
     try:
-        joints = robot.get_current_joints()
-        pose = robot.get_current_pose()
+        pose, joints = robot.get_current_state()
         
         print("✓ Current Joint Angles (degrees):")
         for i, angle in enumerate(joints, 1):
@@ -360,6 +360,7 @@ def quick_demo():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     import sys
     
     print("\n" + "=" * 70)
@@ -0,0 +1,98 @@
+"""
+Positions Manager Tests
+
+Checks how PositionsManager parses and reloads a positions file. Needs no
+robot or RoboDK.
+
+Usage:
+    python -m unittest test_positions_manager
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from positions_manager import PositionsManager
+
+
+class PositionsManagerTest(unittest.TestCase):
+    """Parsing positions.txt records and reloading on change."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def load(self, manager=None):
+        """Load the file, returning (manager, printed output)."""
+        manager = manager or PositionsManager(self.path)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            manager.reload_positions()
+        return manager, output.getvalue()
+
+    def test_six_value_record(self):
+        self.write("Bad Bin : [-77.5, -49.6, 98.5, 3.1, 0.06, 2.29]\n")
+        manager, _ = self.load()
+        self.assertEqual(manager.get_position('bad bin'),
+                         {'position': [-77.5, -49.6, 98.5], 'orientation': [3.1, 0.06, 2.29]})
+
+    def test_position_with_orientation_record(self):
+        self.write("home pose : [58.2, 13.9, 353.8] with orientation: [-3.07, 0.046, 1.97]\n")
+        manager, _ = self.load()
+        self.assertEqual(manager.get_position(' Home Pose '),
+                         {'position': [58.2, 13.9, 353.8], 'orientation': [-3.07, 0.046, 1.97]})
+
+    def test_bad_number_is_reported_and_skipped(self):
+        self.write("piece 1 : [1, 2, x3, 4, 5, 6]\n"
+                   "piece 2 : [1, 2, 3, 4, 5, 6]\n")
+        manager, output = self.load()
+        self.assertIn("Error parsing line 'piece 1 : [1, 2, x3, 4, 5, 6]'", output)
+        self.assertEqual(manager.get_all_positions(), ['piece 2'])
+
+    def test_unmatched_lines_are_reported(self):
+        self.write("piece:1 : [1, 2, 3, 4, 5, 6]\n"
+                   "piece 2 : 1, 2, 3, 4, 5, 6\n"
+                   "\n"
+                   "piece 3 : [1, 2, 3, 4, 5, 6]\n")
+        manager, output = self.load()
+        self.assertIn("Error parsing line 'piece:1 : [1, 2, 3, 4, 5, 6]'", output)
+        self.assertIn("Error parsing line 'piece 2 : 1, 2, 3, 4, 5, 6'", output)
+        self.assertEqual(manager.get_all_positions(), ['piece 3'])
+
+    def test_empty_file(self):
+        self.write("")
+        manager, output = self.load()
+        self.assertEqual(manager.get_all_positions(), [])
+        self.assertIn("Loaded 0 positions", output)
+
+    def test_reload_after_mtime_change(self):
+        self.write("piece 1 : [1, 2, 3, 4, 5, 6]\n")
+        manager, _ = self.load()
+        self.assertEqual(manager.get_position('piece 1')['position'], [1.0, 2.0, 3.0])
+
+        self.write("piece 1 : [7, 8, 9, 4, 5, 6]\n")
+        mtime = os.stat(self.path).st_mtime + 10  # Don't depend on the filesystem's timestamp resolution
+        os.utime(self.path, (mtime, mtime))
+        self.load(manager)
+        self.assertEqual(manager.get_position('piece 1')['position'], [7.0, 8.0, 9.0])
+
+    def test_unchanged_file_is_not_reread(self):
+        self.write("piece 1 : [1, 2, 3, 4, 5, 6]\n")
+        manager, _ = self.load()
+        _, output = self.load(manager)
+        self.assertEqual(output, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
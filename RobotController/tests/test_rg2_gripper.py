@@ -11,6 +11,7 @@ This test uses the actual RG2() function from your URCaps:
 import sys
 import os
 import time
+import logging
 
 # Add parent directory to path to import robot_controller
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -300,4 +301,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
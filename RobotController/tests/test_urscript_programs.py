@@ -0,0 +1,52 @@
+"""
+URScript Program Generation Tests
+
+Checks how URScriptPickPlace solves the joint targets it fills into the
+generated programs. Uses a stand-in for the RoboDK robot item, so it needs
+no robot or RoboDK.
+
+Usage:
+    python -m unittest test_urscript_programs
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from urscript_programs import URScriptPickPlace
+
+
+class SolveJointsTest(unittest.TestCase):
+    """Joint targets from URScriptPickPlace._solve_joints."""
+
+    def setUp(self):
+        self.matrix = object()
+        self.robot = mock.Mock()
+        self.robot.SolveIK.return_value.list.return_value = [0, -90, 90, -90, -90, 0]
+        positions_manager = mock.Mock()
+        positions_manager.get_pose_matrix.side_effect = lambda name: self.matrix if name == 'piece 1' else None
+        self.programs = URScriptPickPlace(self.robot, positions_manager, '127.0.0.1')
+
+    def test_solves_with_robot_tool_and_frame(self):
+        matrix, joints = self.programs._solve_joints('piece 1')
+        self.assertIs(matrix, self.matrix)
+        self.assertEqual(joints, [0, -90, 90, -90, -90, 0])
+        self.robot.SolveIK.assert_called_once_with(self.matrix, tool=self.robot.PoseTool.return_value,
+                                                   reference=self.robot.PoseFrame.return_value)
+
+    def test_unknown_position_raises(self):
+        with self.assertRaises(ValueError):
+            self.programs._solve_joints('nowhere')
+
+    def test_no_ik_solution_raises(self):
+        self.robot.SolveIK.return_value.list.return_value = []
+        with self.assertRaises(ValueError):
+            self.programs._solve_joints('piece 1')
+
+
+if __name__ == "__main__":
+    unittest.main()
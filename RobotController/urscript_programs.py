@@ -0,0 +1,294 @@
+"""
+URScript Programs - Specialized pick/place programs for named positions
+=======================================================================
+For a fixed set of named positions (positions.txt) each (piece, location)
+pair can run as one URScript program with the joint targets already filled
+in. The joints are solved in RoboDK once per pair; after that a cycle is a
+single send to the controller's secondary interface (port 30002) and a few
+Dashboard 'running' polls, with no RoboDK API calls.
+
+The gripper steps call the RG2 URCap function. URCap functions are only
+defined inside programs that include the URCap's script, so pass that script
+(e.g. copied from a Polyscope program's generated .script file) as
+`preamble`.
+"""
+import math
+import re
+import select
+import socket
+import time
+import logging
+
+from dashboard_gripper import DashboardClient, SocketTransport
+from gripper_controller import _rg2_script
+
+logger = logging.getLogger(__name__)
+
+SECONDARY_PORT = 30002
+KEEPALIVE_IDLE_S = 30  # Idle time before the first keepalive probe on the script socket
+
+
+def program_name(piece, location):
+    """URScript function name for a (piece, location) pair, e.g. 'pick_piece_1_to_bad_bin'."""
+    return "pick_" + re.sub(r"\W+", "_", f"{piece}_to_{location}").strip("_").lower()
+
+
+def build_pick_place_script(name, pick_joints, place_joints, grip=(60, 40), release=(70, 40),
+                            joint_speed=1.05, joint_accel=1.4, preamble=""):
+    """
+    Build a URScript program that picks at one joint target and places at another.
+
+    Args:
+        name (str): Program (function) name
+        pick_joints (list): Pick approach joints in degrees
+        place_joints (list): Place joints in degrees
+        grip (tuple): (width_mm, force_n) to close the gripper on the object
+        release (tuple): (width_mm, force_n) to open the gripper
+        joint_speed (float): movej speed in rad/s
+        joint_accel (float): movej acceleration in rad/s^2
+        preamble (str): Script lines placed before the moves (URCap definitions)
+
+    Returns:
+        str: Program text, ready to send to the secondary interface
+    """
+    def movej(joints):
+        q = ", ".join(f"{math.radians(j):.6f}" for j in joints)
+        return f"  movej([{q}], a={joint_accel}, v={joint_speed})"
+
+    lines = [f"def {name}():"]
+    lines.extend("  " + line for line in preamble.splitlines() if line.strip())
+    lines += [
+        "  " + _rg2_script(*release),
+        movej(pick_joints),
+        "  " + _rg2_script(*grip),
+        movej(place_joints),
+        "  " + _rg2_script(*release),
+        "end",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+class URScriptBatch:
+    """
+    Buffers URScript statements and sends them as one program.
+
+    Every program sent to the secondary interface replaces the one running,
+    so separate one-line sends can't queue up. The buffered lines are
+    wrapped in a single `def ... end` block instead and sent in one write,
+    once `max_lines` have been added, when a line arrives `max_latency`
+    seconds after the first buffered one, or on flush().
+    """
+
+    def __init__(self, send, name="batch", max_lines=16, max_latency=0.01):
+        """
+        Initialize the buffer.
+
+        Args:
+            send (callable): Sends one program text, e.g. a socket's send method wrapper
+            name (str): Name of the generated program (function)
+            max_lines (int): Flush once this many lines are buffered (None: no limit)
+            max_latency (float): Flush when a line is added this many seconds
+                after the first buffered line (None: no limit)
+        """
+        self.send = send
+        self.name = name
+        self.max_lines = max_lines
+        self.max_latency = max_latency
+        self.lines = []
+        self._first_ts = 0.0
+
+    def add(self, line):
+        """Buffer one URScript statement, flushing if a threshold is reached."""
+        if not self.lines:
+            self._first_ts = time.monotonic()
+        self.lines.append(line)
+        if ((self.max_lines is not None and len(self.lines) >= self.max_lines) or
+                (self.max_latency is not None and time.monotonic() - self._first_ts >= self.max_latency)):
+            self.flush()
+
+    def flush(self):
+        """
+        Send the buffered lines as one program, if there are any.
+
+        Returns:
+            The send callable's result, or None if nothing was buffered
+        """
+        if not self.lines:
+            return None
+        script = "\n".join([f"def {self.name}():"] + ["  " + line for line in self.lines] + ["end", ""])
+        self.lines = []
+        return self.send(script)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Send whatever is still buffered when the block ends without an error."""
+        if exc_type is None:
+            self.flush()
+
+
+class URScriptPickPlace:
+    """
+    Runs pick/place cycles between named positions as generated URScript programs.
+
+    Programs are generated on first use of a pair and kept until the
+    positions file changes.
+    """
+
+    def __init__(self, robot_item, positions_manager, robot_ip, preamble="", timeout=5.0):
+        """
+        Initialize the program runner.
+
+        Args:
+            robot_item: RoboDK robot item, used only to solve joint targets
+            positions_manager (PositionsManager): Source of the named positions
+            robot_ip (str): IP address of the UR controller
+            preamble (str): URCap script definitions to include in every program
+            timeout (float): Socket timeout in seconds
+        """
+        self.robot = robot_item
+        self.positions_manager = positions_manager
+        self.robot_ip = robot_ip
+        self.preamble = preamble
+        self.timeout = timeout
+        self.dashboard = DashboardClient(SocketTransport(robot_ip, timeout=timeout))
+        self._programs = {}  # (piece, location) -> (pick matrix, place matrix, script)
+        self._script_sock = None  # Persistent secondary interface connection, opened on first send
+
+    def _solve_joints(self, name):
+        """
+        Solve the joint target for a named position in RoboDK.
+
+        Positions are TCP poses in the robot's reference frame (what MoveJ
+        expects), so the robot's active tool and frame are passed to SolveIK;
+        without them RoboDK would solve for the flange in base coordinates.
+        """
+        matrix = self.positions_manager.get_pose_matrix(name)
+        if matrix is None:
+            raise ValueError(f"Unknown position: {name}")
+        joints = self.robot.SolveIK(matrix, tool=self.robot.PoseTool(),
+                                    reference=self.robot.PoseFrame()).list()
+        if len(joints) < 6:
+            raise ValueError(f"No IK solution for position: {name}")
+        return matrix, joints
+
+    def script_for(self, piece, location):
+        """
+        Return the URScript program for a (piece, location) pair.
+
+        The joints are solved in RoboDK the first time a pair is used and
+        again only if the positions file has been reloaded since.
+
+        Raises:
+            ValueError: If a position is unknown or unreachable
+        """
+        key = (piece.lower().strip(), location.lower().strip())
+        cached = self._programs.get(key)
+        if cached is not None:
+            pick_matrix, place_matrix, script = cached
+            if (pick_matrix is self.positions_manager.get_pose_matrix(key[0]) and
+                    place_matrix is self.positions_manager.get_pose_matrix(key[1])):
+                return script
+
+        pick_matrix, pick_joints = self._solve_joints(key[0])
+        place_matrix, place_joints = self._solve_joints(key[1])
+        script = build_pick_place_script(program_name(*key), pick_joints, place_joints,
+                                         preamble=self.preamble)
+        self._programs[key] = (pick_matrix, place_matrix, script)
+        logger.info("Generated URScript program %s", program_name(*key))
+        return script
+
+    def _connect_script_socket(self):
+        """Open the secondary interface connection with keepalive and no Nagle delay."""
+        sock = socket.create_connection((self.robot_ip, SECONDARY_PORT), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        keepidle = getattr(socket, "TCP_KEEPIDLE", None)  # Not available on every platform
+        if keepidle is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, keepidle, KEEPALIVE_IDLE_S)
+        return sock
+
+    def _drain_script_socket(self):
+        """
+        Discard the state packets the controller streams on the secondary interface.
+
+        They are never read, so they are dropped before each send to keep the
+        receive buffer from filling up between cycles.
+
+        Raises:
+            ConnectionError: If the controller closed the connection
+        """
+        while select.select([self._script_sock], [], [], 0)[0]:
+            if not self._script_sock.recv(65536):
+                raise ConnectionError("Secondary interface connection closed")
+
+    def _send_script(self, script):
+        """
+        Send a program over the persistent secondary interface connection.
+
+        The connection is opened on first use and kept for later cycles. If
+        it has dropped, it is reopened once and the send retried.
+        """
+        payload = script.encode("utf-8")
+        for attempt in range(2):
+            try:
+                if self._script_sock is None:
+                    self._script_sock = self._connect_script_socket()
+                self._drain_script_socket()
+                self._script_sock.sendall(payload)
+                return
+            except OSError:
+                self._close_script_socket()
+                if attempt:
+                    raise
+                logger.warning("Secondary interface connection lost, reconnecting")
+
+    def _close_script_socket(self):
+        """Close the secondary interface connection if it is open."""
+        if self._script_sock is not None:
+            try:
+                self._script_sock.close()
+            finally:
+                self._script_sock = None
+
+    def _program_running(self):
+        """Check the Dashboard 'running' reply ("Program running: true")."""
+        return self.dashboard.send_command("running").strip().lower().endswith("true")
+
+    def run(self, piece, location, timeout=60.0):
+        """
+        Run one pick/place cycle and wait for the program to finish.
+
+        Args:
+            piece (str): Named position to pick at
+            location (str): Named position to place at
+            timeout (float): Maximum time to wait for the program in seconds
+
+        Returns:
+            bool: True if the program ran and finished within the timeout
+        """
+        script = self.script_for(piece, location)
+        self._send_script(script)
+
+        # The program may take a moment to start; then wait for it to end
+        deadline = time.monotonic() + timeout
+        start_deadline = min(deadline, time.monotonic() + 1.0)
+        delay = 0.02
+        while not self._program_running():
+            if time.monotonic() >= start_deadline:
+                logger.warning("Program %s did not start", program_name(piece, location))
+                return False
+            time.sleep(delay)
+        while time.monotonic() < deadline:
+            if not self._program_running():
+                return True
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.2)
+        return False
+
+    def close(self):
+        """Close the Dashboard and secondary interface connections."""
+        self._close_script_socket()
+        self.dashboard.close()